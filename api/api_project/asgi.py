@@ -0,0 +1,7 @@
+import os
+from django.core.asgi import get_asgi_application
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_project.settings')
+# Bajo ASGI (uvicorn) se sirven las vistas async de todos/async_views.py
+os.environ.setdefault('TODOS_ASYNC_VIEWS', '1')
+application = get_asgi_application()
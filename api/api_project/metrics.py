@@ -0,0 +1,122 @@
+import os
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.db import DatabaseError
+from django.db.backends.signals import connection_created
+from django.http import HttpResponse
+from django.views import View
+from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Gauge, Histogram, generate_latest
+from prometheus_client import REGISTRY, multiprocess
+
+# Con PROMETHEUS_MULTIPROC_DIR (start.sh lo define) cada worker de gunicorn
+# escribe sus métricas en archivos mmap de ese directorio y /api/metrics/ suma
+# los de todos los procesos; sin él (runserver) las métricas son del proceso.
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+REQUESTS = Counter(
+    "todos_http_requests_total", "Requests atendidas por vista", ["view", "method", "status"]
+)
+LATENCY = Histogram(
+    "todos_http_request_duration_seconds", "Latencia de las requests por vista", ["view", "method"],
+    buckets=LATENCY_BUCKETS,
+)
+IN_FLIGHT = Gauge(
+    "todos_http_requests_in_flight", "Requests en curso", multiprocess_mode="livesum"
+)
+CACHE_LOOKUPS = Counter(
+    "todos_cache_lookups_total", "Lecturas de caché por resultado (HIT, STALE, MISS)", ["cache", "result"]
+)
+CACHE_TIER_LOOKUPS = Counter(
+    "todos_cache_tier_lookups_total", "Lecturas de cuerpos cacheados por nivel (local, redis) y resultado",
+    ["cache", "tier", "result"],
+)
+DB_ERRORS = Counter(
+    "todos_db_errors_total", "Queries que fallaron con un error de la base", ["type"]
+)
+REDIS_ERRORS = Counter(
+    "todos_redis_errors_total", "Errores de conexión o timeout con Redis", ["type"]
+)
+
+
+def record_cache(cache: str, result: str) -> None:
+    CACHE_LOOKUPS.labels(cache, result).inc()
+
+
+def record_cache_tier(cache: str, tier: str, result: str) -> None:
+    CACHE_TIER_LOOKUPS.labels(cache, tier, result).inc()
+
+
+def record_redis_error(error: Exception) -> None:
+    REDIS_ERRORS.labels(type(error).__name__).inc()
+
+
+def db_error_wrapper(execute, sql, params, many, context):
+    """execute_wrapper de Django: cuenta las queries que fallan"""
+    try:
+        return execute(sql, params, many, context)
+    except DatabaseError as e:
+        DB_ERRORS.labels(type(e).__name__).inc()
+        raise
+
+
+def install_db_error_wrapper(connection, **kwargs) -> None:
+    if db_error_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(db_error_wrapper)
+
+
+connection_created.connect(install_db_error_wrapper)
+
+
+class PrometheusMiddleware:
+    """Cuenta requests, latencia por vista (nombre de la URL) y requests en curso"""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        IN_FLIGHT.inc()
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            IN_FLIGHT.dec()
+        self.observe(request, response, time.perf_counter() - start)
+        return response
+
+    async def __acall__(self, request):
+        IN_FLIGHT.inc()
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            IN_FLIGHT.dec()
+        self.observe(request, response, time.perf_counter() - start)
+        return response
+
+    def observe(self, request, response, elapsed: float) -> None:
+        # Por nombre de URL y no por path: /api/todos/<id>/ es una sola serie
+        match = request.resolver_match
+        view = match.url_name if match is not None and match.url_name else "unmatched"
+        REQUESTS.labels(view, request.method, str(response.status_code)).inc()
+        LATENCY.labels(view, request.method).observe(elapsed)
+
+
+class MetricsView(View):
+    """Métricas en formato de texto de Prometheus (sumadas entre workers)"""
+
+    def get(self, request):
+        if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+            registry = CollectorRegistry()
+            multiprocess.MultiProcessCollector(registry)
+        else:
+            registry = REGISTRY
+        return HttpResponse(generate_latest(registry), content_type=CONTENT_TYPE_LATEST)
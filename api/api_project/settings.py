@@ -30,6 +30,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "api_project.metrics.PrometheusMiddleware",
+    "api_project.timing.ServerTimingMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -38,6 +40,12 @@ MIDDLEWARE = [
 
 ROOT_URLCONF = "api_project.urls"
 WSGI_APPLICATION = "api_project.wsgi.application"
+ASGI_APPLICATION = "api_project.asgi.application"
+
+# Vistas async (redis.asyncio + ORM async) para health, todos y data; asgi.py lo
+# activa por defecto. Con WSGI conviene dejarlo apagado: cada request async
+# necesitaría su propio event loop.
+TODOS_ASYNC_VIEWS = os.environ.get("TODOS_ASYNC_VIEWS", "0") == "1"
 
 # Base de datos - configuración para Render con PostgreSQL
 import dj_database_url
@@ -60,6 +68,52 @@ CORS_ALLOW_ALL_ORIGINS = True
 # Configuración de Redis para Render
 REDIS_URL = os.environ.get("REDIS_URL", "redis://localhost:6379")
 
+# Pool compartido de conexiones Redis de la app (todos.redis_client)
+REDIS_MAX_CONNECTIONS = int(os.environ.get("REDIS_MAX_CONNECTIONS", "20"))
+REDIS_SOCKET_TIMEOUT = float(os.environ.get("REDIS_SOCKET_TIMEOUT", "1.0"))
+REDIS_SOCKET_CONNECT_TIMEOUT = float(os.environ.get("REDIS_SOCKET_CONNECT_TIMEOUT", "0.5"))
+REDIS_HEALTH_CHECK_INTERVAL = int(os.environ.get("REDIS_HEALTH_CHECK_INTERVAL", "30"))
+
+# Circuit breaker: tras N fallos seguidos se deja de intentar durante X segundos
+REDIS_BREAKER_FAILURES = int(os.environ.get("REDIS_BREAKER_FAILURES", "3"))
+REDIS_BREAKER_RESET_SECONDS = float(os.environ.get("REDIS_BREAKER_RESET_SECONDS", "10"))
+
+# Palabras clave que se etiquetan al escribir una tarea (tabla TodoTag, filtro
+# `?tag=` y contadores `<palabra>_count`). Tras cambiarlas: `python manage.py retag_todos`
+TODOS_TRACKED_KEYWORDS = [
+    keyword.strip().lower()
+    for keyword in os.environ.get("TODOS_TRACKED_KEYWORDS", "urgent,important,critical").split(",")
+    if keyword.strip()
+]
+
+# Con 1, /api/data/ solo lee el último reporte publicado por `python manage.py build_reports`
+# (503 mientras no haya ninguno). Desactivado por defecto: se activa solo donde corre el
+# worker supervisado (start.sh lo exporta al lanzarlo). Con 0 se calcula en la request
+TODOS_DATA_SNAPSHOTS = os.environ.get("TODOS_DATA_SNAPSHOTS", "0") == "1"
+
+# Políticas de caché por endpoint (todos.cache.ReportCache), versionadas por la
+# generación de escritura que incrementa cada POST/PATCH/DELETE:
+# - soft_ttl: segundos que una entrada de la generación actual se considera fresca
+# - hard_ttl: segundos que se conserva para servirla mientras se regenera
+# - min_freshness: atraso máximo aceptado; dentro de esa ventana se sirve la entrada
+#   aunque haya escrituras nuevas (una ráfaga de escrituras = un solo recálculo)
+# - lock_ttl / wait_timeout: lock single-flight y espera máxima con caché fría
+# - local_max_bytes / local_ttl: nivel en memoria de cada proceso delante de Redis
+#   (0 lo desactiva); se mantiene coherente con los avisos pub/sub de `todos:events`
+# Con TODOS_DATA_SNAPSHOTS, build_reports recalcula "data" cada soft_ttl segundos
+# y, tras escrituras, como mucho una vez cada min_freshness segundos.
+TODOS_CACHES = {
+    "data": {
+        "soft_ttl": int(os.environ.get("TODOS_DATA_CACHE_SOFT_TTL", "30")),
+        "hard_ttl": int(os.environ.get("TODOS_DATA_CACHE_HARD_TTL", "300")),
+        "min_freshness": float(os.environ.get("TODOS_DATA_CACHE_MIN_FRESHNESS", "2")),
+        "lock_ttl": int(os.environ.get("TODOS_DATA_CACHE_LOCK_TTL", "60")),
+        "wait_timeout": float(os.environ.get("TODOS_DATA_CACHE_WAIT_TIMEOUT", "5")),
+        "local_max_bytes": int(os.environ.get("TODOS_DATA_CACHE_LOCAL_MAX_BYTES", str(64 * 1024 * 1024))),
+        "local_ttl": float(os.environ.get("TODOS_DATA_CACHE_LOCAL_TTL", "30")),
+    },
+}
+
 # Cache con Redis
 CACHES = {
     "default": {
@@ -75,7 +129,35 @@ CACHES = {
 SESSION_ENGINE = "django.contrib.sessions.backends.cache"
 SESSION_CACHE_ALIAS = "default"
 
+# Header Server-Timing (total, base de datos, Redis, caché) en todas las respuestas;
+# con SERVER_TIMING_LOG=1 también una línea JSON por request en el log
+SERVER_TIMING_LOG = os.environ.get("SERVER_TIMING_LOG", "0") == "1"
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "formatters": {
+        "message": {"format": "%(message)s"},
+    },
+    "handlers": {
+        "console": {"class": "logging.StreamHandler", "formatter": "message"},
+    },
+    "loggers": {
+        "api_project.timing": {"handlers": ["console"], "level": "INFO", "propagate": False},
+    },
+}
+
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [],
     "DEFAULT_PERMISSION_CLASSES": ["rest_framework.permissions.AllowAny"],
+    # JSON con orjson (si está instalado); el resto, los defaults de DRF
+    "DEFAULT_RENDERER_CLASSES": [
+        "todos.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "todos.renderers.FastJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
 }
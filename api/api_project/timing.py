@@ -0,0 +1,134 @@
+import json
+import logging
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+logger = logging.getLogger("api_project.timing")
+
+
+class RequestTimings:
+    """Tiempo de base de datos y de Redis acumulado durante una request"""
+
+    __slots__ = ("db_queries", "db_time", "redis_commands", "redis_time")
+
+    def __init__(self):
+        self.db_queries = 0
+        self.db_time = 0.0
+        self.redis_commands = 0
+        self.redis_time = 0.0
+
+
+# Timings de la request en curso. Es un objeto mutable: sync_to_async copia el
+# contexto al hilo del ORM, pero las sumas se hacen sobre la misma instancia
+_current: ContextVar[Optional[RequestTimings]] = ContextVar("request_timings", default=None)
+
+
+def record_redis(elapsed: float, commands: int = 0) -> None:
+    """Suma tiempo (y comandos respondidos) de Redis a la request actual, si hay una"""
+    timings = _current.get()
+    if timings is not None:
+        timings.redis_time += elapsed
+        timings.redis_commands += commands
+
+
+def db_timing_wrapper(execute, sql, params, many, context):
+    """execute_wrapper de Django: mide cada query de la request actual"""
+    timings = _current.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timings.db_time += time.perf_counter() - start
+        timings.db_queries += 1
+
+
+def install_db_wrapper(connection, **kwargs) -> None:
+    # Cada hilo tiene su propia conexión (las vistas async consultan desde el
+    # hilo de sync_to_async), así que el wrapper se instala en todas las que se abren
+    if db_timing_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(db_timing_wrapper)
+
+
+connection_created.connect(install_db_wrapper)
+
+
+class ServerTimingMiddleware:
+    """Agrega el header Server-Timing a cada respuesta
+
+        Server-Timing: total;dur=12.4, db;dur=3.1;desc="2 queries",
+                       redis;dur=0.8;desc="3 commands", cache;desc="HIT"
+
+    `cache` sale del header X-Cache de la vista (solo /api/data/). Con
+    SERVER_TIMING_LOG=1 además se escribe una línea JSON por request en el
+    logger `api_project.timing`. Sirve igual para WSGI y ASGI.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.log = getattr(settings, "SERVER_TIMING_LOG", False)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        timings = RequestTimings()
+        token = _current.set(timings)
+        start = time.perf_counter()
+        try:
+            for connection in connections.all(initialized_only=True):
+                install_db_wrapper(connection)
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, timings, time.perf_counter() - start)
+
+    async def __acall__(self, request):
+        timings = RequestTimings()
+        token = _current.set(timings)
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, timings, time.perf_counter() - start)
+
+    def finish(self, request, response, timings: RequestTimings, elapsed: float):
+        # En las respuestas streaming el cuerpo (y sus queries) se genera después:
+        # el header cubre solo hasta que la vista devolvió la respuesta
+        cache_status = response.get("X-Cache")
+        metrics = [
+            f"total;dur={elapsed * 1000:.1f}",
+            f'db;dur={timings.db_time * 1000:.1f};desc="{timings.db_queries} queries"',
+            f'redis;dur={timings.redis_time * 1000:.1f};desc="{timings.redis_commands} commands"',
+        ]
+        if cache_status:
+            metrics.append(f'cache;desc="{cache_status}"')
+        response["Server-Timing"] = ", ".join(metrics)
+        # El frontend es otro origen: sin esto el navegador oculta Server-Timing
+        response["Timing-Allow-Origin"] = "*"
+
+        if self.log:
+            logger.info(json.dumps({
+                "method": request.method,
+                "path": request.path,
+                "status": response.status_code,
+                "total_ms": round(elapsed * 1000, 2),
+                "db_queries": timings.db_queries,
+                "db_ms": round(timings.db_time * 1000, 2),
+                "redis_commands": timings.redis_commands,
+                "redis_ms": round(timings.redis_time * 1000, 2),
+                "cache": cache_status,
+            }, separators=(",", ":")))
+        return response
@@ -1,10 +1,20 @@
+from django.conf import settings
 from django.urls import path
-from todos.views import HealthView, TodoList, TodoDetail, DataView, RedisAdminView
+from api_project.metrics import MetricsView
+from todos import async_views, views
+from todos.views import TodoBulk, RedisAdminView, RedisAdminJobView, StatsTimeseriesView
+
+# Modo ASGI: versiones async de los endpoints de lectura/escritura frecuentes
+api_views = async_views if settings.TODOS_ASYNC_VIEWS else views
 
 urlpatterns = [
-    path("api/health/", HealthView.as_view(), name="health"),
-    path("api/todos/", TodoList.as_view(), name="todo-list"),
-    path("api/todos/<int:todo_id>/", TodoDetail.as_view(), name="todo-detail"),
-    path("api/data/", DataView.as_view(), name="data"),
+    path("api/health/", api_views.HealthView.as_view(), name="health"),
+    path("api/todos/", api_views.TodoList.as_view(), name="todo-list"),
+    path("api/todos/bulk/", TodoBulk.as_view(), name="todo-bulk"),
+    path("api/todos/<int:todo_id>/", api_views.TodoDetail.as_view(), name="todo-detail"),
+    path("api/data/", api_views.DataView.as_view(), name="data"),
+    path("api/stats/timeseries/", StatsTimeseriesView.as_view(), name="stats-timeseries"),
     path("api/redis-admin/", RedisAdminView.as_view(), name="redis-admin"),
+    path("api/redis-admin/jobs/<str:job_id>/", RedisAdminJobView.as_view(), name="redis-admin-job"),
+    path("api/metrics/", MetricsView.as_view(), name="metrics"),
 ]
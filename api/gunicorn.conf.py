@@ -0,0 +1,12 @@
+# Configuración de gunicorn (se carga sola desde el directorio de trabajo)
+
+
+def child_exit(server, worker):
+    # Los gauges "livesum" (requests en curso) no deben seguir sumando
+    # los archivos de métricas de un worker que terminó
+    import os
+
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
@@ -18,5 +18,33 @@ else:
     print('Superusuario ya existe')
 " || echo "Error creando superusuario, continuando..."
 
+# Métricas de Prometheus compartidas entre workers (archivos mmap, /api/metrics/);
+# se vacía al arrancar para no sumar procesos de una ejecución anterior
+export PROMETHEUS_MULTIPROC_DIR="${PROMETHEUS_MULTIPROC_DIR:-/tmp/prometheus_multiproc}"
+rm -rf "$PROMETHEUS_MULTIPROC_DIR"
+mkdir -p "$PROMETHEUS_MULTIPROC_DIR"
+
+# Worker que publica el reporte de /api/data/. Se reinicia si termina: con
+# TODOS_DATA_SNAPSHOTS la API no calcula el reporte y sin worker respondería 503.
+# Con REPORT_WORKER=0 se corre aparte (`python manage.py build_reports`) y hay
+# que exportar TODOS_DATA_SNAPSHOTS=1 en la API a mano
+if [ "${REPORT_WORKER:-1}" = "1" ]; then
+    echo "Iniciando worker de reportes..."
+    export TODOS_DATA_SNAPSHOTS="${TODOS_DATA_SNAPSHOTS:-1}"
+    (
+        while true; do
+            python manage.py build_reports || echo "Worker de reportes terminó (código $?), reiniciando..."
+            sleep 1
+        done
+    ) &
+fi
+
+# API_SERVER=asgi: workers uvicorn con las vistas async (ver README)
+if [ "${API_SERVER:-wsgi}" = "asgi" ]; then
+    echo "Iniciando servidor (ASGI, uvicorn)..."
+    exec gunicorn api_project.asgi:application --bind 0.0.0.0:8000 --workers 2 \
+        --worker-class uvicorn.workers.UvicornWorker
+fi
+
 echo "Iniciando servidor..."
 exec gunicorn api_project.wsgi:application --bind 0.0.0.0:8000 --workers 2
\ No newline at end of file
@@ -0,0 +1,289 @@
+from typing import Tuple
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import transaction
+from django.http import HttpResponse, StreamingHttpResponse
+from django.views import View
+from redis.exceptions import RedisError
+
+from api_project.metrics import record_cache
+
+from .cache import HIT, MISS, abump_generation, data_cache, mark_bump_pending
+from .compression import negotiate
+from .etags import arequest_etag, conditional_headers, etag_matches, make_etag
+from .models import TODO_FIELDS, Todo, tracked_keywords
+from .pagination import KEYSET_ORDERING, apaginate, parse_limit
+from .redis_client import breaker, get_async_redis, get_async_redis_or_none, get_redis_or_none
+from .renderers import json_dumps, json_loads
+from .reports import (
+    SNAPSHOT_RETRY_AFTER, SNAPSHOT_UNAVAILABLE, cached_report, cached_response, snapshot_response, stream_report,
+)
+from .stats import StatsDelta, todo_change, todo_snapshot
+from .views import delete_todo, update_todo
+from .streaming import STREAM_CHUNK_SIZE, STREAM_FORMATS, aiter_json_array, aiter_ndjson, aiter_sync
+
+# Versiones async de HealthView, TodoList, TodoDetail y DataView para el modo ASGI
+# (uvicorn): mientras una request espera a Redis o a la base, el worker atiende
+# otras. Misma API que las vistas de views.py; el resto de los endpoints siguen
+# siendo las vistas DRF síncronas, que Django ejecuta en un hilo.
+
+
+class BadRequest(Exception):
+    """Cuerpo de la request inválido"""
+
+
+def json_body(request) -> dict:
+    if not request.body:
+        return {}
+    try:
+        payload = json_loads(request.body)
+    except ValueError:
+        raise BadRequest("JSON inválido.")
+    if not isinstance(payload, dict):
+        raise BadRequest("Se esperaba un objeto JSON.")
+    return payload
+
+
+def json_response(data, status: int = 200) -> HttpResponse:
+    """JSON compacto y UTF-8, igual que el FastJSONRenderer de las vistas síncronas"""
+    return HttpResponse(json_dumps(data), status=status, content_type="application/json")
+
+
+def not_modified(etag: str) -> HttpResponse:
+    response = HttpResponse(status=304)
+    for header, value in conditional_headers(etag).items():
+        response[header] = value
+    return response
+
+
+def with_headers(response, headers: dict):
+    for header, value in headers.items():
+        response[header] = value
+    return response
+
+
+@sync_to_async
+def create_todo(title: str) -> Tuple[Todo, StatsDelta]:
+    """Crea la tarea y la suma al rollup diario en la misma transacción (en un hilo)"""
+    with transaction.atomic():
+        todo = Todo.objects.create(title=title)
+        return todo, todo_change(after=todo_snapshot(todo)).save_rollup()
+
+
+# Con la fila bloqueada, igual que las vistas síncronas (ver views.update_todo)
+aupdate_todo = sync_to_async(update_todo)
+adelete_todo = sync_to_async(delete_todo)
+
+
+async def invalidate(delta: StatsDelta) -> None:
+    """Invalida la caché de datos y ajusta los contadores tras una escritura"""
+    try:
+        r = get_async_redis()
+        await abump_generation(r)
+        await delta.aapply(r)
+    except:
+        mark_bump_pending()  # La escritura vale igual; la generación se incrementa después
+
+
+class HealthView(View):
+    async def get(self, request):
+        try:
+            pong = await get_async_redis().ping()
+            return json_response({"ok": True, "redis": pong, "breaker": breaker.state}, status=200)
+        except Exception as e:
+            return json_response({"ok": False, "error": str(e), "breaker": breaker.state}, status=503)
+
+
+class TodoList(View):
+    """Lista y crea TODOs (async)"""
+
+    async def get(self, request):
+        """Obtener una página de tareas (`?limit=&cursor=&tag=`) o el listado completo (`?stream=`)"""
+        stream = request.GET.get("stream")
+        if stream and stream not in STREAM_FORMATS:
+            return json_response({"detail": "stream debe ser 'json' o 'ndjson'."}, status=400)
+
+        tag = request.GET.get("tag")
+        if tag is not None and tag not in tracked_keywords():
+            return json_response({"detail": f"tag debe ser una de: {', '.join(tracked_keywords())}."}, status=400)
+        queryset = Todo.objects.all() if tag is None else Todo.objects.filter(tags__tag=tag)
+        queryset = queryset.values(*TODO_FIELDS)
+
+        etag = await arequest_etag(get_async_redis_or_none(), request)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+
+        if stream:
+            rows = queryset.order_by(*KEYSET_ORDERING).aiterator(chunk_size=STREAM_CHUNK_SIZE)
+            writer = aiter_ndjson if stream == "ndjson" else aiter_json_array
+            response = StreamingHttpResponse(writer(rows), content_type=STREAM_FORMATS[stream])
+            return with_headers(response, conditional_headers(etag))
+
+        try:
+            limit = parse_limit(request.GET.get("limit"))
+            todos, next_cursor = await apaginate(queryset, request.GET.get("cursor"), limit)
+        except ValueError as e:
+            return json_response({"detail": str(e)}, status=400)
+
+        response = json_response({"results": todos, "next": next_cursor, "limit": limit})
+        return with_headers(response, conditional_headers(etag))
+
+    async def post(self, request):
+        """Crear nueva tarea"""
+        try:
+            title = json_body(request).get("title")
+        except BadRequest as e:
+            return json_response({"detail": str(e)}, status=400)
+        if not title or not isinstance(title, str):
+            return json_response({"detail": "title (string) es requerido."}, status=400)
+
+        try:
+            todo, delta = await create_todo(title.strip())
+        except Exception as e:
+            return json_response({"detail": f"Error creando tarea: {str(e)}"}, status=500)
+
+        await invalidate(delta)
+        return json_response(todo.to_dict(), status=201)
+
+
+class TodoDetail(View):
+    """Obtiene, actualiza y elimina TODOs específicos (async)"""
+
+    async def get(self, request, todo_id: int):
+        etag = await arequest_etag(get_async_redis_or_none(), request)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+
+        try:
+            todo = await Todo.objects.values(*TODO_FIELDS).aget(id=todo_id)
+        except Todo.DoesNotExist:
+            return json_response({"detail": "No existe."}, status=404)
+        return with_headers(json_response(todo), conditional_headers(etag))
+
+    async def patch(self, request, todo_id: int):
+        try:
+            payload = json_body(request)
+        except BadRequest as e:
+            return json_response({"detail": str(e)}, status=400)
+
+        changes = {}
+        if "title" in payload:
+            if not isinstance(payload["title"], str):
+                return json_response({"detail": "title debe ser string."}, status=400)
+            changes["title"] = payload["title"].strip()
+        if "done" in payload:
+            if not isinstance(payload["done"], bool):
+                return json_response({"detail": "done debe ser booleano."}, status=400)
+            changes["done"] = payload["done"]
+        if not changes:
+            return json_response({"detail": "Nada para actualizar."}, status=400)
+
+        try:
+            todo, delta = await aupdate_todo(todo_id, changes)
+        except Todo.DoesNotExist:
+            return json_response({"detail": "No existe."}, status=404)
+        except Exception as e:
+            return json_response({"detail": f"Error actualizando tarea: {str(e)}"}, status=500)
+
+        await invalidate(delta)
+        return json_response(todo.to_dict())
+
+    async def delete(self, request, todo_id: int):
+        try:
+            delta = await adelete_todo(todo_id)
+        except Todo.DoesNotExist:
+            return json_response({"detail": "No existe."}, status=404)
+        except Exception as e:
+            return json_response({"detail": f"Error eliminando tarea: {str(e)}"}, status=500)
+
+        await invalidate(delta)
+        return HttpResponse(status=204)
+
+
+class DataView(View):
+    """Reporte de /api/data/ (async)
+
+    Los HIT de caché y los 304 se resuelven con redis.asyncio sin salir del event
+    loop; solo la regeneración (lock + agregaciones en la base) corre en un hilo.
+    """
+
+    async def get(self, request):
+        stream = request.GET.get("stream")
+        if stream and stream != "json":
+            return json_response({"detail": "stream debe ser 'json'."}, status=400)
+
+        if stream:
+            report = aiter_sync(stream_report(get_redis_or_none()))
+            return StreamingHttpResponse(report, content_type=STREAM_FORMATS["json"])
+
+        if settings.TODOS_DATA_SNAPSHOTS:
+            return await self.get_snapshot(request)
+
+        # Cliente sin decode_responses: el cuerpo guardado (JSON, gzip o br) se envía tal cual
+        r = get_async_redis_or_none(decode_responses=False)
+        encoding = negotiate(request.headers.get("Accept-Encoding"), data_cache.encodings)
+        fresh = None
+        if r is not None:
+            try:
+                if request.headers.get("If-None-Match"):
+                    version = await data_cache.afresh_version(r)
+                    if version is not None and etag_matches(request, make_etag(version)):
+                        record_cache(data_cache.key, HIT)
+                        return not_modified(make_etag(version))
+                fresh = await data_cache.aget_fresh(r, raw=True, encoding=encoding)
+            except RedisError:
+                fresh = None
+
+        try:
+            if fresh is not None:
+                todos_data, cache_status, version = fresh
+            else:
+                todos_data, cache_status, version = await sync_to_async(
+                    lambda: cached_report(get_redis_or_none(), raw=True, encoding=encoding)
+                )()
+        except Exception as e:
+            return json_response({"detail": f"Error: {str(e)}"}, status=500)
+        record_cache(data_cache.key, cache_status)
+
+        if cache_status != MISS:
+            body, headers = cached_response(todos_data, cache_status, version)
+            return with_headers(HttpResponse(body, content_type="application/json"), headers)
+
+        headers = conditional_headers(make_etag(version) if version else None)
+        headers["X-Cache"] = cache_status
+        return with_headers(json_response(todos_data), headers)
+
+    async def get_snapshot(self, request):
+        """Último reporte publicado por build_reports; nunca se calcula en la request"""
+        # Cliente sin decode_responses: el cuerpo guardado (JSON, gzip o br) se envía tal cual
+        r = get_async_redis_or_none(decode_responses=False)
+        encoding = negotiate(request.headers.get("Accept-Encoding"), data_cache.encodings)
+        snapshot = None
+        if r is not None:
+            try:
+                if request.headers.get("If-None-Match"):
+                    version = await data_cache.asnapshot_version(r)
+                    if version is not None and etag_matches(request, make_etag(version)):
+                        record_cache(data_cache.key, HIT)
+                        return not_modified(make_etag(version))
+                snapshot = await data_cache.aget_snapshot(r, raw=True, encoding=encoding)
+            except RedisError:
+                snapshot = None
+
+        if snapshot is None:
+            record_cache(data_cache.key, MISS)
+            response = json_response({"detail": SNAPSHOT_UNAVAILABLE}, status=503)
+            return with_headers(response, {"Retry-After": SNAPSHOT_RETRY_AFTER})
+
+        body, headers = snapshot_response(snapshot)
+        record_cache(data_cache.key, headers["X-Cache"])
+        return with_headers(HttpResponse(body, content_type="application/json"), headers)
+
+    async def delete(self, request):
+        """Limpiar caché de datos de tareas"""
+        try:
+            await data_cache.aclear(get_async_redis())
+            return json_response({"detail": "Caché de tareas limpiado"})
+        except Exception as e:
+            return json_response({"detail": f"Error: {str(e)}"}, status=500)
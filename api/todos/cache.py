@@ -0,0 +1,507 @@
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from django.conf import settings
+from redis.exceptions import RedisError
+
+from api_project.metrics import record_cache_tier
+
+from .compression import IDENTITY, available_encodings, compress
+from .local_cache import EventSubscriber, LocalCache
+from .redis_client import get_redis
+from .renderers import json_dumps, json_loads
+
+HIT = "HIT"
+STALE = "STALE"
+MISS = "MISS"
+
+# Generación de escritura: cada POST/PATCH/DELETE de tareas la incrementa
+GENERATION_KEY = "todos:generation"
+
+# Canal pub/sub donde se anuncia cada nueva generación, entrada publicada o
+# limpieza de caché (lo escuchan build_reports y el nivel local de cada proceso)
+EVENTS_CHANNEL = "todos:events"
+
+
+def _seed_generation(pipe) -> None:
+    # Si la clave no existe (Redis nuevo o vaciado) arranca en un valor basado en
+    # el reloj, para no repetir generaciones ya vistas por clientes o entradas viejas
+    pipe.set(GENERATION_KEY, int(time.time() * 1000), nx=True)
+
+
+# Escrituras de este proceso cuyo bump_generation() falló (Redis caído, breaker
+# abierto): la generación no cambió y las ETags/entradas viejas seguirían
+# validando. Se reintenta antes de la próxima lectura de la generación
+_pending_bump = threading.Event()
+
+
+def mark_bump_pending() -> None:
+    """Registra que una escritura no pudo incrementar la generación"""
+    _pending_bump.set()
+    invalidate_local_caches()
+
+
+def flush_pending_bump(r) -> None:
+    """Incrementa la generación si quedó pendiente; si vuelve a fallar sigue pendiente"""
+    if not _pending_bump.is_set():
+        return
+    _pending_bump.clear()
+    try:
+        bump_generation(r)
+    except Exception:
+        _pending_bump.set()
+        raise
+
+
+async def aflush_pending_bump(r) -> None:
+    """flush_pending_bump() para un cliente de redis.asyncio"""
+    if not _pending_bump.is_set():
+        return
+    _pending_bump.clear()
+    try:
+        await abump_generation(r)
+    except Exception:
+        _pending_bump.set()
+        raise
+
+
+def bump_generation(r) -> int:
+    """Registra una escritura: invalida las entradas cacheadas de la generación anterior"""
+    pipe = r.pipeline(transaction=True)
+    _seed_generation(pipe)
+    pipe.incr(GENERATION_KEY)
+    pipe.publish(EVENTS_CHANNEL, "generation")
+    generation = pipe.execute()[1]
+    invalidate_local_caches()  # Este proceso no espera a su propio aviso
+    return generation
+
+
+def get_generation(r) -> int:
+    """Generación actual de los datos de tareas"""
+    flush_pending_bump(r)
+    generation = r.get(GENERATION_KEY)
+    if generation is None:
+        pipe = r.pipeline(transaction=True)
+        _seed_generation(pipe)
+        pipe.get(GENERATION_KEY)
+        generation = pipe.execute()[-1]
+    return int(generation)
+
+
+async def abump_generation(r) -> int:
+    """bump_generation() para un cliente de redis.asyncio"""
+    pipe = r.pipeline(transaction=True)
+    _seed_generation(pipe)
+    pipe.incr(GENERATION_KEY)
+    pipe.publish(EVENTS_CHANNEL, "generation")
+    generation = (await pipe.execute())[1]
+    invalidate_local_caches()
+    return generation
+
+
+async def aget_generation(r) -> int:
+    """get_generation() para un cliente de redis.asyncio"""
+    await aflush_pending_bump(r)
+    generation = await r.get(GENERATION_KEY)
+    if generation is None:
+        pipe = r.pipeline(transaction=True)
+        _seed_generation(pipe)
+        pipe.get(GENERATION_KEY)
+        generation = (await pipe.execute())[-1]
+    return int(generation)
+
+
+# ReportCache con nivel local en este proceso; cualquier aviso de EVENTS_CHANNEL
+# (o la reconexión del suscriptor, que pudo perder avisos) los invalida
+_local_caches: List["ReportCache"] = []
+
+
+def invalidate_local_caches(event: str = "") -> None:
+    for cache in _local_caches:
+        cache.invalidate_local()
+
+
+local_events = EventSubscriber(EVENTS_CHANNEL, get_redis, invalidate_local_caches)
+
+
+class ReportCache:
+    """Caché versionada por generación, con stale-while-revalidate y regeneración single-flight
+
+    - `key:v<generación>`: valor calculado para esa generación, en JSON (expira a los `hard_ttl` s).
+    - `key:v<generación>:<gzip|br>`: el mismo JSON ya comprimido, para servirlo sin recodificar.
+    - `key:sizes`: bytes guardados por codificación de la última entrada.
+    - `key:latest`: "<generación>:<timestamp>" de la última entrada publicada.
+    - `key:lock`: lock de Redis para que un solo worker recalcule a la vez.
+
+    Las escrituras no borran nada, solo incrementan la generación. Una entrada es
+    fresca si es de la generación actual y tiene menos de `soft_ttl` segundos, o si
+    tiene menos de `min_freshness` segundos aunque haya habido escrituras: así una
+    ráfaga de escrituras se resuelve con un solo recálculo y los lectores aceptan,
+    como máximo, `min_freshness` segundos de atraso.
+
+    Mientras se regenera, el resto de los workers sirve la última entrada; sin
+    ninguna (caché fría) esperan hasta `wait_timeout` a que el dueño del lock la
+    publique antes de calcularla ellos mismos.
+
+    Con `local_max_bytes` cada proceso guarda además en memoria (LocalCache) la
+    generación, la última entrada y los cuerpos leídos, así un HIT repetido no va
+    a Redis. Los cuerpos se guardan por versión y nunca quedan viejos; la
+    generación y la última entrada se descartan con cada aviso de EVENTS_CHANNEL
+    y, si el hilo suscriptor no está conectado, se leen siempre de Redis.
+    """
+
+    def __init__(self, key: str, soft_ttl: int = 30, hard_ttl: int = 300, min_freshness: float = 0,
+                 lock_ttl: int = 60, wait_timeout: float = 5.0, poll_interval: float = 0.05,
+                 hit_fields: Optional[Dict[str, Any]] = None, encodings: Optional[Tuple[str, ...]] = None,
+                 local_max_bytes: int = 0, local_ttl: float = 30.0):
+        self.key = key
+        self.latest_key = f"{key}:latest"
+        self.lock_key = f"{key}:lock"
+        self.sizes_key = f"{key}:sizes"
+        self.soft_ttl = soft_ttl
+        self.hard_ttl = hard_ttl
+        self.min_freshness = min_freshness
+        self.lock_ttl = lock_ttl
+        self.wait_timeout = wait_timeout
+        self.poll_interval = poll_interval
+        # Campos que se fijan en el valor guardado: lo que se lee es la respuesta
+        # de un HIT tal cual se envía, sin decodificarla para modificarla
+        self.hit_fields = hit_fields or {}
+        self.encodings = available_encodings() if encodings is None else tuple(encodings)
+        self.local = LocalCache(local_max_bytes, local_ttl) if local_max_bytes > 0 else None
+        # Cada invalidación incrementa la época: una lectura de Redis que empezó
+        # antes de un aviso no se guarda en el nivel local (quedaría vieja)
+        self._epoch = 0
+        self._epoch_lock = threading.Lock()
+        if self.local is not None:
+            _local_caches.append(self)
+
+    @classmethod
+    def from_settings(cls, name: str, key: str, **options) -> "ReportCache":
+        """Política de caché del endpoint `name` tomada de settings.TODOS_CACHES"""
+        return cls(key, **{**options, **getattr(settings, "TODOS_CACHES", {}).get(name, {})})
+
+    def entry_key(self, generation: int, encoding: Optional[str] = None) -> str:
+        if encoding:
+            return f"{self.key}:v{generation}:{encoding}"
+        return f"{self.key}:v{generation}"
+
+    def dumps(self, value: Any) -> bytes:
+        if self.hit_fields and isinstance(value, dict):
+            value = {**value, **self.hit_fields}
+        return json_dumps(value)
+
+    def loads(self, raw: str) -> Any:
+        return json_loads(raw)
+
+    def _latest(self, raw: Optional[str]) -> Optional[Tuple[int, str]]:
+        if raw is None:
+            return None
+        if isinstance(raw, bytes):  # Cliente sin decode_responses (lecturas con raw=True)
+            raw = raw.decode()
+        generation, built_at = raw.split(":", 1)
+        return int(generation), built_at
+
+    @staticmethod
+    def version(latest: Tuple[int, str]) -> str:
+        """Identificador de una entrada publicada (sirve como ETag)"""
+        return f"{latest[0]}-{latest[1]}"
+
+    def invalidate_local(self) -> None:
+        """Descarta la generación y la última entrada del nivel local (hubo un aviso)"""
+        if self.local is None:
+            return
+        with self._epoch_lock:
+            self._epoch += 1
+            self.local.delete("meta")
+
+    def _local_meta(self) -> Tuple[Optional[Tuple[Optional[int], Any]], Optional[int]]:
+        # (metadatos locales o None, época para guardarlos); época None: no usar el nivel local
+        if self.local is None:
+            return None, None
+        local_events.ensure_started()
+        if not local_events.connected:
+            return None, None
+        return self.local.get("meta"), self._epoch
+
+    def _store_meta(self, meta: Tuple[Optional[int], Any], epoch: Optional[int]) -> None:
+        if epoch is None:
+            return
+        with self._epoch_lock:
+            if epoch == self._epoch:
+                self.local.set("meta", meta)
+
+    def _parse_meta(self, generation, latest) -> Tuple[Optional[int], Optional[Tuple[int, str]]]:
+        return (int(generation) if generation is not None else None), self._latest(latest)
+
+    def _meta(self, r) -> Tuple[Optional[int], Optional[Tuple[int, str]]]:
+        """(generación, última entrada publicada), del nivel local si está al día"""
+        meta, epoch = self._local_meta()
+        if meta is None:
+            flush_pending_bump(r)
+            meta = self._parse_meta(*r.mget(GENERATION_KEY, self.latest_key))
+            self._store_meta(meta, epoch)
+        return meta
+
+    async def _ameta(self, r) -> Tuple[Optional[int], Optional[Tuple[int, str]]]:
+        """_meta() para un cliente de redis.asyncio"""
+        meta, epoch = self._local_meta()
+        if meta is None:
+            await aflush_pending_bump(r)
+            meta = self._parse_meta(*await r.mget(GENERATION_KEY, self.latest_key))
+            self._store_meta(meta, epoch)
+        return meta
+
+    def _local_body(self, r, latest: Tuple[int, str], encoding: Optional[str]) -> Tuple[Any, Optional[Any]]:
+        # Clave local por versión (no por generación: build_reports reescribe
+        # v<generación> aunque no haya escrituras) y por tipo de cliente (str/bytes)
+        if self.local is None:
+            return None, None
+        decoded = r.get_connection_kwargs().get("decode_responses", False)
+        local_key = (self.version(latest), encoding, decoded)
+        body = self.local.get(local_key)
+        record_cache_tier(self.key, "local", HIT if body is not None else MISS)
+        return local_key, body
+
+    def _remember_body(self, local_key, body) -> Any:
+        record_cache_tier(self.key, "redis", HIT if body is not None else MISS)
+        if body is not None and local_key is not None:
+            self.local.set(local_key, body, len(body))
+        return body
+
+    def _get_body(self, r, latest: Tuple[int, str], encoding: Optional[str]) -> Any:
+        local_key, body = self._local_body(r, latest, encoding)
+        if body is None:
+            body = self._remember_body(local_key, r.get(self.entry_key(latest[0], encoding)))
+        return body
+
+    async def _aget_body(self, r, latest: Tuple[int, str], encoding: Optional[str]) -> Any:
+        local_key, body = self._local_body(r, latest, encoding)
+        if body is None:
+            body = self._remember_body(local_key, await r.get(self.entry_key(latest[0], encoding)))
+        return body
+
+    def _read(self, r, latest: Tuple[int, str], encoding: Optional[str]) -> Optional[Tuple[Any, Optional[str]]]:
+        """(cuerpo, codificación) de una entrada: la variante `encoding` o, si no está, el JSON"""
+        if encoding:
+            body = self._get_body(r, latest, encoding)
+            if body is not None:
+                return body, encoding
+        body = self._get_body(r, latest, None)
+        return (body, None) if body is not None else None
+
+    async def _aread(self, r, latest: Tuple[int, str], encoding: Optional[str]) -> Optional[Tuple[Any, Optional[str]]]:
+        """_read() para un cliente de redis.asyncio"""
+        if encoding:
+            body = await self._aget_body(r, latest, encoding)
+            if body is not None:
+                return body, encoding
+        body = await self._aget_body(r, latest, None)
+        return (body, None) if body is not None else None
+
+    def _value(self, entry: Tuple[Any, Optional[str]], raw: bool) -> Any:
+        # raw: (cuerpo, codificación) listo para enviar (bytes con un cliente sin decode_responses)
+        return entry if raw else self.loads(entry[0])
+
+    def is_fresh(self, generation: int, latest: Tuple[int, str]) -> bool:
+        latest_generation, built_at = latest
+        age = time.time() - float(built_at)
+        if age < self.min_freshness:
+            return True
+        return latest_generation == generation and age < self.soft_ttl
+
+    def fresh_version(self, r) -> Optional[str]:
+        """Versión de la entrada que se serviría sin recalcular, o None si hay que regenerar"""
+        generation, latest = self._meta(r)
+        if latest is None or generation is None or not self.is_fresh(generation, latest):
+            return None
+        return self.version(latest)
+
+    async def afresh_version(self, r) -> Optional[str]:
+        """fresh_version() para un cliente de redis.asyncio"""
+        generation, latest = await self._ameta(r)
+        if latest is None or generation is None or not self.is_fresh(generation, latest):
+            return None
+        return self.version(latest)
+
+    async def aget_fresh(self, r, raw: bool = False, encoding: Optional[str] = None) -> Optional[Tuple[Any, str, str]]:
+        """Camino HIT de get_or_build() sin bloquear el event loop
+
+        Devuelve (valor, HIT, versión) o None si hay que regenerar; la regeneración
+        (lock + cálculo) queda en get_or_build(), que corre en un hilo.
+        """
+        generation, latest = await self._ameta(r)
+        if latest is None or generation is None or not self.is_fresh(generation, latest):
+            return None
+        cached = await self._aread(r, latest, encoding if raw else None)
+        if cached is None:
+            return None
+        return self._value(cached, raw), HIT, self.version(latest)
+
+    def get_or_build(self, r, build: Callable[[], Any], raw: bool = False,
+                     encoding: Optional[str] = None) -> Tuple[Any, str, Optional[str]]:
+        """Devuelve (valor, estado, versión)
+
+        El estado es HIT, STALE o MISS (calculado en esta request); la versión es
+        None si el valor no pudo publicarse en la caché. Con `raw` los HIT y STALE
+        devuelven (cuerpo, codificación) sin decodificar, en la variante `encoding`
+        si está guardada; un MISS devuelve siempre el valor calculado.
+        """
+        generation, latest = self._meta(r)
+        encoding = encoding if raw else None
+
+        cached = None
+        if latest is not None:
+            cached = self._read(r, latest, encoding)
+            if cached is not None and generation is not None and self.is_fresh(generation, latest):
+                return self._value(cached, raw), HIT, self.version(latest)
+
+        lock = r.lock(self.lock_key, timeout=self.lock_ttl, blocking=False)
+        if lock.acquire():
+            try:
+                return self._build_and_store(r, build)
+            finally:
+                try:
+                    lock.release()
+                except Exception:
+                    pass  # El lock expiró: otro worker ya pudo tomarlo
+
+        if cached is not None:
+            # Otro worker está regenerando: se sirve la última entrada
+            return self._value(cached, raw), STALE, self.version(latest)
+
+        deadline = time.monotonic() + self.wait_timeout
+        while time.monotonic() < deadline:
+            time.sleep(self.poll_interval)
+            latest = self._latest(r.get(self.latest_key))
+            if latest is not None:
+                cached = self._read(r, latest, encoding)
+                if cached is not None:
+                    return self._value(cached, raw), HIT, self.version(latest)
+
+        # El dueño del lock tarda demasiado: calcular sin esperar más
+        return build(), MISS, None
+
+    def latest(self, r) -> Optional[Tuple[int, str]]:
+        """(generación, timestamp) de la última entrada publicada, o None"""
+        return self._latest(r.get(self.latest_key))
+
+    def refresh(self, r, build: Callable[[], Any]) -> Optional[str]:
+        """Recalcula y publica una entrada nueva si nadie más lo está haciendo
+
+        Devuelve la versión publicada, o None si otro proceso tenía el lock.
+        """
+        lock = r.lock(self.lock_key, timeout=self.lock_ttl, blocking=False)
+        if not lock.acquire():
+            return None
+        try:
+            return self._build_and_store(r, build)[2]
+        finally:
+            try:
+                lock.release()
+            except Exception:
+                pass  # El lock expiró: otro worker ya pudo tomarlo
+
+    def _snapshot(self, generation, latest, cached, raw: bool) -> Optional[Tuple[Any, str, str, float]]:
+        if latest is None or cached is None:
+            return None
+        fresh = generation is not None and self.is_fresh(generation, latest)
+        return self._value(cached, raw), HIT if fresh else STALE, self.version(latest), time.time() - float(latest[1])
+
+    def get_snapshot(self, r, raw: bool = False, encoding: Optional[str] = None) -> Optional[Tuple[Any, str, str, float]]:
+        """Última entrada publicada, sin recalcular nunca: (valor, estado, versión, antigüedad)
+
+        El estado es HIT si la entrada está fresca y STALE si no; None si todavía
+        no se publicó ninguna (o expiró). Con `raw` el valor es (cuerpo,
+        codificación), como en get_or_build().
+        """
+        generation, latest = self._meta(r)
+        cached = self._read(r, latest, encoding if raw else None) if latest is not None else None
+        return self._snapshot(generation, latest, cached, raw)
+
+    async def aget_snapshot(self, r, raw: bool = False,
+                            encoding: Optional[str] = None) -> Optional[Tuple[Any, str, str, float]]:
+        """get_snapshot() para un cliente de redis.asyncio"""
+        generation, latest = await self._ameta(r)
+        cached = await self._aread(r, latest, encoding if raw else None) if latest is not None else None
+        return self._snapshot(generation, latest, cached, raw)
+
+    def snapshot_version(self, r) -> Optional[str]:
+        """Versión (ETag) de la última entrada publicada, fresca o no"""
+        latest = self._meta(r)[1]
+        return self.version(latest) if latest is not None else None
+
+    async def asnapshot_version(self, r) -> Optional[str]:
+        """snapshot_version() para un cliente de redis.asyncio"""
+        latest = (await self._ameta(r))[1]
+        return self.version(latest) if latest is not None else None
+
+    def _build_and_store(self, r, build: Callable[[], Any]) -> Tuple[Any, str, Optional[str]]:
+        # La generación se lee antes de calcular: si hay escrituras durante el
+        # cálculo, la entrada queda vieja y la próxima lectura la regenera
+        generation = get_generation(r)
+        value = build()
+        latest = (generation, repr(time.time()))
+        # Se codifica y comprime una sola vez por entrada, no en cada lectura
+        body = self.dumps(value)
+        variants = {encoding: compress(body, encoding) for encoding in self.encodings}
+        sizes = {IDENTITY: len(body), **{encoding: len(data) for encoding, data in variants.items()}}
+        try:
+            pipe = r.pipeline(transaction=True)
+            pipe.set(self.entry_key(generation), body, ex=self.hard_ttl)
+            for encoding, data in variants.items():
+                pipe.set(self.entry_key(generation, encoding), data, ex=self.hard_ttl)
+            pipe.delete(self.sizes_key)
+            pipe.hset(self.sizes_key, mapping=sizes)
+            pipe.expire(self.sizes_key, self.hard_ttl)
+            pipe.set(self.latest_key, f"{latest[0]}:{latest[1]}", ex=self.hard_ttl)
+            pipe.publish(EVENTS_CHANNEL, "published")  # Los niveles locales leen la nueva entrada
+            pipe.execute()
+        except RedisError:
+            # Si Redis falla, no importa para el funcionamiento principal
+            return value, MISS, None
+        invalidate_local_caches()
+        return value, MISS, self.version(latest)
+
+    def storage_stats(self, r) -> Optional[Dict[str, Any]]:
+        """Bytes guardados de la última entrada por codificación y su relación con el JSON
+
+            {"bytes": {"identity": 2200000, "gzip": 310000, "br": 205000},
+             "ratio": {"gzip": 0.1409, "br": 0.0932}}
+        """
+        sizes = r.hgetall(self.sizes_key)
+        if not sizes:
+            return None
+        sizes = {
+            (encoding.decode() if isinstance(encoding, bytes) else encoding): int(size)
+            for encoding, size in sizes.items()
+        }
+        identity = sizes.get(IDENTITY)
+        ratio = {
+            encoding: round(size / identity, 4)
+            for encoding, size in sizes.items() if encoding != IDENTITY and identity
+        }
+        return {"bytes": sizes, "ratio": ratio}
+
+    def clear(self, r) -> None:
+        """Olvida la última entrada: la próxima lectura recalcula sin servir valores viejos"""
+        pipe = r.pipeline(transaction=False)
+        pipe.delete(self.latest_key)
+        pipe.publish(EVENTS_CHANNEL, "clear")  # build_reports publica una nueva enseguida
+        pipe.execute()
+        invalidate_local_caches()
+
+    async def aclear(self, r) -> None:
+        """clear() para un cliente de redis.asyncio"""
+        pipe = r.pipeline(transaction=False)
+        pipe.delete(self.latest_key)
+        pipe.publish(EVENTS_CHANNEL, "clear")
+        await pipe.execute()
+        invalidate_local_caches()
+
+
+# Un HIT de /api/data/ es el reporte guardado con from_cache=True y load_time=0
+data_cache = ReportCache.from_settings(
+    "data", key="todos_data_cache", hit_fields={"from_cache": True, "load_time": 0}
+)
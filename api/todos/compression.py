@@ -0,0 +1,58 @@
+import gzip
+from typing import Dict, Iterable, Optional, Tuple
+
+try:
+    import brotli
+except ImportError:  # Opcional: sin brotli solo se guarda la variante gzip
+    brotli = None
+
+# Niveles pensados para comprimir una vez por reporte publicado: gzip 6 y
+# brotli 5 comprimen casi como los máximos en una fracción del tiempo
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+IDENTITY = "identity"
+
+
+def available_encodings() -> Tuple[str, ...]:
+    """Codificaciones que se pueden generar en este proceso, de la preferida a la menos"""
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "gzip":
+        # mtime=0: el mismo cuerpo da siempre los mismos bytes
+        return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+    if encoding == "br" and brotli is not None:
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    raise ValueError(f"codificación no soportada: {encoding}")
+
+
+def parse_accept_encoding(header: Optional[str]) -> Dict[str, float]:
+    """{codificación: q} de un header Accept-Encoding (`gzip, br;q=0.8, *;q=0`)"""
+    accepted = {}
+    for part in (header or "").split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[name] = q
+    return accepted
+
+
+def negotiate(header: Optional[str], encodings: Iterable[str]) -> Optional[str]:
+    """Codificación a enviar entre `encodings` (en orden de preferencia), o None para identity"""
+    accepted = parse_accept_encoding(header)
+    best, best_q = None, 0.0
+    for encoding in encodings:
+        q = accepted.get(encoding, accepted.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
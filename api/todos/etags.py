@@ -0,0 +1,65 @@
+import hashlib
+from typing import Optional
+
+from rest_framework import status
+from rest_framework.response import Response
+
+from .cache import aget_generation, get_generation
+
+
+def make_etag(version: str, *parts: str) -> str:
+    """ETag débil: la versión de los datos más un hash corto de la representación pedida"""
+    if parts:
+        digest = hashlib.md5("|".join(parts).encode()).hexdigest()[:12]
+        return f'W/"{version}-{digest}"'
+    return f'W/"{version}"'
+
+
+def request_etag(r, request, *parts: str) -> Optional[str]:
+    """ETag para listados/detalles de tareas derivada de la generación de escritura
+
+    Cualquier escritura incrementa la generación, así que una generación igual
+    garantiza la misma respuesta para la misma URL. `parts` agrega lo que cambia
+    la respuesta sin estar en la URL (p. ej. la fecha de hoy). Sin Redis no hay ETag.
+    """
+    if r is None:
+        return None
+    try:
+        generation = get_generation(r)
+    except Exception:
+        return None
+    return make_etag(str(generation), request.path, request.META.get("QUERY_STRING", ""), *parts)
+
+
+async def arequest_etag(r, request) -> Optional[str]:
+    """request_etag() para un cliente de redis.asyncio"""
+    if r is None:
+        return None
+    try:
+        generation = await aget_generation(r)
+    except Exception:
+        return None
+    return make_etag(str(generation), request.path, request.META.get("QUERY_STRING", ""))
+
+
+def etag_matches(request, etag: Optional[str]) -> bool:
+    if etag is None:
+        return False
+    header = request.headers.get("If-None-Match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return etag in (candidate.strip() for candidate in header.split(","))
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status=status.HTTP_304_NOT_MODIFIED, headers=conditional_headers(etag))
+
+
+def conditional_headers(etag: Optional[str]) -> dict:
+    """Headers para que el navegador revalide siempre con If-None-Match"""
+    headers = {"Cache-Control": "no-cache"}
+    if etag:
+        headers["ETag"] = etag
+    return headers
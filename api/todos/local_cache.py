@@ -0,0 +1,128 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class LocalCache:
+    """LRU en memoria del proceso, acotada en bytes y con TTL por entrada
+
+    Es el primer nivel delante de Redis: evita el round-trip (y la transferencia
+    de varios MB) en las lecturas repetidas de un mismo worker. Cada worker de
+    gunicorn tiene la suya; la coherencia entre procesos la da EventSubscriber.
+    """
+
+    def __init__(self, max_bytes: int, ttl: float):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()  # clave -> (valor, bytes, vence)
+        self._lock = threading.Lock()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[2] <= time.monotonic():
+                self._remove(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key: Hashable, value: Any, size: int = 0, ttl: Optional[float] = None) -> None:
+        if size > self.max_bytes:
+            return  # Más grande que todo el nivel: no se guarda
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, size, time.monotonic() + (self.ttl if ttl is None else ttl))
+            self.size += size
+            while self.size > self.max_bytes and self._entries:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def _remove(self, key: Hashable) -> None:
+        self.size -= self._entries.pop(key)[1]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._entries),
+            "bytes": self.size,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+class EventSubscriber:
+    """Hilo que escucha un canal pub/sub de Redis y avisa cada mensaje a `on_event`
+
+    Se lanza en el primer uso dentro de cada proceso (después del fork de
+    gunicorn). Mientras no está suscripto (arranque, Redis caído) `connected` es
+    False: quien dependa de los avisos no debe confiar en lo que tenga en memoria,
+    y al reconectarse se avisa con "reconnect" porque pudo perder mensajes.
+    """
+
+    def __init__(self, channel: str, connect: Callable[[], Any], on_event: Callable[[str], None],
+                 retry_interval: float = 1.0):
+        self.channel = channel
+        self.connect = connect
+        self.on_event = on_event
+        self.retry_interval = retry_interval
+        self.connected = False
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def ensure_started(self) -> None:
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            # Un hilo heredado de otro proceso (fork) no existe en este
+            self.connected = False
+            self._pid = os.getpid()
+            threading.Thread(target=self._run, name=f"events:{self.channel}", daemon=True).start()
+
+    def _run(self) -> None:
+        while True:
+            pubsub = None
+            try:
+                pubsub = self.connect().pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self.channel)
+                pubsub.get_message(timeout=self.retry_interval)  # Confirmación de la suscripción
+                self.on_event("reconnect")
+                self.connected = True
+                while True:
+                    message = pubsub.get_message(timeout=self.retry_interval)
+                    if message is not None:
+                        data = message["data"]
+                        self.on_event(data.decode() if isinstance(data, bytes) else data)
+            except Exception:
+                pass  # Redis no disponible: se reintenta sin los datos locales
+            finally:
+                self.connected = False
+                if pubsub is not None:
+                    try:
+                        pubsub.close()
+                    except Exception:
+                        pass
+            time.sleep(self.retry_interval)
@@ -0,0 +1,129 @@
+import json
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+
+from todos.models import TODO_FIELDS, Todo, TodoTag
+from todos.pagination import KEYSET_ORDERING
+from todos.cache import data_cache
+from todos.compression import compress
+from todos.renderers import FastJSONRenderer, orjson
+from todos.reports import build_report
+
+
+class Rollback(Exception):
+    """Deshace los datos sembrados para el benchmark"""
+
+
+class Command(BaseCommand):
+    """Micro-benchmark de la serialización de los listados y del reporte de /api/data/
+
+        python manage.py bench_serialization                # 100.000 tareas
+        python manage.py bench_serialization --rows 10000 --repeat 5
+
+    Compara el camino anterior (un objeto Todo por fila + to_dict() + JSONRenderer
+    de DRF) con `.values(*TODO_FIELDS)` + FastJSONRenderer, y un HIT de
+    /api/data/ decodificado y vuelto a codificar contra el cuerpo guardado en la
+    caché. Si la tabla tiene menos de --rows tareas se siembran las que faltan y
+    se descartan al terminar.
+    """
+
+    help = "Tiempos de serialización JSON: objetos del modelo vs values() + renderer rápido"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=100000, help="Tareas a serializar (default 100000)")
+        parser.add_argument("--repeat", type=int, default=3, help="Ejecuciones por variante (se toma la mediana)")
+
+    def handle(self, *args, **options):
+        rows, repeat = options["rows"], max(1, options["repeat"])
+        missing = 0
+        try:
+            with transaction.atomic():
+                missing = rows - Todo.objects.count()
+                if missing > 0:
+                    self.seed(missing)
+                self.run(rows, repeat)
+                raise Rollback()
+        except Rollback:
+            if missing > 0:
+                self.stdout.write(f"Datos sembrados ({missing:,} tareas) descartados")
+
+    def seed(self, count):
+        todos = [Todo(title=f"Tarea {'urgent ' if i % 10 == 0 else ''}#{i}", done=i % 3 == 0) for i in range(count)]
+        for todo in todos:
+            todo.set_title_attributes()
+        TodoTag.sync(Todo.objects.bulk_create(todos, batch_size=1000))
+
+    def run(self, rows, repeat):
+        queryset = Todo.objects.order_by(*KEYSET_ORDERING)[:rows]
+        drf_renderer = JSONRenderer()
+        fast_renderer = FastJSONRenderer()
+        encoder = f"orjson {orjson.__version__}" if orjson is not None else "json (orjson no instalado)"
+        self.stdout.write(f"Serialización de {rows:,} tareas, mediana de {repeat} ejecuciones; JSON: {encoder}\n")
+
+        self.stdout.write("Listado (/api/todos/):")
+        self.compare([
+            (
+                "Todo + to_dict() + JSONRenderer",
+                lambda: [todo.to_dict() for todo in queryset.all()],
+                lambda todos: drf_renderer.render({"results": todos}),
+            ),
+            (
+                "values() + JSONRenderer",
+                lambda: list(queryset.values(*TODO_FIELDS)),
+                lambda todos: drf_renderer.render({"results": todos}),
+            ),
+            (
+                "values() + FastJSONRenderer",
+                lambda: list(queryset.values(*TODO_FIELDS)),
+                lambda todos: fast_renderer.render({"results": todos}),
+            ),
+        ], repeat)
+
+        # El reporte sale de la base una sola vez: acá solo importa la codificación
+        report = build_report(None)
+        stored, body = json.dumps(report), data_cache.dumps(report)
+        self.stdout.write(f"\nHIT de /api/data/ ({len(report['todos']):,} tareas, {len(body) / 1e6:.1f} MB):")
+        self.compare([
+            ("json.loads() + JSONRenderer", lambda: stored, lambda raw: drf_renderer.render(json.loads(raw))),
+            (
+                "json.loads() + JSONRenderer + gzip",
+                lambda: stored,
+                lambda raw: compress(drf_renderer.render(json.loads(raw)), "gzip"),
+            ),
+            ("cuerpo guardado (sin procesar)", lambda: body, bytes),
+        ], repeat)
+
+        # Costo de comprimir, que se paga una vez por reporte publicado
+        self.stdout.write("\nVariantes guardadas por build_reports:")
+        for encoding in data_cache.encodings:
+            start = time.perf_counter()
+            size = len(compress(body, encoding))
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            self.stdout.write(
+                f"  {encoding:<6} {size / 1e6:8.2f} MB   {size / len(body):6.1%} del JSON   comprimir {elapsed_ms:7.1f} ms"
+            )
+
+    def compare(self, variants, repeat):
+        baseline = None
+        for name, load, encode in variants:
+            load_times, encode_times = [], []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                data = load()
+                loaded = time.perf_counter()
+                encode(data)
+                load_times.append((loaded - start) * 1000)
+                encode_times.append((time.perf_counter() - loaded) * 1000)
+            load_ms, encode_ms = statistics.median(load_times), statistics.median(encode_times)
+            total = load_ms + encode_ms
+            baseline = baseline or total
+            # Por debajo de 0.1 ms (el cuerpo guardado) la relación no dice nada
+            speedup = f"{baseline / total:5.2f}x" if total >= 0.1 else "    -"
+            self.stdout.write(
+                f"  {name:<36} filas {load_ms:9.1f} ms   JSON {encode_ms:9.1f} ms   "
+                f"total {total:9.1f} ms   {speedup}"
+            )
@@ -0,0 +1,108 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from redis.exceptions import RedisError
+
+from todos.cache import EVENTS_CHANNEL, data_cache, get_generation
+from todos.compression import IDENTITY
+from todos.redis_client import breaker, get_redis
+from todos.reports import publish_report
+
+
+class Command(BaseCommand):
+    """Worker que mantiene publicado el reporte de /api/data/
+
+        python manage.py build_reports          # loop (start.sh lo lanza en segundo plano)
+        python manage.py build_reports --once   # un solo reporte y termina
+
+    Recalcula cuando cambia la generación (lo avisa cada escritura por pub/sub en
+    `todos:events`), como mucho una vez cada --min-interval segundos para agrupar
+    ráfagas de escrituras, y cada --interval segundos aunque no haya escrituras
+    (los flags de recencia dependen de la hora). Varios workers pueden correr a
+    la vez: el lock de la caché hace que uno solo calcule.
+    """
+
+    help = "Calcula y publica en Redis el reporte de /api/data/ (snapshot)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true", help="Publicar un reporte y terminar")
+        parser.add_argument(
+            "--interval", type=float, default=data_cache.soft_ttl,
+            help=f"Segundos entre recálculos sin escrituras (default {data_cache.soft_ttl})",
+        )
+        parser.add_argument(
+            "--min-interval", type=float, default=max(data_cache.min_freshness, 0.5),
+            help="Segundos mínimos entre recálculos disparados por escrituras",
+        )
+
+    def handle(self, *args, **options):
+        if options["once"]:
+            version = self.publish(get_redis())
+            if version is None:
+                self.stdout.write(self.style.WARNING("Otro worker está calculando el reporte"))
+            return
+
+        self.stdout.write(
+            f"build_reports: cada {options['interval']:g}s o tras escrituras (mínimo {options['min_interval']:g}s)"
+        )
+        while True:
+            try:
+                self.run_loop(options["interval"], options["min_interval"])
+            except RedisError as e:
+                self.stderr.write(f"build_reports: Redis no disponible ({e}); reintentando")
+                time.sleep(min(breaker.reset_timeout, 5))
+            except Exception as e:
+                # Base caída o error en el cálculo: se sigue sirviendo el snapshot anterior
+                self.stderr.write(f"build_reports: error calculando el reporte ({e}); reintentando")
+                time.sleep(5)
+
+    def run_loop(self, interval: float, min_interval: float) -> None:
+        r = get_redis()
+        pubsub = r.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(EVENTS_CHANNEL)
+        try:
+            while True:
+                wait = self.next_wait(r, interval, min_interval)
+                if wait <= 0:
+                    self.publish(r)
+                    continue
+                # Se despierta antes si llega una escritura; los avisos acumulados
+                # se descartan, la generación actual se lee en la próxima vuelta
+                if pubsub.get_message(timeout=wait) is not None:
+                    while pubsub.get_message(timeout=0) is not None:
+                        pass
+        finally:
+            pubsub.close()
+
+    def next_wait(self, r, interval: float, min_interval: float) -> float:
+        """Segundos hasta el próximo recálculo (0 o menos: recalcular ya)"""
+        latest = data_cache.latest(r)
+        if latest is None:
+            return 0
+        built_generation, built_at = latest
+        age = time.time() - float(built_at)
+        if built_generation != get_generation(r):
+            return min_interval - age
+        return interval - age
+
+    def publish(self, r):
+        close_old_connections()  # Proceso de larga vida: descartar conexiones vencidas
+        start = time.monotonic()
+        version = publish_report(r)
+        if version is not None:
+            elapsed = (time.monotonic() - start) * 1000
+            self.stdout.write(f"Reporte {version} publicado en {elapsed:.0f} ms ({self.sizes(r)})")
+        else:
+            # Otro worker tiene el lock: esperar a que termine en lugar de reintentar en loop
+            time.sleep(min(1.0, data_cache.lock_ttl))
+        return version
+
+    def sizes(self, r) -> str:
+        """`2.2 MB, gzip 14.1%, br 9.3%`: tamaño guardado y relación de compresión"""
+        stats = data_cache.storage_stats(r)
+        if stats is None:
+            return "sin tamaños"
+        parts = [f"{stats['bytes'][IDENTITY] / 1e6:.1f} MB"]
+        parts += [f"{encoding} {ratio:.1%}" for encoding, ratio in stats["ratio"].items()]
+        return ", ".join(parts)
@@ -0,0 +1,137 @@
+import statistics
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Count, Q
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from todos.models import Todo, TodoTag
+from todos.pagination import KEYSET_ORDERING
+from todos.reports import report_todos_queryset
+from todos.stats import start_of_day
+
+
+class Rollback(Exception):
+    """Deshace los datos sembrados con --seed"""
+
+
+def representative_queries(now):
+    """Consultas con la misma forma que las de la API (listado, stats, reporte)"""
+    today_start = start_of_day(timezone.localdate(now))
+    week_start = now - timedelta(days=7)
+    # Cursor de una página "profunda": mismo filtro que genera pagination.paginate
+    pivot = now - timedelta(days=180)
+    return [
+        ("listado (primera página)", Todo.objects.order_by(*KEYSET_ORDERING)[:100]),
+        ("listado (página con cursor)", Todo.objects.filter(
+            Q(created_at__lt=pivot) | Q(created_at=pivot, id__lt=0)
+        ).order_by(*KEYSET_ORDERING)[:100]),
+        ("creadas hoy", Todo.objects.filter(created_at__gte=today_start).values("id").order_by()),
+        ("creadas por día (7 días)", Todo.objects.filter(created_at__gte=week_start)
+            .annotate(day=TruncDate("created_at")).values("day").annotate(n=Count("id")).order_by()),
+        ("completadas recientes", Todo.objects.filter(done=True, updated_at__gte=week_start).values("id").order_by()),
+        ("reporte ordenado", report_todos_queryset()[:100]),
+        # En SQLite LIKE '%...%' no puede usar índices: sigue siendo un SCAN
+        ("título contiene 'urgent'", Todo.objects.filter(title__icontains="urgent").values("id").order_by()),
+        ("etiqueta 'urgent' (?tag=)", Todo.objects.filter(tags__tag="urgent").order_by(*KEYSET_ORDERING)[:100]),
+        ("tareas por etiqueta", TodoTag.objects.values("tag").annotate(n=Count("id")).order_by()),
+    ]
+
+
+def plan_kind(plan: str) -> str:
+    """Clasifica un plan de EXPLAIN: índice o recorrido completo de la tabla
+
+    "INDEX + SORT" si usa un índice pero igual ordena las filas en memoria.
+    """
+    kind = scan_kind(plan)
+    if kind == "INDEX" and ("TEMP B-TREE FOR ORDER BY" in plan or "TEMP B-TREE FOR RIGHT PART OF ORDER BY" in plan
+                            or "Sort Key" in plan):
+        return "INDEX + SORT"
+    return kind
+
+
+def scan_kind(plan: str) -> str:
+    if connection.vendor == "postgresql":
+        if "Seq Scan" in plan:
+            return "SEQ SCAN"
+        return "INDEX" if "Index" in plan else "?"
+    # SQLite: "SCAN tabla" sin índice, "SCAN ... USING COVERING INDEX" recorre el
+    # índice completo, "SEARCH ... USING INDEX" / "SCAN ... USING INDEX" (orden) usan el índice
+    lines = [line for line in plan.splitlines() if "SCAN " in line or "SEARCH " in line]
+    if any("USING" not in line for line in lines if "SCAN " in line):
+        return "SEQ SCAN"
+    if any("COVERING INDEX" in line for line in lines if "SCAN " in line) and not any("SEARCH " in line for line in lines):
+        return "FULL INDEX SCAN"
+    return "INDEX" if "INDEX" in plan else "?"
+
+
+class Command(BaseCommand):
+    """Muestra los planes de EXPLAIN de las consultas principales sobre `todos_todo`
+
+    Para comparar antes/después de los índices:
+        python manage.py migrate todos 0002 && python manage.py explain_queries --seed 50000
+        python manage.py migrate todos && python manage.py explain_queries --seed 50000
+    """
+
+    help = "Planes de EXPLAIN y tiempos de las consultas de la API sobre todos_todo"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=0,
+            help="Sembrar N tareas temporales (se deshacen al terminar) para que el planner vea una tabla real",
+        )
+        parser.add_argument("--repeat", type=int, default=5, help="Ejecuciones por consulta para medir el tiempo")
+        parser.add_argument("--analyze", action="store_true", help="EXPLAIN ANALYZE (solo PostgreSQL)")
+        parser.add_argument("--verbose-plans", action="store_true", help="Imprimir el plan completo")
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                if options["seed"]:
+                    self.seed(options["seed"])
+                self.report(options)
+                if options["seed"]:
+                    raise Rollback()
+        except Rollback:
+            self.stdout.write(f"Datos sembrados ({options['seed']:,} tareas) descartados")
+
+    def seed(self, count):
+        now = timezone.now()
+        todos = [Todo(title=f"Tarea {'urgent ' if i % 10 == 0 else ''}#{i}", done=i % 3 == 0) for i in range(count)]
+        created = Todo.objects.bulk_create(todos, batch_size=1000)
+        TodoTag.sync(created)
+        # auto_now_add fija la fecha actual: se reparten las tareas en el último año
+        ids = [todo.id for todo in created]
+        per_day = max(1, len(ids) // 365)
+        for day, offset in enumerate(range(0, len(ids), per_day)):
+            moment = now - timedelta(days=day % 365, minutes=day)
+            Todo.objects.filter(id__in=ids[offset:offset + per_day]).update(created_at=moment, updated_at=moment)
+        # Estadísticas actualizadas para que el planner elija con la tabla ya cargada
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE todos_todo")
+            cursor.execute("ANALYZE todos_todotag")
+
+    def report(self, options):
+        now = timezone.now()
+        explain_options = {"analyze": True} if options["analyze"] and connection.vendor == "postgresql" else {}
+        self.stdout.write(f"Base: {connection.vendor}, tareas: {Todo.objects.count():,}\n")
+
+        for name, queryset in representative_queries(now):
+            plan = queryset.explain(**explain_options)
+            timings = []
+            for _ in range(max(1, options["repeat"])):
+                start = time.perf_counter()
+                list(queryset.all())
+                timings.append((time.perf_counter() - start) * 1000)
+
+            kind = plan_kind(plan)
+            style = self.style.SUCCESS if kind == "INDEX" else self.style.WARNING
+            self.stdout.write(f"{style(kind.ljust(15))} {statistics.median(timings):8.2f} ms  {name}")
+            if options["verbose_plans"] or kind != "INDEX":
+                for line in plan.splitlines():
+                    self.stdout.write(f"{'':28}{line}")
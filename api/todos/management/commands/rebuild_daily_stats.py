@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from todos.models import TodoDailyStat
+from todos.stats import expected_daily_stats, rebuild_daily_stats
+
+
+class Command(BaseCommand):
+    """Reconstruye el rollup diario (TodoDailyStat) desde la tabla Todo
+
+    Para cargarlo después de escrituras que no pasan por la API (imports,
+    bulk_create, SQL a mano) o verificarlo periódicamente:
+        python manage.py rebuild_daily_stats          # reconstruye
+        python manage.py rebuild_daily_stats --check  # solo verifica (exit 1 si hay diferencias)
+    """
+
+    help = "Reconstruye las filas de TodoDailyStat (/api/stats/timeseries/) desde la base"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Solo informar diferencias, sin modificar el rollup",
+        )
+
+    def handle(self, *args, **options):
+        if options["check"]:
+            expected = expected_daily_stats()
+            actual = {
+                row[0]: row[1:]
+                for row in TodoDailyStat.objects.values_list("day", "created", "completed", "done_updated")
+                if any(row[1:])
+            }
+            drift = [day for day in sorted(set(actual) | set(expected)) if actual.get(day) != expected.get(day)]
+            for day in drift:
+                self.stdout.write(f"  {day}: rollup={actual.get(day, (0, 0, 0))} base={expected.get(day, (0, 0, 0))}")
+            if drift:
+                raise CommandError(f"{len(drift)} días con diferencias")
+            self.stdout.write(self.style.SUCCESS("Rollup diario consistente"))
+            return
+
+        days = rebuild_daily_stats()
+        self.stdout.write(self.style.SUCCESS(f"Rollup diario reconstruido: {days} días"))
@@ -0,0 +1,62 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from todos.stats import COUNTER_DAYS, COUNTERS_KEY, COUNTER_KEYS, StatsDelta, rebuild_counters
+from todos.models import Todo
+from todos.redis_client import get_redis
+
+
+class Command(BaseCommand):
+    """Verifica y repara los contadores de estadísticas de Redis contra la tabla Todo
+
+    Pensado para correr cada noche (cron) o a demanda:
+        python manage.py reconcile_stats          # verifica y corrige
+        python manage.py reconcile_stats --check  # solo verifica (exit 1 si hay diferencias)
+    """
+
+    help = "Verifica y reconstruye los contadores de stats de /api/data/ desde la base"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Solo informar diferencias, sin modificar Redis",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            r = get_redis()
+        except Exception as e:
+            raise CommandError(f"Redis no disponible: {e}")
+
+        now = timezone.now()
+        since = str(timezone.localdate(now) - timedelta(days=COUNTER_DAYS - 1))
+        expected = StatsDelta().add_queryset(Todo.objects.all(), now=now).as_hashes()
+        drift = []
+        for key in COUNTER_KEYS:
+            actual = {field: int(value) for field, value in r.hgetall(key).items() if field != "ready"}
+            actual = {field: value for field, value in actual.items() if value}
+            wanted = expected.get(key, {})
+            for field in sorted(set(actual) | set(wanted)):
+                if key != COUNTERS_KEY and field < since:
+                    # Días fuera de la ventana mantenida: no se verifican
+                    continue
+                if actual.get(field, 0) != wanted.get(field, 0):
+                    drift.append((key, field, actual.get(field, 0), wanted.get(field, 0)))
+
+        ready = bool(r.hget(COUNTERS_KEY, "ready"))
+        for key, field, actual, wanted in drift:
+            self.stdout.write(f"  {key}[{field}]: redis={actual} base={wanted}")
+
+        if not drift and ready:
+            self.stdout.write(self.style.SUCCESS("Contadores consistentes"))
+            return
+
+        summary = f"{len(drift)} contadores con diferencias" + ("" if ready else " (contadores sin inicializar)")
+        if options["check"]:
+            raise CommandError(summary)
+
+        rebuild_counters(r, now)
+        self.stdout.write(self.style.WARNING(f"{summary}: reconstruidos desde la base"))
@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from todos.cache import bump_generation
+from todos.models import Todo, TodoTag, tracked_keywords
+from todos.redis_client import get_redis
+from todos.stats import rebuild_counters, tag_counts
+
+
+class Command(BaseCommand):
+    """Vuelve a etiquetar todas las tareas con las palabras clave configuradas
+
+    Necesario después de cambiar TODOS_TRACKED_KEYWORDS:
+        python manage.py retag_todos
+    """
+
+    help = "Reconstruye la tabla de etiquetas (TodoTag) y los contadores de palabras clave"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=2000, help="Tareas por lote")
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        self.stdout.write(f"Palabras clave: {', '.join(tracked_keywords())}")
+
+        with transaction.atomic():
+            TodoTag.objects.all().delete()
+            batch = []
+            for todo in Todo.objects.only("id", "title").order_by("id").iterator(chunk_size=batch_size):
+                batch.append(todo)
+                if len(batch) >= batch_size:
+                    TodoTag.sync(batch, batch_size=batch_size)
+                    batch = []
+            if batch:
+                TodoTag.sync(batch, batch_size=batch_size)
+
+        for tag, count in sorted(tag_counts().items()):
+            self.stdout.write(f"  {tag}: {count:,}")
+
+        try:
+            r = get_redis()
+            rebuild_counters(r)
+            bump_generation(r)
+            self.stdout.write(self.style.SUCCESS("Etiquetas y contadores reconstruidos"))
+        except Exception as e:
+            self.stdout.write(self.style.WARNING(f"Etiquetas reconstruidas; contadores sin actualizar ({e})"))
@@ -0,0 +1,17 @@
+# Generated by Django 5.0.6 on 2026-10-17 01:28
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("todos", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="todo",
+            options={"ordering": ["-created_at", "-id"]},
+        ),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 5.0.6 on 2026-10-17 01:36
+
+from django.db import migrations, models
+
+TRIGRAM_INDEX = "todo_title_upper_trgm_idx"
+
+
+def create_trigram_index(apps, schema_editor):
+    # `title__icontains` en PostgreSQL se traduce a UPPER("title"::text) LIKE UPPER('%...%'):
+    # el índice GIN trigram sobre esa misma expresión evita el seq scan.
+    # En SQLite (desarrollo local) no hay pg_trgm: se omite.
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    schema_editor.execute(
+        f'CREATE INDEX IF NOT EXISTS {TRIGRAM_INDEX} ON todos_todo '
+        f'USING gin ((UPPER("title"::text)) gin_trgm_ops)'
+    )
+
+
+def drop_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(f"DROP INDEX IF EXISTS {TRIGRAM_INDEX}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("todos", "0002_todo_keyset_ordering"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="todo",
+            index=models.Index(
+                fields=["created_at", "id"], name="todo_created_id_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="todo",
+            index=models.Index(
+                fields=["-created_at", "title"], name="todo_created_title_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="todo",
+            index=models.Index(
+                condition=models.Q(("done", True)),
+                fields=["updated_at"],
+                name="todo_done_updated_idx",
+            ),
+        ),
+        migrations.RunPython(create_trigram_index, drop_trigram_index),
+    ]
@@ -0,0 +1,59 @@
+# Generated by Django 5.0.6 on 2026-10-17 01:37
+
+from django.db import migrations, models
+
+BACKFILL_BATCH_SIZE = 2000
+
+
+def backfill_title_attributes(apps, schema_editor):
+    # Copia de todos.models.title_attributes: las migraciones no deben depender
+    # del código actual del modelo
+    Todo = apps.get_model("todos", "Todo")
+    fields = ["title_words", "title_length", "has_numbers", "has_special_chars"]
+    batch = []
+    for todo in Todo.objects.only("id", "title").order_by("id").iterator(
+        chunk_size=BACKFILL_BATCH_SIZE
+    ):
+        todo.title_words = len(todo.title.split())
+        todo.title_length = len(todo.title)
+        todo.has_numbers = any(char.isdigit() for char in todo.title)
+        todo.has_special_chars = any(char in "!@#$%^&*()" for char in todo.title)
+        batch.append(todo)
+        if len(batch) >= BACKFILL_BATCH_SIZE:
+            Todo.objects.bulk_update(batch, fields)
+            batch = []
+    if batch:
+        Todo.objects.bulk_update(batch, fields)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("todos", "0003_todo_query_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="todo",
+            name="title_words",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="todo",
+            name="title_length",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="todo",
+            name="has_numbers",
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name="todo",
+            name="has_special_chars",
+            field=models.BooleanField(default=False),
+        ),
+        migrations.RunPython(
+            backfill_title_attributes, migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,74 @@
+# Generated by Django 5.0.6 on 2026-10-17 01:38
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+BACKFILL_BATCH_SIZE = 2000
+# Lista congelada al crear la migración: no lee settings para que correrla
+# dé siempre el mismo resultado. Con otras TODOS_TRACKED_KEYWORDS, después de
+# migrar: python manage.py retag_todos
+BACKFILL_KEYWORDS = ("urgent", "important", "critical")
+
+
+def backfill_tags(apps, schema_editor):
+    # Etiqueta las tareas existentes con las palabras clave por defecto
+    # (misma regla que todos.models.extract_tags)
+    Todo = apps.get_model("todos", "Todo")
+    TodoTag = apps.get_model("todos", "TodoTag")
+    tags = []
+    for todo_id, title in (
+        Todo.objects.order_by("id")
+        .values_list("id", "title")
+        .iterator(chunk_size=BACKFILL_BATCH_SIZE)
+    ):
+        lowered = title.lower()
+        tags.extend(
+            TodoTag(todo_id=todo_id, tag=keyword)
+            for keyword in BACKFILL_KEYWORDS
+            if keyword in lowered
+        )
+        if len(tags) >= BACKFILL_BATCH_SIZE:
+            TodoTag.objects.bulk_create(tags)
+            tags = []
+    if tags:
+        TodoTag.objects.bulk_create(tags)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("todos", "0004_todo_title_attributes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TodoTag",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("tag", models.CharField(max_length=50)),
+                (
+                    "todo",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="tags",
+                        to="todos.todo",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name="todotag",
+            constraint=models.UniqueConstraint(
+                fields=("tag", "todo"), name="todo_tag_unique"
+            ),
+        ),
+        migrations.RunPython(backfill_tags, migrations.RunPython.noop),
+    ]
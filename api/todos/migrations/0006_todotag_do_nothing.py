@@ -0,0 +1,29 @@
+# Generated by Django 5.0.6 on 2026-10-17 01:53
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # Solo cambia el estado de Django (on_delete no existe en la base; la FK se
+    # mantiene): las etiquetas las borran Todo.delete() y TodoQuerySet.delete()
+
+    dependencies = [
+        ("todos", "0005_todotag"),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="todo",
+            options={"base_manager_name": "objects", "ordering": ["-created_at", "-id"]},
+        ),
+        migrations.AlterField(
+            model_name="todotag",
+            name="todo",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.DO_NOTHING,
+                related_name="tags",
+                to="todos.todo",
+            ),
+        ),
+    ]
@@ -0,0 +1,66 @@
+# Generated by Django 5.0.6 on 2026-10-17 02:12
+
+from django.db import migrations, models
+from django.db.models import Count, Q
+from django.db.models.functions import TruncDate
+
+
+def backfill_daily_stats(apps, schema_editor):
+    # Agrupa las tareas existentes por día (misma regla que
+    # todos.stats.rebuild_daily_stats): dos GROUP BY, sin traer las filas
+    Todo = apps.get_model("todos", "Todo")
+    TodoDailyStat = apps.get_model("todos", "TodoDailyStat")
+    days = {}
+    by_created = (
+        Todo.objects.order_by()
+        .annotate(day=TruncDate("created_at"))
+        .values("day")
+        .annotate(created=Count("id"), completed=Count("id", filter=Q(done=True)))
+    )
+    for row in by_created:
+        day = days.setdefault(row["day"], TodoDailyStat(day=row["day"]))
+        day.created, day.completed = row["created"], row["completed"]
+    by_updated = (
+        Todo.objects.filter(done=True)
+        .order_by()
+        .annotate(day=TruncDate("updated_at"))
+        .values("day")
+        .annotate(completed=Count("id"))
+    )
+    for row in by_updated:
+        days.setdefault(row["day"], TodoDailyStat(day=row["day"])).done_updated = row[
+            "completed"
+        ]
+    TodoDailyStat.objects.bulk_create(days.values(), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("todos", "0006_todotag_do_nothing"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TodoDailyStat",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("day", models.DateField(unique=True)),
+                ("created", models.IntegerField(default=0)),
+                ("completed", models.IntegerField(default=0)),
+                ("done_updated", models.IntegerField(default=0)),
+            ],
+            options={
+                "ordering": ["day"],
+            },
+        ),
+        migrations.RunPython(backfill_daily_stats, migrations.RunPython.noop),
+    ]
@@ -1,4 +1,34 @@
-from django.db import models
+from django.conf import settings
+from django.db import connection, models, transaction
+
+# Caracteres que cuentan como "especiales" en el análisis de títulos
+SPECIAL_CHARS = "!@#$%^&*()"
+
+# Campos de la representación JSON de una tarea, en el orden de Todo.to_dict().
+# Los listados leen solo estos con `.values(*TODO_FIELDS)`: un dict por fila en
+# lugar de un objeto Todo, y las fechas las codifica el renderer (orjson)
+TODO_FIELDS = ('id', 'title', 'done', 'created_at', 'updated_at')
+
+
+def tracked_keywords():
+    """Palabras clave etiquetadas (settings.TODOS_TRACKED_KEYWORDS)"""
+    return tuple(getattr(settings, 'TODOS_TRACKED_KEYWORDS', ('urgent', 'important', 'critical')))
+
+
+def extract_tags(title):
+    """Palabras clave contenidas en el título (misma semántica que `icontains`)"""
+    lowered = title.lower()
+    return [keyword for keyword in tracked_keywords() if keyword in lowered]
+
+
+def title_attributes(title):
+    """Atributos derivados del título (se guardan en la tarea al escribirla)"""
+    return {
+        'title_words': len(title.split()),
+        'title_length': len(title),
+        'has_numbers': any(char.isdigit() for char in title),
+        'has_special_chars': any(char in SPECIAL_CHARS for char in title),
+    }
 
 
 class User(models.Model):
@@ -30,19 +60,94 @@ class Product(models.Model):
         ordering = ['name']
 
 
+class TodoQuerySet(models.QuerySet):
+    def delete(self):
+        """Borra las tareas y sus etiquetas con dos DELETE, sin importar cuántas sean
+
+        Las etiquetas se borran primero con un subquery; como TodoTag no borra en
+        cascada (DO_NOTHING) y no hay señales de borrado, Django borra las tareas
+        con un único DELETE sin traer las filas (en vez de de a 100 ids).
+        """
+        with transaction.atomic(savepoint=False):
+            TodoTag.objects.filter(todo__in=self.values('id')).delete()
+            return super().delete()
+
+    delete.alters_data = True
+
+
 class Todo(models.Model):
     """Modelo para tareas/todos - almacenamiento principal en PostgreSQL"""
     title = models.CharField(max_length=255)
     done = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+
+    # Derivados del título: se calculan al crear la tarea o cambiar el título,
+    # así `title_analytics` de /api/data/ es una agregación en la base
+    title_words = models.PositiveIntegerField(default=0)
+    title_length = models.PositiveIntegerField(default=0)
+    has_numbers = models.BooleanField(default=False)
+    has_special_chars = models.BooleanField(default=False)
+
+    objects = TodoQuerySet.as_manager()
     
     def __str__(self):
         return f"Todo #{self.id}: {self.title}"
+
+    def set_title_attributes(self):
+        """Recalcula los campos derivados del título (bulk_create no llama a save())"""
+        for field, value in title_attributes(self.title).items():
+            setattr(self, field, value)
     
     class Meta:
-        ordering = ['-created_at']  # Más recientes primero
+        ordering = ['-created_at', '-id']  # Más recientes primero (id desempata para paginar)
+        # También _base_manager (accesos por relación, código genérico) borra las
+        # etiquetas antes que las tareas: la FK de TodoTag sigue en la base
+        base_manager_name = 'objects'
+        indexes = [
+            # Paginación keyset y ventanas por fecha de creación (rangos sobre created_at)
+            models.Index(fields=['created_at', 'id'], name='todo_created_id_idx'),
+            # Orden del reporte de /api/data/ (-created_at, title) sin ordenar en memoria: las
+            # direcciones mezcladas necesitan created_at DESC en el índice
+            models.Index(fields=['-created_at', 'title'], name='todo_created_title_idx'),
+            # "Completadas recientemente": done=True + rango de updated_at
+            models.Index(fields=['updated_at'], condition=models.Q(done=True), name='todo_done_updated_idx'),
+        ]
+        # En PostgreSQL además hay un índice GIN trigram sobre UPPER(title) para
+        # `title__icontains` (ver migración 0003; no existe en SQLite)
         
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Título leído de la base: save() solo recalcula derivados y etiquetas si cambió
+        instance._loaded_title = instance.__dict__.get('title')
+        return instance
+
+    def title_changed(self):
+        """True si el título difiere del leído de la base (o la tarea no vino de la base)"""
+        return self._state.adding or getattr(self, '_loaded_title', None) != self.title
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        title_written = (update_fields is None or 'title' in update_fields) and self.title_changed()
+        if not title_written:
+            # Ej.: un PATCH que solo cambia `done` no toca las etiquetas
+            super().save(*args, **kwargs)
+            return
+        self.set_title_attributes()
+        if update_fields is not None:
+            kwargs['update_fields'] = set(update_fields) | set(title_attributes(self.title))
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            TodoTag.sync([self])
+        self._loaded_title = self.title
+
+    def delete(self, *args, **kwargs):
+        """Borra la tarea y sus etiquetas (TodoTag no borra en cascada)"""
+        with transaction.atomic(savepoint=False):
+            TodoTag.objects.filter(todo_id=self.id).delete()
+            return super().delete(*args, **kwargs)
+
     def to_dict(self):
         """Serializar a diccionario para JSON response"""
         return {
@@ -51,4 +156,76 @@ class Todo(models.Model):
             'done': self.done,
             'created_at': self.created_at.isoformat(),
             'updated_at': self.updated_at.isoformat(),
-        }
\ No newline at end of file
+        }
+
+
+class TodoTag(models.Model):
+    """Palabra clave presente en el título de una tarea, extraída al escribirla
+
+    Reemplaza los `title ILIKE '%palabra%'` sobre toda la tabla: filtrar por
+    etiqueta o contar por etiqueta usa el índice único (tag, todo).
+    """
+    # Sin cascada en Django: Todo.delete() y TodoQuerySet.delete() (también vía
+    # _base_manager) borran las etiquetas antes, así el borrado masivo de tareas
+    # es un único DELETE. La restricción de FK sigue en la base (db_constraint)
+    todo = models.ForeignKey(Todo, on_delete=models.DO_NOTHING, related_name='tags')
+    tag = models.CharField(max_length=50)
+
+    def __str__(self):
+        return f"{self.tag} -> Todo #{self.todo_id}"
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['tag', 'todo'], name='todo_tag_unique'),
+        ]
+
+    @classmethod
+    def sync(cls, todos, batch_size=1000):
+        """Reemplaza las etiquetas de `todos` según su título actual"""
+        todos = list(todos)
+        cls.objects.filter(todo_id__in=[todo.id for todo in todos]).delete()
+        cls.objects.bulk_create(
+            [cls(todo_id=todo.id, tag=tag) for todo in todos for tag in extract_tags(todo.title)],
+            batch_size=batch_size,
+        )
+
+
+class TodoDailyStat(models.Model):
+    """Rollup diario de las tareas: una fila por día, ajustada en cada escritura
+
+    Es el resultado de agrupar la tabla Todo por día, guardado de forma
+    incremental: `created` son las tareas creadas ese día que siguen existiendo,
+    `completed` cuántas de ellas están completadas y `done_updated` las
+    completadas cuya última modificación fue ese día. Las series por día, semana
+    o mes se leen de acá en una sola consulta por rango sobre `day`.
+    """
+    day = models.DateField(unique=True)
+    created = models.IntegerField(default=0)
+    completed = models.IntegerField(default=0)
+    done_updated = models.IntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.day}: {self.created} creadas, {self.completed} completadas"
+
+    class Meta:
+        ordering = ['day']
+
+    @classmethod
+    def add(cls, rows):
+        """Suma (día, created, completed, done_updated) a las filas del rollup
+
+        Un único upsert (INSERT ... ON CONFLICT, PostgreSQL y SQLite): es atómico
+        aunque dos escrituras concurrentes creen la fila del mismo día.
+        """
+        rows = [(connection.ops.adapt_datefield_value(day), *counts) for day, *counts in rows]
+        if not rows:
+            return
+        table = connection.ops.quote_name(cls._meta.db_table)
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f'INSERT INTO {table} (day, created, completed, done_updated) VALUES (%s, %s, %s, %s) '
+                f'ON CONFLICT (day) DO UPDATE SET created = {table}.created + excluded.created, '
+                f'completed = {table}.completed + excluded.completed, '
+                f'done_updated = {table}.done_updated + excluded.done_updated',
+                rows,
+            )
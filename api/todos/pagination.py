@@ -0,0 +1,80 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+
+from django.db.models import Q
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+# Mismo orden que Todo.Meta.ordering: (-created_at, -id) es único y estable
+KEYSET_ORDERING = ("-created_at", "-id")
+
+
+def encode_cursor(created_at: datetime, pk: int) -> str:
+    """Cursor opaco con la posición (created_at, id) del último elemento de la página"""
+    raw = json.dumps([created_at.isoformat(), pk], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Decodifica un cursor; lanza ValueError si es inválido"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, pk = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        created_at = datetime.fromisoformat(created_at)
+        if created_at.tzinfo is None or not isinstance(pk, int):
+            raise ValueError
+        return created_at, pk
+    except Exception:
+        raise ValueError("cursor inválido")
+
+
+def parse_limit(value: Optional[str]) -> int:
+    """Valida `limit` (1..MAX_PAGE_SIZE); lanza ValueError si es inválido"""
+    if value in (None, ""):
+        return DEFAULT_PAGE_SIZE
+    try:
+        limit = int(value)
+    except (TypeError, ValueError):
+        limit = 0
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        raise ValueError(f"limit debe estar entre 1 y {MAX_PAGE_SIZE}")
+    return limit
+
+
+def keyset_queryset(queryset, cursor: Optional[str]):
+    """Ordena por (created_at, id) y filtra las filas posteriores al cursor"""
+    queryset = queryset.order_by(*KEYSET_ORDERING)
+    if cursor:
+        created_at, pk = decode_cursor(cursor)
+        queryset = queryset.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk))
+    return queryset
+
+
+def _page(rows: List[Any], limit: int) -> Tuple[List[Any], Optional[str]]:
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        # Filas de .values() (dicts) o instancias del modelo
+        if isinstance(last, dict):
+            next_cursor = encode_cursor(last["created_at"], last["id"])
+        else:
+            next_cursor = encode_cursor(last.created_at, last.id)
+    return rows, next_cursor
+
+
+def paginate(queryset, cursor: Optional[str], limit: int) -> Tuple[List[Any], Optional[str]]:
+    """Paginación por keyset sobre (created_at, id)
+
+    El costo de cada página es constante (un index range scan de `limit + 1` filas),
+    sin importar cuán profundo se esté en el listado, a diferencia de OFFSET.
+    """
+    return _page(list(keyset_queryset(queryset, cursor)[: limit + 1]), limit)
+
+
+async def apaginate(queryset, cursor: Optional[str], limit: int) -> Tuple[List[Any], Optional[str]]:
+    """paginate() con el ORM async"""
+    return _page([row async for row in keyset_queryset(queryset, cursor)[: limit + 1]], limit)
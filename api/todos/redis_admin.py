@@ -0,0 +1,254 @@
+import json
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Límites de /api/redis-admin/: una página de SCAN nunca recorre ni devuelve
+# más que esto, así inspeccionar un Redis con millones de keys no lo bloquea
+DEFAULT_SCAN_COUNT = 100
+MAX_SCAN_COUNT = 1000
+DEFAULT_VALUE_BYTES = 1024
+MAX_VALUE_BYTES = 64 * 1024
+VALUE_MAX_ITEMS = 100
+
+DISPLAY = {
+    "string": "String",
+    "hash": "Hash",
+    "zset": "Sorted Set",
+    "list": "List",
+    "set": "Set",
+}
+
+
+def text(value) -> str:
+    """Bytes de Redis a texto (los valores binarios, p. ej. gzip, no rompen la respuesta)"""
+    if isinstance(value, bytes):
+        return value.decode("utf-8", errors="replace")
+    return str(value)
+
+
+def parse_bounded_int(raw: Optional[str], default: int, maximum: int, name: str) -> int:
+    if raw in (None, ""):
+        return default
+    try:
+        value = int(raw)
+    except ValueError:
+        raise ValueError(f"{name} debe ser un entero")
+    if not 1 <= value <= maximum:
+        raise ValueError(f"{name} debe estar entre 1 y {maximum}")
+    return value
+
+
+def parse_cursor(raw: Optional[str]) -> int:
+    if raw in (None, ""):
+        return 0
+    try:
+        cursor = int(raw)
+    except ValueError:
+        raise ValueError("cursor inválido")
+    if cursor < 0:
+        raise ValueError("cursor inválido")
+    return cursor
+
+
+def server_info(r) -> Dict[str, Any]:
+    """Resumen del servidor con un solo INFO (más DBSIZE, O(1)) en un round-trip"""
+    pipe = r.pipeline(transaction=False)
+    pipe.info()
+    pipe.dbsize()
+    info, total_keys = pipe.execute()
+    return {
+        "total_keys": total_keys,
+        "memory_usage": text(info.get("used_memory_human", "N/A")),
+        "connected_clients": info.get("connected_clients", "N/A"),
+        "uptime": info.get("uptime_in_seconds", "N/A"),
+    }
+
+
+def _queue_value(pipe, key: bytes, key_type: str, max_bytes: int) -> int:
+    """Encola la lectura (acotada) del valor según el tipo; devuelve cuántos comandos"""
+    if key_type == "string":
+        pipe.strlen(key)
+        pipe.getrange(key, 0, max_bytes - 1)
+    elif key_type == "hash":
+        pipe.hlen(key)
+        pipe.hscan(key, 0, count=VALUE_MAX_ITEMS)
+    elif key_type == "zset":
+        pipe.zcard(key)
+        pipe.zrange(key, 0, VALUE_MAX_ITEMS - 1, withscores=True)
+    elif key_type == "list":
+        pipe.llen(key)
+        pipe.lrange(key, 0, VALUE_MAX_ITEMS - 1)
+    elif key_type == "set":
+        pipe.scard(key)
+        pipe.sscan(key, 0, count=VALUE_MAX_ITEMS)
+    else:
+        return 0
+    return 2
+
+
+def _value_details(key_type: str, size: int, raw: Any, max_bytes: int) -> Dict[str, Any]:
+    """Valor legible de una key, marcando si se truncó"""
+    if key_type == "string":
+        truncated = size > max_bytes
+        value = text(raw)
+        display = DISPLAY[key_type]
+        if not truncated:
+            try:
+                value = json.loads(value)
+                display = "JSON"
+            except ValueError:
+                pass
+        return {"value": value, "display": display, "size": size, "truncated": truncated}
+
+    if key_type == "hash":
+        value = {text(field): text(item) for field, item in list(raw[1].items())[:VALUE_MAX_ITEMS]}
+    elif key_type == "zset":
+        value = [{"member": text(member), "score": score} for member, score in raw]
+    elif key_type == "list":
+        value = [text(item) for item in raw]
+    else:
+        value = [text(item) for item in list(raw[1])[:VALUE_MAX_ITEMS]]
+    return {"value": value, "display": DISPLAY[key_type], "size": size, "truncated": size > len(value)}
+
+
+def scan_page(r, cursor: int, count: int, match: str, with_values: bool = False,
+              max_bytes: int = DEFAULT_VALUE_BYTES) -> Tuple[Optional[str], List[Dict[str, Any]]]:
+    """Una página de SCAN con TYPE/TTL/MEMORY USAGE de cada key en un solo pipeline
+
+    Devuelve (cursor siguiente o None si terminó, detalles de las keys). SCAN
+    puede devolver menos de `count` keys (o ninguna) aunque queden páginas.
+    """
+    next_cursor, keys = r.scan(cursor=cursor, match=match, count=count)
+
+    pipe = r.pipeline(transaction=False)
+    for key in keys:
+        pipe.type(key)
+        pipe.ttl(key)
+        pipe.memory_usage(key)
+    meta = pipe.execute(raise_on_error=False)
+
+    details = []
+    value_commands = []
+    pipe = r.pipeline(transaction=False)
+    for index, key in enumerate(keys):
+        key_type, ttl, memory = meta[index * 3:index * 3 + 3]
+        key_type = text(key_type)
+        if key_type == "none":
+            continue  # La key expiró o se borró entre SCAN y TYPE
+        key_info = {
+            "key": text(key),
+            "type": key_type,
+            "ttl": ttl if isinstance(ttl, int) and ttl > 0 else "No expira",
+            "memory_bytes": memory if isinstance(memory, int) else None,
+        }
+        details.append(key_info)
+        if with_values:
+            value_commands.append((key_info, _queue_value(pipe, key, key_type, max_bytes)))
+
+    if value_commands:
+        results = iter(pipe.execute(raise_on_error=False))
+        for key_info, commands in value_commands:
+            if not commands:
+                continue
+            size, raw = next(results), next(results)
+            if isinstance(size, Exception) or isinstance(raw, Exception):
+                key_info["error"] = f"Error leyendo key: {raw if isinstance(raw, Exception) else size}"
+                continue
+            key_info.update(_value_details(key_info["type"], size, raw, max_bytes))
+
+    return (str(next_cursor) if next_cursor else None), details
+
+
+# ---------------------------------------------------------------------------
+# Borrado por patrón: SCAN MATCH + UNLINK en lotes, opcionalmente en segundo plano
+# ---------------------------------------------------------------------------
+
+DELETE_BATCH_SIZE = 500
+JOB_KEY_PREFIX = "redis-admin:job:"
+JOB_TTL = 3600
+
+
+def unlink_matching(r, pattern: str, batch_size: int = DELETE_BATCH_SIZE,
+                    progress: Optional[Callable[[int, int], None]] = None) -> Tuple[int, int]:
+    """Elimina las keys que coinciden con `pattern` sin bloquear Redis
+
+    SCAN recorre el keyspace de a `batch_size` keys y cada lote se borra con
+    UNLINK (la memoria se libera en otro hilo de Redis). Devuelve (recorridas,
+    eliminadas); `progress(recorridas, eliminadas)` se llama después de cada lote.
+    Las keys de estado de los jobs nunca se borran.
+    """
+    scanned = deleted = 0
+    batch = []
+    for key in r.scan_iter(match=pattern, count=batch_size):
+        scanned += 1
+        if text(key).startswith(JOB_KEY_PREFIX):
+            continue
+        batch.append(key)
+        if len(batch) >= batch_size:
+            deleted += r.unlink(*batch)
+            batch = []
+            if progress:
+                progress(scanned, deleted)
+    if batch:
+        deleted += r.unlink(*batch)
+    if progress:
+        progress(scanned, deleted)
+    return scanned, deleted
+
+
+def job_key(job_id: str) -> str:
+    return f"{JOB_KEY_PREFIX}{job_id}"
+
+
+def get_job(r, job_id: str) -> Optional[Dict[str, Any]]:
+    """Estado de un job de borrado (None si no existe o ya expiró)"""
+    job = {text(field): text(value) for field, value in r.hgetall(job_key(job_id)).items()}
+    if not job:
+        return None
+    for field in ("scanned", "deleted"):
+        job[field] = int(job.get(field, 0))
+    for field in ("started_at", "finished_at"):
+        if field in job:
+            job[field] = float(job[field])
+    job["id"] = job_id
+    return job
+
+
+def start_delete_job(get_client: Callable[[], Any], pattern: str, batch_size: int = DELETE_BATCH_SIZE) -> str:
+    """Lanza el borrado en un hilo del worker y devuelve el id del job
+
+    El progreso se guarda en el hash `redis-admin:job:<id>` (expira a la hora),
+    así cualquier worker puede responder GET /api/redis-admin/jobs/<id>/.
+    """
+    job_id = uuid.uuid4().hex
+    r = get_client()
+    key = job_key(job_id)
+    r.hset(key, mapping={
+        "status": "running", "pattern": pattern, "scanned": 0, "deleted": 0, "started_at": time.time(),
+    })
+    r.expire(key, JOB_TTL)
+
+    def run():
+        client = get_client()
+
+        def progress(scanned, deleted):
+            client.hset(key, mapping={"scanned": scanned, "deleted": deleted})
+
+        try:
+            unlink_matching(client, pattern, batch_size, progress)
+            client.hset(key, mapping={"status": "finished", "finished_at": time.time()})
+        except Exception as e:
+            try:
+                client.hset(key, mapping={"status": "failed", "error": str(e), "finished_at": time.time()})
+            except Exception:
+                pass  # Redis caído: el job queda "running" hasta que expire
+        finally:
+            try:
+                client.expire(key, JOB_TTL)
+            except Exception:
+                pass
+
+    threading.Thread(target=run, name=f"redis-admin-delete-{job_id}", daemon=True).start()
+    return job_id
@@ -0,0 +1,258 @@
+import asyncio
+import os
+import threading
+import time
+import weakref
+from typing import Any, Dict, Optional
+
+from django.conf import settings
+from redis import ConnectionPool, Redis
+from redis import asyncio as aioredis
+from redis.asyncio.connection import Connection as AsyncConnection, SSLConnection as AsyncSSLConnection
+from redis.connection import Connection, SSLConnection
+from redis.exceptions import ConnectionError, TimeoutError
+
+from api_project.metrics import record_redis_error
+from api_project.timing import record_redis
+
+
+class RedisUnavailable(ConnectionError):
+    """El circuit breaker está abierto: se evita intentar conectar a Redis"""
+
+
+class CircuitBreaker:
+    """Circuit breaker simple por proceso
+
+    - cerrado: se permiten comandos; `failure_threshold` fallos seguidos lo abren.
+    - abierto: get_redis() falla al instante durante `reset_timeout` segundos.
+    - semiabierto: pasado ese tiempo se deja pasar tráfico de prueba; un éxito
+      lo cierra y un nuevo fallo lo vuelve a abrir.
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half-open"
+        return "open"
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            if time.monotonic() - self.opened_at < self.reset_timeout:
+                return False
+            # Semiabierto: se prueba de nuevo y un solo fallo más reabre el circuito
+            self.opened_at = time.monotonic()
+            self.failures = self.failure_threshold - 1
+            return True
+
+    def record_success(self) -> None:
+        if self.failures or self.opened_at is not None:
+            with self._lock:
+                self.failures = 0
+                self.opened_at = None
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+
+
+breaker = CircuitBreaker(
+    failure_threshold=getattr(settings, "REDIS_BREAKER_FAILURES", 3),
+    reset_timeout=getattr(settings, "REDIS_BREAKER_RESET_SECONDS", 10.0),
+)
+
+
+class _BreakerMixin:
+    """Informa al circuit breaker el resultado de conexiones y respuestas
+
+    También suma el tiempo de envío y de espera de cada respuesta a los timings
+    de la request en curso (header Server-Timing).
+    """
+
+    def connect(self):
+        try:
+            super().connect()
+        except (ConnectionError, TimeoutError) as e:
+            if not getattr(e, "_breaker_recorded", False):
+                breaker.record_failure()
+                record_redis_error(e)
+            raise
+
+    def send_packed_command(self, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            super().send_packed_command(*args, **kwargs)
+        finally:
+            record_redis(time.perf_counter() - start)
+
+    def read_response(self, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            response = super().read_response(*args, **kwargs)
+        except (ConnectionError, TimeoutError) as e:
+            breaker.record_failure()
+            record_redis_error(e)
+            e._breaker_recorded = True
+            raise
+        finally:
+            record_redis(time.perf_counter() - start, commands=1)
+        breaker.record_success()
+        return response
+
+
+class BreakerConnection(_BreakerMixin, Connection):
+    pass
+
+
+class BreakerSSLConnection(_BreakerMixin, SSLConnection):
+    pass
+
+
+class _AsyncBreakerMixin:
+    """Versión de _BreakerMixin para las conexiones de redis.asyncio"""
+
+    async def connect(self):
+        try:
+            await super().connect()
+        except (ConnectionError, TimeoutError) as e:
+            if not getattr(e, "_breaker_recorded", False):
+                breaker.record_failure()
+                record_redis_error(e)
+            raise
+
+    async def send_packed_command(self, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            await super().send_packed_command(*args, **kwargs)
+        finally:
+            record_redis(time.perf_counter() - start)
+
+    async def read_response(self, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            response = await super().read_response(*args, **kwargs)
+        except (ConnectionError, TimeoutError) as e:
+            breaker.record_failure()
+            record_redis_error(e)
+            e._breaker_recorded = True
+            raise
+        finally:
+            record_redis(time.perf_counter() - start, commands=1)
+        breaker.record_success()
+        return response
+
+
+class AsyncBreakerConnection(_AsyncBreakerMixin, AsyncConnection):
+    pass
+
+
+class AsyncBreakerSSLConnection(_AsyncBreakerMixin, AsyncSSLConnection):
+    pass
+
+
+_pools: Dict[bool, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+# Las conexiones de redis.asyncio pertenecen a un event loop: un pool por loop
+_async_pools: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[bool, aioredis.ConnectionPool]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def redis_url() -> str:
+    """REDIS_URL (Render/producción) o host/puerto/db sueltos (desarrollo local)"""
+    url = os.environ.get("REDIS_URL")
+    if url:
+        return url
+    return "redis://{host}:{port}/{db}".format(
+        host=os.environ.get("REDIS_HOST", "localhost"),
+        port=int(os.environ.get("REDIS_PORT", "6379")),
+        db=int(os.environ.get("REDIS_DB", "0")),
+    )
+
+
+def get_pool(decode_responses: bool = True) -> ConnectionPool:
+    """Pool compartido por proceso (redis-py lo recrea solo tras un fork de gunicorn)"""
+    pool = _pools.get(decode_responses)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(decode_responses)
+            if pool is None:
+                url = redis_url()
+                pool = ConnectionPool.from_url(
+                    url,
+                    connection_class=BreakerSSLConnection if url.startswith("rediss://") else BreakerConnection,
+                    **_pool_options(decode_responses),
+                )
+                _pools[decode_responses] = pool
+    return pool
+
+
+def _pool_options(decode_responses: bool) -> Dict[str, Any]:
+    return {
+        "decode_responses": decode_responses,
+        "max_connections": getattr(settings, "REDIS_MAX_CONNECTIONS", 20),
+        "socket_timeout": getattr(settings, "REDIS_SOCKET_TIMEOUT", 1.0),
+        "socket_connect_timeout": getattr(settings, "REDIS_SOCKET_CONNECT_TIMEOUT", 0.5),
+        "health_check_interval": getattr(settings, "REDIS_HEALTH_CHECK_INTERVAL", 30),
+    }
+
+
+def get_redis(decode_responses: bool = True) -> Redis:
+    """Cliente Redis sobre el pool compartido (sin PING por llamada)
+
+    Lanza RedisUnavailable sin tocar la red si el circuit breaker está abierto,
+    así los caminos de escritura saltean la invalidación de inmediato.
+    """
+    if not breaker.allow():
+        raise RedisUnavailable("Redis no disponible (circuit breaker abierto)")
+    return Redis(connection_pool=get_pool(decode_responses))
+
+
+def get_redis_or_none(decode_responses: bool = True) -> Optional[Redis]:
+    """Como get_redis(), pero devuelve None si Redis no está disponible"""
+    try:
+        return get_redis(decode_responses)
+    except ConnectionError:
+        return None
+
+
+def get_async_pool(decode_responses: bool = True) -> aioredis.ConnectionPool:
+    """Pool de redis.asyncio del event loop actual (uno por worker de uvicorn)"""
+    pools = _async_pools.setdefault(asyncio.get_running_loop(), {})
+    pool = pools.get(decode_responses)
+    if pool is None:
+        url = redis_url()
+        pool = aioredis.ConnectionPool.from_url(
+            url,
+            connection_class=AsyncBreakerSSLConnection if url.startswith("rediss://") else AsyncBreakerConnection,
+            **_pool_options(decode_responses),
+        )
+        pools[decode_responses] = pool
+    return pool
+
+
+def get_async_redis(decode_responses: bool = True) -> aioredis.Redis:
+    """Cliente redis.asyncio para las vistas async; mismo circuit breaker que get_redis()"""
+    if not breaker.allow():
+        raise RedisUnavailable("Redis no disponible (circuit breaker abierto)")
+    return aioredis.Redis(connection_pool=get_async_pool(decode_responses))
+
+
+def get_async_redis_or_none(decode_responses: bool = True) -> Optional[aioredis.Redis]:
+    try:
+        return get_async_redis(decode_responses)
+    except ConnectionError:
+        return None
@@ -0,0 +1,62 @@
+import json
+from datetime import date, datetime, time
+from typing import Any, Union
+
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # Opcional: sin orjson se usa el módulo json de la stdlib
+    orjson = None
+
+# Lo que ni orjson ni json saben codificar (Decimal, textos lazy, querysets...)
+# se resuelve con el encoder de DRF
+_drf_encoder = JSONEncoder()
+
+
+def _default(value: Any) -> Any:
+    # Fechas con isoformat(), igual que orjson y que Todo.to_dict(); el encoder
+    # de DRF las recorta a milisegundos y cambia +00:00 por Z
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    return _drf_encoder.default(value)
+
+
+def json_dumps(value: Any) -> bytes:
+    """JSON compacto en UTF-8; las fechas se codifican sin pasar por Python con orjson"""
+    if orjson is not None:
+        return orjson.dumps(value, default=_default)
+    return json.dumps(value, default=_default, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+def json_loads(raw: Union[bytes, str]) -> Any:
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+class FastJSONRenderer(JSONRenderer):
+    """JSONRenderer de DRF con json_dumps() (orjson si está instalado)
+
+    Con indentación (la pide el navegador de la API) se usa el de DRF.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None or self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+        return json_dumps(data)
+
+
+class FastJSONParser(JSONParser):
+    """JSONParser de DRF con json_loads() (orjson si está instalado)"""
+
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return json_loads(stream.read())
+        except ValueError as exc:  # orjson.JSONDecodeError es un ValueError
+            raise ParseError(f"JSON parse error - {exc}")
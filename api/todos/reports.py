@@ -0,0 +1,178 @@
+import time
+from datetime import timedelta
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from django.db.models import BooleanField, Count, ExpressionWrapper, Q, Sum
+from django.utils import timezone
+
+from redis.exceptions import RedisError
+
+from .cache import MISS, data_cache
+from .etags import conditional_headers, make_etag
+from .models import Todo
+from .redis_client import get_redis
+from .stats import get_stats
+from .streaming import STREAM_CHUNK_SIZE, dumps, iter_json_array
+
+
+REPORT_FIELDS = ('id', 'title', 'done', 'created_at', 'title_words', 'title_length', 'has_numbers', 'has_special_chars')
+
+
+def report_todos_queryset(now=None):
+    """Consulta principal del reporte, con su ordenamiento
+
+    Los atributos del título vienen de columnas calculadas al escribir y los
+    flags de recencia se resuelven en la base contra un único `now`.
+    """
+    now = now or timezone.now()
+    return (
+        Todo.objects.order_by('-created_at', 'title')
+        .annotate(
+            is_recent=ExpressionWrapper(Q(created_at__gt=now - timedelta(days=7)), output_field=BooleanField()),
+            is_very_recent=ExpressionWrapper(Q(created_at__gt=now - timedelta(days=1)), output_field=BooleanField()),
+        )
+        .values(*REPORT_FIELDS, 'is_recent', 'is_very_recent')
+    )
+
+
+def report_row(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Fila del reporte a partir de una fila de report_todos_queryset()"""
+    timestamp = row['created_at'].timestamp()
+    return {
+        'id': row['id'],
+        'title': row['title'],
+        'done': row['done'],
+        'created_at': timestamp,
+        'timestamp': timestamp,
+        'is_recent': row['is_recent'],
+        'is_very_recent': row['is_very_recent'],
+        'title_words': row['title_words'],
+        'title_length': row['title_length'],
+        'has_numbers': row['has_numbers'],
+        'has_special_chars': row['has_special_chars']
+    }
+
+
+def title_analytics() -> Dict[str, Any]:
+    """`title_analytics` con una sola agregación sobre las columnas derivadas del título
+
+    Ambos promedios se dividen por las filas de esta misma agregación, no por
+    los contadores de Redis, que pueden no coincidir con la base.
+    """
+    totals = Todo.objects.aggregate(
+        rows=Count('id'),
+        words=Sum('title_words', default=0),
+        characters=Sum('title_length', default=0),
+        with_numbers=Count('id', filter=Q(has_numbers=True)),
+        with_special=Count('id', filter=Q(has_special_chars=True)),
+    )
+    rows = totals['rows']
+    return {
+        'avg_words': round(totals['words'] / rows, 2) if rows else 0,
+        'total_characters': totals['characters'],
+        'avg_length': round(totals['characters'] / rows, 2) if rows else 0,
+        'with_numbers': totals['with_numbers'],
+        'with_special': totals['with_special']
+    }
+
+
+def build_report(r) -> Dict[str, Any]:
+    """Reporte completo de /api/data/ (stats, daily_stats, title_analytics y tareas)"""
+    start_time = time.time()
+
+    # 1. Estadísticas desde contadores incrementales en Redis (O(1));
+    #    si faltan se recalculan con una agregación condicional en la base
+    stats, daily_stats = get_stats(r)
+
+    # 2. Tareas con sus atributos ya calculados y análisis de títulos agregado en la base
+    todos = [report_row(row) for row in report_todos_queryset()]
+
+    # Preparar respuesta con estadísticas SÚPER EXTENDIDAS
+    todos_data = {
+        'todos': todos,
+        'stats': stats,
+        'daily_stats': daily_stats,
+        'title_analytics': title_analytics(),
+        'generated_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'from_cache': False
+    }
+    todos_data['load_time'] = round((time.time() - start_time) * 1000)  # En milisegundos
+    return todos_data
+
+
+def cached_report(r, raw: bool = False, encoding: Optional[str] = None) -> Tuple[Any, str, Optional[str]]:
+    """Reporte desde la caché con stale-while-revalidate: (datos, estado, versión)
+
+    Un solo worker recalcula el reporte y el resto sirve el anterior; sin Redis
+    (o si falla) se calcula directamente. Con `raw` un HIT o STALE devuelve
+    (cuerpo, codificación) tal como está guardado (ver cached_response()).
+    """
+    if r is None:
+        return build_report(r), MISS, None
+    try:
+        # Los cuerpos comprimidos son binarios: se leen con un cliente sin decode_responses
+        cache_r = get_redis(decode_responses=False) if raw else r
+        return data_cache.get_or_build(cache_r, lambda: build_report(r), raw=raw, encoding=encoding)
+    except RedisError:
+        return build_report(r), MISS, None
+
+
+def publish_report(r) -> Optional[str]:
+    """Calcula el reporte y lo publica como snapshot de /api/data/ (worker build_reports)
+
+    Devuelve la versión publicada, o None si otro worker lo estaba calculando.
+    """
+    return data_cache.refresh(r, lambda: build_report(r))
+
+
+SNAPSHOT_UNAVAILABLE = "El reporte todavía no está generado; reintentar en unos segundos."
+SNAPSHOT_RETRY_AFTER = "1"
+
+
+def cached_response(entry: Tuple[Any, Optional[str]], cache_status: str, version: str,
+                    age: Optional[float] = None) -> Tuple[bytes, Dict[str, str]]:
+    """Cuerpo y headers de /api/data/ para una entrada leída con raw=True
+
+    El cuerpo se envía tal como está en Redis (ya codificado y, si el cliente lo
+    acepta, comprimido): un HIT no decodifica ni vuelve a codificar el reporte.
+    """
+    body, encoding = entry
+    if isinstance(body, str):
+        body = body.encode()
+    headers = conditional_headers(make_etag(version))
+    headers["X-Cache"] = cache_status
+    headers["Vary"] = "Accept-Encoding"
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    if age is not None:
+        headers["Age"] = str(max(int(age), 0))  # Segundos desde generated_at
+    return body, headers
+
+
+def snapshot_response(snapshot: Tuple[Tuple[Any, Optional[str]], str, str, float]) -> Tuple[bytes, Dict[str, str]]:
+    """Cuerpo y headers de /api/data/ para data_cache.get_snapshot(r, raw=True)"""
+    return cached_response(*snapshot)
+
+
+def stream_report(r) -> Iterator[bytes]:
+    """Mismo reporte que build_report, escrito de forma incremental
+
+    Las tareas se leen con un cursor del servidor y se serializan a medida que llegan.
+    """
+    start_time = time.time()
+    stats, daily_stats = get_stats(r)
+    analytics = title_analytics()
+
+    yield (
+        f'{{"stats":{dumps(stats)},"daily_stats":{dumps(daily_stats)},'
+        f'"title_analytics":{dumps(analytics)},"todos":'
+    ).encode()
+    rows = report_todos_queryset().iterator(chunk_size=STREAM_CHUNK_SIZE)
+    yield from iter_json_array(rows, report_row)
+
+    trailer = {
+        'generated_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'from_cache': False,
+        'load_time': round((time.time() - start_time) * 1000),
+    }
+    yield f',{dumps(trailer)[1:]}'.encode()
@@ -0,0 +1,443 @@
+import logging
+from collections import Counter
+from datetime import date, datetime, time as dt_time, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import TruncDate, TruncMonth, TruncWeek
+from django.utils import timezone
+
+from .models import Todo, TodoDailyStat, TodoTag, extract_tags, tracked_keywords
+
+logger = logging.getLogger(__name__)
+
+DAILY_STATS_DAYS = 7
+
+# Series de /api/stats/timeseries/: agrupación de las filas de TodoDailyStat
+TIMESERIES_GRANULARITIES = {"day": None, "week": TruncWeek, "month": TruncMonth}
+TIMESERIES_DEFAULT_DAYS = 30
+TIMESERIES_MAX_POINTS = 1000
+
+# Contadores incrementales en Redis
+COUNTERS_KEY = "todos:stats:counters"            # total, completed, kw:<palabra>, ready
+CREATED_BY_DAY_KEY = "todos:stats:created"       # fecha de creación -> tareas
+COMPLETED_BY_DAY_KEY = "todos:stats:completed"   # fecha de creación -> tareas completadas
+DONE_BY_UPDATE_KEY = "todos:stats:done_updated"  # fecha de actualización -> tareas completadas
+COUNTER_KEYS = (COUNTERS_KEY, CREATED_BY_DAY_KEY, COMPLETED_BY_DAY_KEY, DONE_BY_UPDATE_KEY)
+
+# Días hacia atrás que se mantienen por fecha (cubre `year_created`)
+COUNTER_DAYS = 366
+
+
+def start_of_day(day) -> datetime:
+    """Inicio del día `day` en la zona horaria actual (para filtros por rango)"""
+    return timezone.make_aware(datetime.combine(day, dt_time.min))
+
+
+def window_start(now, days: int) -> datetime:
+    """Inicio del día de hace `days` días (primer bucket diario que se mantiene)"""
+    return start_of_day(timezone.localdate(now) - timedelta(days=days))
+
+
+def rolling_sum(buckets: List[int], days: int, now) -> int:
+    """Aproxima con buckets diarios (índice 0 = hoy) una ventana móvil `now - days`
+
+    Los días completos de la ventana se suman enteros; del más viejo (hoy - days)
+    solo la parte del día que cae dentro, suponiendo escrituras parejas en el día.
+    """
+    elapsed = (now - start_of_day(timezone.localdate(now))) / timedelta(days=1)
+    return round(sum(buckets[:days]) + buckets[days] * (1 - elapsed))
+
+
+def build_stats(counts: Dict[str, int]) -> Dict[str, Any]:
+    """Arma el diccionario `stats` a partir de los contadores crudos"""
+    total = counts["total"]
+    completed = counts["completed"]
+    if total > 0:
+        completion_rate = (completed / total) * 100
+    else:
+        completion_rate = 0
+    week_created = counts["week_created"]
+    recent_completion_rate = (counts["recent_completed"] / week_created * 100) if week_created > 0 else 0
+
+    stats = {
+        "total": total,
+        "completed": completed,
+        "pending": total - completed,
+        "completion_rate": round(completion_rate, 1),
+        "recent_completion_rate": round(recent_completion_rate, 1),
+        "today_created": counts["today_created"],
+        "week_created": week_created,
+        "month_created": counts["month_created"],
+        "year_created": counts["year_created"],
+        "recent_completed": counts["recent_completed"],
+    }
+    for keyword in tracked_keywords():
+        stats[f"{keyword}_count"] = counts.get(f"{keyword}_count", 0)
+    return stats
+
+
+def tag_counts(queryset=None) -> Dict[str, int]:
+    """Tareas por palabra clave en un único GROUP BY sobre la tabla de etiquetas"""
+    tags = TodoTag.objects.all() if queryset is None else TodoTag.objects.filter(todo__in=queryset)
+    return dict(tags.values_list("tag").annotate(count=Count("id")).order_by())
+
+
+def compute_stats(now=None) -> Tuple[Dict[str, Any], Dict[str, Dict[str, int]]]:
+    """Calcula `stats` y `daily_stats` con tres consultas en lugar de ~25 COUNT(*)
+
+    1. Una sola agregación condicional sobre `todos_todo` para todos los contadores.
+    2. Un GROUP BY por etiqueta para los contadores de palabras clave.
+    3. Un GROUP BY por fecha de creación para los últimos DAILY_STATS_DAYS días.
+    """
+    now = now or timezone.now()
+    today = timezone.localdate(now)
+    # Ventanas móviles: los últimos N días hasta este instante
+    week_start = now - timedelta(days=7)
+
+    # Rangos en vez de `created_at__date=...` para que el filtro pueda usar índices
+    today_start = start_of_day(today)
+
+    aggregates = {
+        "total": Count("id"),
+        "completed": Count("id", filter=Q(done=True)),
+        "today_created": Count("id", filter=Q(created_at__gte=today_start)),
+        "week_created": Count("id", filter=Q(created_at__gte=week_start)),
+        "month_created": Count("id", filter=Q(created_at__gte=now - timedelta(days=30))),
+        "year_created": Count("id", filter=Q(created_at__gte=now - timedelta(days=365))),
+        "recent_completed": Count("id", filter=Q(done=True, updated_at__gte=week_start)),
+    }
+    counts = Todo.objects.aggregate(**aggregates)
+    for keyword, count in tag_counts().items():
+        counts[f"{keyword}_count"] = count
+
+    stats = build_stats(counts)
+    return stats, compute_daily_stats(today)
+
+
+def compute_daily_stats(today) -> Dict[str, Dict[str, int]]:
+    """Creadas/completadas por día de creación: DAILY_STATS_DAYS filas del rollup diario"""
+    first_day = today - timedelta(days=DAILY_STATS_DAYS - 1)
+    rows = TodoDailyStat.objects.filter(day__range=(first_day, today)).values("day", "created", "completed")
+    by_day = {row["day"]: row for row in rows}
+
+    # Mantener el orden original: hoy primero, y días sin tareas en cero
+    daily_stats = {}
+    for days_back in range(DAILY_STATS_DAYS):
+        day = today - timedelta(days=days_back)
+        row = by_day.get(day)
+        daily_stats[str(day)] = {
+            "created": row["created"] if row else 0,
+            "completed": row["completed"] if row else 0,
+        }
+    return daily_stats
+
+
+# ---------------------------------------------------------------------------
+# Contadores incrementales (Redis)
+# ---------------------------------------------------------------------------
+
+def todo_snapshot(todo: Todo) -> Tuple[str, bool, datetime, datetime]:
+    """Estado de una tarea relevante para los contadores"""
+    return (todo.title, todo.done, todo.created_at, todo.updated_at)
+
+
+class StatsDelta:
+    """Variación de los contadores producida por una o varias escrituras"""
+
+    def __init__(self):
+        self.counters = Counter()
+        self.created = Counter()
+        self.completed = Counter()
+        self.done_updated = Counter()
+
+    def add_row(self, row: Tuple[str, bool, datetime, datetime], sign: int = 1) -> "StatsDelta":
+        """Suma (sign=1) o resta (sign=-1) el aporte de una tarea"""
+        title, done, created_at, updated_at = row
+        created_day = str(timezone.localdate(created_at))
+
+        self.counters["total"] += sign
+        self.created[created_day] += sign
+        if done:
+            self.counters["completed"] += sign
+            self.completed[created_day] += sign
+            self.done_updated[str(timezone.localdate(updated_at))] += sign
+        for keyword in extract_tags(title):
+            self.counters[f"kw:{keyword}"] += sign
+        return self
+
+    def add_rows(self, rows: Iterable[Tuple[str, bool, datetime, datetime]], sign: int = 1) -> "StatsDelta":
+        for row in rows:
+            self.add_row(row, sign)
+        return self
+
+    def add_queryset(self, queryset, sign: int = 1, now=None, days: Optional[int] = COUNTER_DAYS) -> "StatsDelta":
+        """Aporte de un queryset completo calculado con agregaciones en la base
+
+        Los contadores por fecha se limitan a los últimos `days` días (todos con None).
+        """
+        queryset = queryset.order_by()
+        dated = queryset
+        if days is not None:
+            dated = queryset.filter(created_at__gte=window_start(now or timezone.now(), days - 1))
+
+        totals = queryset.aggregate(total=Count("id"), completed=Count("id", filter=Q(done=True)))
+        for field, value in totals.items():
+            self.counters[field] += sign * value
+        for keyword, value in tag_counts(queryset).items():
+            self.counters[f"kw:{keyword}"] += sign * value
+
+        by_created = (
+            dated
+            .annotate(day=TruncDate("created_at"))
+            .values("day")
+            .annotate(created=Count("id"), completed=Count("id", filter=Q(done=True)))
+        )
+        for row in by_created:
+            self.created[str(row["day"])] += sign * row["created"]
+            self.completed[str(row["day"])] += sign * row["completed"]
+
+        if days is not None:
+            dated = queryset.filter(updated_at__gte=window_start(now or timezone.now(), days - 1))
+        by_updated = (
+            dated.filter(done=True)
+            .annotate(day=TruncDate("updated_at"))
+            .values("day")
+            .annotate(completed=Count("id"))
+        )
+        for row in by_updated:
+            self.done_updated[str(row["day"])] += sign * row["completed"]
+        return self
+
+    def _hashes(self):
+        return (
+            (COUNTERS_KEY, self.counters),
+            (CREATED_BY_DAY_KEY, self.created),
+            (COMPLETED_BY_DAY_KEY, self.completed),
+            (DONE_BY_UPDATE_KEY, self.done_updated),
+        )
+
+    def _increments(self) -> List[Tuple[str, str, int]]:
+        return [(key, field, value) for key, values in self._hashes() for field, value in values.items() if value]
+
+    def apply(self, r) -> None:
+        """Aplica la variación en Redis de forma atómica (MULTI/EXEC)
+
+        Solo se llama con la variación de escrituras que cambiaron filas: una
+        escritura que no encontró la tarea no debe descontarla de nuevo.
+        """
+        increments = self._increments()
+        if not increments:
+            return
+        pipe = r.pipeline(transaction=True)
+        for key, field, value in increments:
+            pipe.hincrby(key, field, value)
+        pipe.execute()
+
+    async def aapply(self, r) -> None:
+        """apply() para un cliente de redis.asyncio"""
+        increments = self._increments()
+        if not increments:
+            return
+        pipe = r.pipeline(transaction=True)
+        for key, field, value in increments:
+            pipe.hincrby(key, field, value)
+        await pipe.execute()
+
+    def rollup_rows(self) -> List[Tuple[date, int, int, int]]:
+        """(día, created, completed, done_updated) con variación, para TodoDailyStat"""
+        days = set(self.created) | set(self.completed) | set(self.done_updated)
+        rows = [(day, self.created[day], self.completed[day], self.done_updated[day]) for day in sorted(days)]
+        return [(date.fromisoformat(day), *counts) for day, *counts in rows if any(counts)]
+
+    def save_rollup(self) -> "StatsDelta":
+        """Aplica la variación al rollup diario; llamar dentro de la transacción de la escritura"""
+        TodoDailyStat.add(self.rollup_rows())
+        return self
+
+    def as_hashes(self) -> Dict[str, Dict[str, int]]:
+        """Contenido esperado de cada hash (sin entradas en cero)"""
+        return {key: {field: value for field, value in values.items() if value} for key, values in self._hashes()}
+
+
+def todo_change(before=None, after=None) -> StatsDelta:
+    """Variación por crear (after), borrar (before) o modificar (ambos) una tarea"""
+    delta = StatsDelta()
+    if before is not None:
+        delta.add_row(before, -1)
+    if after is not None:
+        delta.add_row(after, 1)
+    return delta
+
+
+def rebuild_counters(r, now=None) -> StatsDelta:
+    """Recalcula todos los contadores desde la tabla `Todo` y los reemplaza en Redis"""
+    expected = StatsDelta().add_queryset(Todo.objects.all(), now=now)
+    pipe = r.pipeline(transaction=True)
+    pipe.delete(*COUNTER_KEYS)
+    for key, values in expected.as_hashes().items():
+        if values:
+            pipe.hset(key, mapping=values)
+    pipe.hset(COUNTERS_KEY, "ready", 1)
+    pipe.execute()
+    return expected
+
+
+def read_counters(r, now=None) -> Optional[Tuple[Dict[str, Any], Dict[str, Dict[str, int]]]]:
+    """Lee `stats` y `daily_stats` desde los contadores: O(1) respecto al tamaño de la tabla
+
+    Devuelve None si los contadores todavía no fueron inicializados.
+    """
+    now = now or timezone.now()
+    today = timezone.localdate(now)
+    days = [str(today - timedelta(days=days_back)) for days_back in range(COUNTER_DAYS)]
+
+    pipe = r.pipeline(transaction=False)
+    pipe.hgetall(COUNTERS_KEY)
+    pipe.hmget(CREATED_BY_DAY_KEY, days)
+    pipe.hmget(COMPLETED_BY_DAY_KEY, days[:DAILY_STATS_DAYS])
+    pipe.hmget(DONE_BY_UPDATE_KEY, days[:8])
+    counters, created, completed, done_updated = pipe.execute()
+
+    if not counters.get("ready"):
+        return None
+
+    created = [int(value or 0) for value in created]
+    counts = {
+        "total": int(counters.get("total", 0)),
+        "completed": int(counters.get("completed", 0)),
+        # Índice 0 es hoy; las ventanas móviles se aproximan con los buckets diarios
+        "today_created": created[0],
+        "week_created": rolling_sum(created, 7, now),
+        "month_created": rolling_sum(created, 30, now),
+        "year_created": rolling_sum(created, 365, now),
+        "recent_completed": rolling_sum([int(value or 0) for value in done_updated], 7, now),
+    }
+    for keyword in tracked_keywords():
+        counts[f"{keyword}_count"] = int(counters.get(f"kw:{keyword}", 0))
+
+    daily_stats = {
+        days[index]: {"created": created[index], "completed": int(completed[index] or 0)}
+        for index in range(DAILY_STATS_DAYS)
+    }
+    return build_stats(counts), daily_stats
+
+
+def get_stats(r, now=None) -> Tuple[Dict[str, Any], Dict[str, Dict[str, int]]]:
+    """Stats desde los contadores de Redis; los inicializa si faltan
+
+    Sin Redis (r=None o con error) se calculan directamente desde la base.
+    """
+    if r is None:
+        return compute_stats(now)
+    try:
+        result = read_counters(r, now)
+        if result is None:
+            rebuild_counters(r, now)
+            result = read_counters(r, now)
+        if result is not None:
+            return result
+    except Exception as e:
+        logger.warning("Stats counters error: %s", e)
+    return compute_stats(now)
+
+
+# ---------------------------------------------------------------------------
+# Rollup diario (TodoDailyStat)
+# ---------------------------------------------------------------------------
+
+def expected_daily_stats() -> Dict[date, Tuple[int, int, int]]:
+    """Contenido correcto del rollup según la tabla `Todo` (sin días en cero)"""
+    delta = StatsDelta().add_queryset(Todo.objects.all(), days=None)
+    return {day: tuple(counts) for day, *counts in delta.rollup_rows()}
+
+
+def rebuild_daily_stats() -> int:
+    """Reemplaza el rollup diario por el calculado desde la tabla `Todo`; devuelve los días"""
+    expected = expected_daily_stats()
+    with transaction.atomic():
+        TodoDailyStat.objects.all().delete()
+        TodoDailyStat.objects.bulk_create(
+            [
+                TodoDailyStat(day=day, created=created, completed=completed, done_updated=done_updated)
+                for day, (created, completed, done_updated) in expected.items()
+            ],
+            batch_size=1000,
+        )
+    return len(expected)
+
+
+def timeseries_period_count(first_day: date, last_day: date, granularity: str) -> int:
+    """Cantidad de períodos entre dos fechas, sin armar la lista (para validar el rango)"""
+    if granularity == "day":
+        return (last_day - first_day).days + 1
+    if granularity == "week":
+        return (last_day.toordinal() - first_day.toordinal() + first_day.weekday()) // 7 + 1
+    return (last_day.year - first_day.year) * 12 + last_day.month - first_day.month + 1
+
+
+def timeseries_periods(first_day: date, last_day: date, granularity: str) -> List[date]:
+    """Inicio de cada período (día, lunes de la semana o día 1 del mes) entre dos fechas"""
+    if granularity == "day":
+        return [first_day + timedelta(days=offset) for offset in range((last_day - first_day).days + 1)]
+    count = timeseries_period_count(first_day, last_day, granularity)
+    if granularity == "week":
+        start = first_day - timedelta(days=first_day.weekday())
+        return [start + timedelta(weeks=offset) for offset in range(count)]
+    return [
+        date(first_day.year + (first_day.month - 1 + offset) // 12, (first_day.month - 1 + offset) % 12 + 1, 1)
+        for offset in range(count)
+    ]
+
+
+def parse_timeseries_params(params, today: Optional[date] = None) -> Tuple[date, date, str]:
+    """Valida `from`, `to` (YYYY-MM-DD) y `granularity`; lanza ValueError si son inválidos
+
+    Por defecto, los últimos TIMESERIES_DEFAULT_DAYS días (hasta hoy) por día.
+    """
+    granularity = params.get("granularity") or "day"
+    if granularity not in TIMESERIES_GRANULARITIES:
+        raise ValueError(f"granularity debe ser una de: {', '.join(TIMESERIES_GRANULARITIES)}")
+    try:
+        last_day = date.fromisoformat(params["to"]) if params.get("to") else today or timezone.localdate()
+        first_day = (
+            date.fromisoformat(params["from"]) if params.get("from")
+            else last_day - timedelta(days=TIMESERIES_DEFAULT_DAYS - 1)
+        )
+    except ValueError:
+        raise ValueError("from y to deben ser fechas YYYY-MM-DD")
+    if first_day > last_day:
+        raise ValueError("from no puede ser posterior a to")
+    if timeseries_period_count(first_day, last_day, granularity) > TIMESERIES_MAX_POINTS:
+        raise ValueError(f"El rango no puede superar {TIMESERIES_MAX_POINTS} períodos")
+    return first_day, last_day, granularity
+
+
+def timeseries(first_day: date, last_day: date, granularity: str = "day") -> List[Dict[str, Any]]:
+    """Serie de creadas/completadas entre dos fechas (inclusive) en una sola consulta
+
+    Un rango sobre el índice único de `day` más un GROUP BY por período: el costo
+    depende de los días pedidos, no de la cantidad de tareas. Los períodos de los
+    extremos solo suman los días dentro del rango; los períodos sin tareas van en cero.
+    """
+    rows = TodoDailyStat.objects.filter(day__range=(first_day, last_day)).order_by()
+    trunc = TIMESERIES_GRANULARITIES[granularity]
+    rows = rows.annotate(period=trunc("day")) if trunc else rows.annotate(period=F("day"))
+    by_period = {
+        row["period"]: row
+        for row in rows.values("period").annotate(
+            created=Sum("created"), completed=Sum("completed"), done_updated=Sum("done_updated")
+        )
+    }
+
+    series = []
+    for period in timeseries_periods(first_day, last_day, granularity):
+        row = by_period.get(period)
+        series.append({
+            "period": str(period),
+            "created": row["created"] if row else 0,
+            "completed": row["completed"] if row else 0,
+            "done_updated": row["done_updated"] if row else 0,
+        })
+    return series
@@ -0,0 +1,93 @@
+from typing import Any, AsyncIterable, AsyncIterator, Callable, Iterable, Iterator
+
+from asgiref.sync import sync_to_async
+
+from .renderers import json_dumps
+
+# Filas que se leen por viaje al cursor del servidor (QuerySet.iterator)
+STREAM_CHUNK_SIZE = 2000
+
+# Filas serializadas que se acumulan antes de entregar un bloque al servidor WSGI
+STREAM_FLUSH_ROWS = 500
+
+STREAM_FORMATS = {
+    "json": "application/json",
+    "ndjson": "application/x-ndjson",
+}
+
+
+def dumps(value: Any) -> str:
+    return json_dumps(value).decode()
+
+
+def iter_json_array(items: Iterable[Any], serialize: Callable[[Any], Any] = lambda item: item) -> Iterator[bytes]:
+    """Genera un array JSON de forma incremental, en bloques de STREAM_FLUSH_ROWS filas"""
+    yield b"["
+    buffer = []
+    first = True
+    for item in items:
+        buffer.append(json_dumps(serialize(item)))
+        if len(buffer) >= STREAM_FLUSH_ROWS:
+            yield (b"" if first else b",") + b",".join(buffer)
+            buffer = []
+            first = False
+    if buffer:
+        yield (b"" if first else b",") + b",".join(buffer)
+    yield b"]"
+
+
+def iter_ndjson(items: Iterable[Any], serialize: Callable[[Any], Any] = lambda item: item) -> Iterator[bytes]:
+    """Genera NDJSON (un objeto JSON por línea) de forma incremental"""
+    buffer = []
+    for item in items:
+        buffer.append(json_dumps(serialize(item)))
+        if len(buffer) >= STREAM_FLUSH_ROWS:
+            yield b"\n".join(buffer) + b"\n"
+            buffer = []
+    if buffer:
+        yield b"\n".join(buffer) + b"\n"
+
+
+async def aiter_json_array(items: AsyncIterable[Any],
+                           serialize: Callable[[Any], Any] = lambda item: item) -> AsyncIterator[bytes]:
+    """iter_json_array() sobre un iterable async (QuerySet.aiterator) para ASGI"""
+    yield b"["
+    buffer = []
+    first = True
+    async for item in items:
+        buffer.append(json_dumps(serialize(item)))
+        if len(buffer) >= STREAM_FLUSH_ROWS:
+            yield (b"" if first else b",") + b",".join(buffer)
+            buffer = []
+            first = False
+    if buffer:
+        yield (b"" if first else b",") + b",".join(buffer)
+    yield b"]"
+
+
+async def aiter_ndjson(items: AsyncIterable[Any],
+                       serialize: Callable[[Any], Any] = lambda item: item) -> AsyncIterator[bytes]:
+    """iter_ndjson() sobre un iterable async (QuerySet.aiterator) para ASGI"""
+    buffer = []
+    async for item in items:
+        buffer.append(json_dumps(serialize(item)))
+        if len(buffer) >= STREAM_FLUSH_ROWS:
+            yield b"\n".join(buffer) + b"\n"
+            buffer = []
+    if buffer:
+        yield b"\n".join(buffer) + b"\n"
+
+
+async def aiter_sync(iterator: Iterable[bytes]) -> AsyncIterator[bytes]:
+    """Entrega un generador síncrono (que usa el ORM) bloque a bloque bajo ASGI
+
+    Cada bloque se pide en el hilo de la request, así el cursor de la base sigue
+    siendo del mismo hilo y la respuesta no se acumula completa en memoria.
+    """
+    iterator = iter(iterator)
+    done = object()
+    while True:
+        chunk = await sync_to_async(next)(iterator, done)
+        if chunk is done:
+            break
+        yield chunk
@@ -0,0 +1,372 @@
+"""Tests funcionales: paginación por cursor, circuit breaker, caché single-flight y vistas async
+
+A diferencia de test_performance, no necesitan Redis en su conjunto: solo los
+casos marcados con @requires_redis se saltean si no hay uno disponible. Usan la
+misma base de Redis que test_performance (la 15, o TODOS_TEST_REDIS_URL).
+
+    python manage.py test todos.tests.test_functional
+"""
+
+import asyncio
+import json
+import os
+import threading
+import time
+from datetime import timedelta
+from functools import wraps
+from unittest import mock
+
+from asgiref.sync import sync_to_async
+from django.test import AsyncRequestFactory, SimpleTestCase, TestCase
+from django.utils import timezone
+
+from todos import async_views, cache, redis_client
+from todos.cache import HIT, MISS, STALE, ReportCache, bump_generation
+from todos.models import Todo, TodoDailyStat
+from todos.pagination import apaginate, paginate
+from todos.redis_client import CircuitBreaker, RedisUnavailable
+from todos.stats import expected_daily_stats, rebuild_daily_stats
+from todos.tests.test_performance import perf_redis_url
+
+PAGE_FIELDS = ("id", "created_at")
+TIE_SIZE = 4
+
+
+def requires_redis(test):
+    """Saltea el test si no hay Redis; si lo hay, deja `self.redis` con la base vacía"""
+
+    def connect(self):
+        try:
+            self.redis = redis_client.get_redis()
+            self.redis.ping()
+        except Exception as e:
+            self.skipTest(f"Redis no disponible: {e}")
+        self.redis.flushdb()
+
+    if asyncio.iscoroutinefunction(test):
+        @wraps(test)
+        async def async_wrapper(self, *args, **kwargs):
+            await sync_to_async(connect)(self)
+            return await test(self, *args, **kwargs)
+        return async_wrapper
+
+    @wraps(test)
+    def wrapper(self, *args, **kwargs):
+        connect(self)
+        return test(self, *args, **kwargs)
+    return wrapper
+
+
+def closes_async_pools(test):
+    """Cierra las conexiones de redis.asyncio del event loop del test antes de que termine"""
+
+    @wraps(test)
+    async def wrapper(self, *args, **kwargs):
+        try:
+            return await test(self, *args, **kwargs)
+        finally:
+            for pool in redis_client._async_pools.pop(asyncio.get_running_loop(), {}).values():
+                await pool.disconnect()
+    return wrapper
+
+
+class RedisTestMixin:
+    """REDIS_URL apuntando a la base de tests, con el breaker y la generación pendiente limpios"""
+
+    def setUp(self):
+        super().setUp()
+        env = mock.patch.dict(os.environ, {"REDIS_URL": perf_redis_url()})
+        env.start()
+        self.addCleanup(env.stop)
+        redis_client._pools.clear()
+        self.addCleanup(redis_client._pools.clear)
+        redis_client.breaker.record_success()
+        self.addCleanup(redis_client.breaker.record_success)
+        self.addCleanup(cache._pending_bump.clear)
+
+
+def seed_with_ties(count: int) -> None:
+    """Tareas en grupos de TIE_SIZE con el mismo created_at (el desempate es por id)"""
+    Todo.objects.bulk_create(Todo(title=f"tarea {i}") for i in range(count))
+    base = timezone.now().replace(microsecond=0) - timedelta(hours=1)
+    ids = list(Todo.objects.order_by("id").values_list("id", flat=True))
+    for start in range(0, len(ids), TIE_SIZE):
+        Todo.objects.filter(id__in=ids[start:start + TIE_SIZE]).update(created_at=base - timedelta(seconds=start))
+
+
+class CursorPaginationTests(RedisTestMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        seed_with_ties(25)
+
+    def expected_ids(self):
+        return list(Todo.objects.order_by("-created_at", "-id").values_list("id", flat=True))
+
+    def walk(self, limit):
+        ids, cursor = [], None
+        while True:
+            rows, cursor = paginate(Todo.objects.values(*PAGE_FIELDS), cursor, limit)
+            ids.extend(row["id"] for row in rows)
+            if cursor is None:
+                return ids
+            self.assertLessEqual(len(ids), 25, "la paginación no termina")
+
+    def test_walk_without_duplicates_or_gaps(self):
+        # Límites que cortan las páginas en medio de un grupo de created_at iguales
+        for limit in (1, 3, TIE_SIZE, 7, 25, 100):
+            with self.subTest(limit=limit):
+                self.assertEqual(self.walk(limit), self.expected_ids())
+
+    def test_walk_ignores_rows_inserted_during_the_walk(self):
+        expected = self.expected_ids()
+        rows, cursor = paginate(Todo.objects.values(*PAGE_FIELDS), None, 3)
+        ids = [row["id"] for row in rows]
+        # Una tarea nueva queda antes del cursor: no corre las páginas siguientes
+        Todo.objects.create(title="nueva")
+        while cursor is not None:
+            rows, cursor = paginate(Todo.objects.values(*PAGE_FIELDS), cursor, 3)
+            ids.extend(row["id"] for row in rows)
+        self.assertEqual(ids, expected)
+
+    async def test_async_walk(self):
+        expected = await sync_to_async(self.expected_ids)()
+        ids, cursor = [], None
+        while True:
+            rows, cursor = await apaginate(Todo.objects.values(*PAGE_FIELDS), cursor, 3)
+            ids.extend(row["id"] for row in rows)
+            if cursor is None:
+                break
+        self.assertEqual(ids, expected)
+
+    def test_api_walk(self):
+        ids, path = [], "/api/todos/?limit=3"
+        while path:
+            page = self.client.get(path).json()
+            ids.extend(todo["id"] for todo in page["results"])
+            path = f"/api/todos/?limit=3&cursor={page['next']}" if page["next"] else None
+        self.assertEqual(ids, self.expected_ids())
+
+    def test_invalid_cursor(self):
+        with self.assertRaises(ValueError):
+            paginate(Todo.objects.all(), "no-es-un-cursor", 10)
+        self.assertEqual(self.client.get("/api/todos/?cursor=no-es-un-cursor").status_code, 400)
+
+
+class CircuitBreakerTests(SimpleTestCase):
+    def setUp(self):
+        self.now = 1000.0
+        clock = mock.patch("todos.redis_client.time.monotonic", side_effect=lambda: self.now)
+        clock.start()
+        self.addCleanup(clock.stop)
+        self.breaker = CircuitBreaker(failure_threshold=3, reset_timeout=10)
+
+    def open_breaker(self):
+        for _ in range(3):
+            self.breaker.record_failure()
+
+    def test_opens_after_consecutive_failures(self):
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, "closed")
+        self.assertTrue(self.breaker.allow())
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, "open")
+        self.assertFalse(self.breaker.allow())
+
+    def test_success_resets_the_failure_count(self):
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+        self.breaker.record_success()
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, "closed")
+
+    def test_half_open_lets_one_probe_through(self):
+        self.open_breaker()
+        self.now += 9.9
+        self.assertFalse(self.breaker.allow())
+        self.now += 0.1
+        self.assertEqual(self.breaker.state, "half-open")
+        self.assertTrue(self.breaker.allow())
+        # Mientras la prueba está en curso el resto sigue rechazado
+        self.assertFalse(self.breaker.allow())
+        self.breaker.record_success()
+        self.assertEqual(self.breaker.state, "closed")
+        self.assertTrue(self.breaker.allow())
+
+    def test_failed_probe_reopens(self):
+        self.open_breaker()
+        self.now += 10
+        self.assertTrue(self.breaker.allow())
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, "open")
+        self.assertFalse(self.breaker.allow())
+        self.now += 10
+        self.assertEqual(self.breaker.state, "half-open")
+
+    def test_open_breaker_skips_the_network(self):
+        with mock.patch.object(redis_client, "breaker", self.breaker), \
+                mock.patch.object(redis_client, "get_pool") as get_pool:
+            self.open_breaker()
+            with self.assertRaises(RedisUnavailable):
+                redis_client.get_redis()
+            self.assertIsNone(redis_client.get_redis_or_none())
+        get_pool.assert_not_called()
+
+
+class ReportCacheContentionTests(RedisTestMixin, SimpleTestCase):
+    """Single-flight y stale-while-revalidate de ReportCache con varios hilos a la vez"""
+
+    THREADS = 8
+    BUILD_SECONDS = 0.3
+
+    def setUp(self):
+        super().setUp()
+        self.cache = ReportCache(f"todos_test:{self._testMethodName}", soft_ttl=30, hard_ttl=60,
+                                 wait_timeout=5, poll_interval=0.01, encodings=())
+        self.builds = 0
+        self.builds_lock = threading.Lock()
+
+    def build(self, value):
+        def slow_build():
+            with self.builds_lock:
+                self.builds += 1
+            time.sleep(self.BUILD_SECONDS)
+            return {"value": value}
+        return slow_build
+
+    def concurrent_reads(self, value):
+        """get_or_build() desde THREADS hilos que arrancan juntos"""
+        barrier = threading.Barrier(self.THREADS)
+        results, errors = [], []
+
+        def read():
+            try:
+                barrier.wait()
+                results.append(self.cache.get_or_build(redis_client.get_redis(), self.build(value))[:2])
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=read) for _ in range(self.THREADS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        return results
+
+    @requires_redis
+    def test_cold_cache_builds_once(self):
+        results = self.concurrent_reads(1)
+        self.assertEqual(self.builds, 1)
+        statuses = sorted(status for _, status in results)
+        # Uno calcula; el resto espera a que publique la entrada y la lee
+        self.assertEqual(statuses, [HIT] * (self.THREADS - 1) + [MISS])
+        self.assertTrue(all(value == {"value": 1} for value, _ in results))
+
+    @requires_redis
+    def test_stale_entry_is_served_while_one_thread_rebuilds(self):
+        self.cache.get_or_build(self.redis, self.build(1))
+        bump_generation(self.redis)
+        self.builds = 0
+
+        results = self.concurrent_reads(2)
+        self.assertEqual(self.builds, 1)
+        self.assertEqual([value for value, status in results if status == MISS], [{"value": 2}])
+        # Los demás no esperan al recálculo: sirven la entrada anterior
+        self.assertEqual([value for value, status in results if status == STALE], [{"value": 1}] * (self.THREADS - 1))
+        self.assertEqual(self.cache.get_or_build(self.redis, self.build(3))[:2], ({"value": 2}, HIT))
+
+
+class AsyncViewTests(RedisTestMixin, TestCase):
+    """Vistas de async_views (modo ASGI), llamadas directamente con AsyncRequestFactory"""
+
+    @classmethod
+    def setUpTestData(cls):
+        seed_with_ties(10)
+        rebuild_daily_stats()
+
+    def setUp(self):
+        super().setUp()
+        self.factory = AsyncRequestFactory()
+        self.todo_list = async_views.TodoList.as_view()
+        self.todo_detail = async_views.TodoDetail.as_view()
+
+    def body(self, data):
+        return {"data": json.dumps(data), "content_type": "application/json"}
+
+    async def assertRollupConsistent(self):
+        actual = {
+            row[0]: row[1:]
+            async for row in TodoDailyStat.objects.values_list("day", "created", "completed", "done_updated")
+            if any(row[1:])
+        }
+        self.assertEqual(actual, await sync_to_async(expected_daily_stats)())
+
+    @closes_async_pools
+    async def test_create_update_delete(self):
+        response = await self.todo_list(self.factory.post("/api/todos/", **self.body({"title": "  async  "})))
+        self.assertEqual(response.status_code, 201)
+        todo = json.loads(response.content)
+        self.assertEqual((todo["title"], todo["done"]), ("async", False))
+
+        path = f"/api/todos/{todo['id']}/"
+        response = await self.todo_detail(self.factory.patch(path, **self.body({"done": True})), todo_id=todo["id"])
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue((await Todo.objects.aget(id=todo["id"])).done)
+
+        response = await self.todo_detail(self.factory.delete(path), todo_id=todo["id"])
+        self.assertEqual(response.status_code, 204)
+        self.assertFalse(await Todo.objects.filter(id=todo["id"]).aexists())
+        response = await self.todo_detail(self.factory.delete(path), todo_id=todo["id"])
+        self.assertEqual(response.status_code, 404)
+        await self.assertRollupConsistent()
+
+    @closes_async_pools
+    async def test_invalid_payloads(self):
+        todo_id = (await Todo.objects.afirst()).id
+        path = f"/api/todos/{todo_id}/"
+        requests = [
+            (self.todo_list, self.factory.post("/api/todos/", data="{", content_type="application/json"), {}),
+            (self.todo_list, self.factory.post("/api/todos/", **self.body({"title": 1})), {}),
+            (self.todo_detail, self.factory.patch(path, **self.body({"done": "sí"})), {"todo_id": todo_id}),
+            (self.todo_detail, self.factory.patch(path, **self.body({})), {"todo_id": todo_id}),
+        ]
+        for view, request, kwargs in requests:
+            with self.subTest(body=request.body):
+                self.assertEqual((await view(request, **kwargs)).status_code, 400)
+
+    @closes_async_pools
+    async def test_detail_missing(self):
+        response = await self.todo_detail(self.factory.get("/api/todos/0/"), todo_id=0)
+        self.assertEqual(response.status_code, 404)
+        response = await self.todo_detail(self.factory.patch("/api/todos/0/", **self.body({"done": True})), todo_id=0)
+        self.assertEqual(response.status_code, 404)
+
+    @closes_async_pools
+    async def test_list_follows_next(self):
+        expected = [
+            todo_id async for todo_id in Todo.objects.order_by("-created_at", "-id").values_list("id", flat=True)
+        ]
+        ids, cursor = [], None
+        while True:
+            query = {"limit": 3, **({"cursor": cursor} if cursor else {})}
+            page = json.loads((await self.todo_list(self.factory.get("/api/todos/", query))).content)
+            ids.extend(todo["id"] for todo in page["results"])
+            cursor = page["next"]
+            if cursor is None:
+                break
+        self.assertEqual(ids, expected)
+
+    @requires_redis
+    @closes_async_pools
+    async def test_list_not_modified_until_a_write(self):
+        response = await self.todo_list(self.factory.get("/api/todos/"))
+        etag = response["ETag"]
+        response = await self.todo_list(self.factory.get("/api/todos/", headers={"If-None-Match": etag}))
+        self.assertEqual(response.status_code, 304)
+
+        await self.todo_list(self.factory.post("/api/todos/", **self.body({"title": "nueva"})))
+        response = await self.todo_list(self.factory.get("/api/todos/", headers={"If-None-Match": etag}))
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
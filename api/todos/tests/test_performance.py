@@ -0,0 +1,447 @@
+"""Regresiones de rendimiento por endpoint: cantidad de queries SQL y tiempo
+
+Siembra `TODOS_PERF_SEED` tareas (1000 por defecto) y compara cada endpoint de
+api_project/urls.py contra `perf_baseline.json`:
+
+- queries: la cantidad medida no puede superar la del baseline. No depende de
+  la cantidad de tareas, así que un endpoint que vuelve a hacer una query por
+  fila (o por palabra clave, o por día) falla aunque el seed sea chico.
+- latencia: el tiempo medido no puede superar `TODOS_PERF_TOLERANCE` veces
+  (3 por defecto) el del baseline para ese tamaño de seed, con un piso de
+  LATENCY_FLOOR_MS para que el ruido de la máquina no dé falsos positivos.
+  Si el baseline no tiene ese tamaño de seed, solo se controlan las queries.
+
+Necesita Redis: usa la base 15 del Redis configurado (o TODOS_TEST_REDIS_URL)
+y la vacía antes de cada test.
+
+    python manage.py test todos
+    TODOS_PERF_SEED=100000 python manage.py test todos.tests.test_performance
+    TODOS_PERF_RECORD=1 TODOS_PERF_SEED=10000 python manage.py test todos   # regrabar el baseline
+"""
+
+import gzip
+import json
+import os
+import time
+from datetime import timedelta
+from pathlib import Path
+from unittest import SkipTest, mock
+from urllib.parse import urlparse, urlunparse
+
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from redis.exceptions import RedisError
+
+from todos import redis_client
+from todos.cache import bump_generation, data_cache
+from todos.models import Todo, TodoDailyStat, TodoTag, extract_tags, title_attributes
+from todos.reports import publish_report, title_analytics
+from todos.stats import (
+    compute_stats,
+    expected_daily_stats,
+    read_counters,
+    rebuild_counters,
+    rebuild_daily_stats,
+    rolling_sum,
+    start_of_day,
+)
+
+BASELINE_PATH = Path(__file__).with_name("perf_baseline.json")
+SEED = int(os.environ.get("TODOS_PERF_SEED", "1000"))
+RECORD = os.environ.get("TODOS_PERF_RECORD") == "1"
+TOLERANCE = float(os.environ.get("TODOS_PERF_TOLERANCE", "3"))
+LATENCY_FLOOR_MS = 50.0
+SEED_BATCH_SIZE = 5000
+BULK_SIZE = 100
+
+TITLE_WORDS = ["urgent", "important", "critical", "rutina", "reporte", "revisar", "deploy", "backup"]
+
+
+def perf_redis_url() -> str:
+    url = os.environ.get("TODOS_TEST_REDIS_URL")
+    if url:
+        return url
+    return urlunparse(urlparse(redis_client.redis_url())._replace(path="/15"))
+
+
+def load_baseline() -> dict:
+    if BASELINE_PATH.exists():
+        return json.loads(BASELINE_PATH.read_text())
+    return {"queries": {}, "latency_ms": {}}
+
+
+def seed_todos(count: int) -> None:
+    """Tareas con títulos variados (con y sin palabras clave), ~30% completadas"""
+    batch = []
+    for i in range(count):
+        title = f"{TITLE_WORDS[i % len(TITLE_WORDS)]} tarea {TITLE_WORDS[i * 7 % len(TITLE_WORDS)]} #{i}"
+        batch.append(Todo(
+            title=title,
+            done=i % 10 < 3,
+            **title_attributes(title),
+        ))
+        if len(batch) >= SEED_BATCH_SIZE:
+            TodoTag.sync(Todo.objects.bulk_create(batch), batch_size=SEED_BATCH_SIZE)
+            batch = []
+    if batch:
+        TodoTag.sync(Todo.objects.bulk_create(batch), batch_size=SEED_BATCH_SIZE)
+
+
+# Como en producción con start.sh: /api/data/ lee el snapshot de build_reports
+@override_settings(TODOS_DATA_SNAPSHOTS=True)
+class EndpointPerformanceTests(TestCase):
+    recorded = {}
+
+    @classmethod
+    def setUpClass(cls):
+        cls.redis_env = mock.patch.dict(os.environ, {"REDIS_URL": perf_redis_url()})
+        cls.redis_env.start()
+        redis_client._pools.clear()
+        try:
+            redis_client.get_redis().ping()
+        except Exception as e:
+            cls.redis_env.stop()
+            redis_client._pools.clear()
+            raise SkipTest(f"Redis no disponible para los tests de rendimiento: {e}")
+        cls.baseline = load_baseline()
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        cls.redis_env.stop()
+        redis_client._pools.clear()
+        if RECORD and cls.recorded:
+            cls.write_baseline()
+
+    @classmethod
+    def setUpTestData(cls):
+        seed_todos(SEED)
+        rebuild_daily_stats()
+        cls.first_id = Todo.objects.order_by("id").values_list("id", flat=True).first()
+
+    def setUp(self):
+        redis_client.breaker.record_success()
+        self.redis = redis_client.get_redis()
+        self.redis.flushdb()
+        # flushdb no avisa por pub/sub: el nivel en memoria se vacía a mano
+        data_cache.invalidate_local()
+        if data_cache.local is not None:
+            data_cache.local.clear()
+        rebuild_counters(self.redis)
+        bump_generation(self.redis)
+
+    @classmethod
+    def write_baseline(cls):
+        baseline = load_baseline()
+        queries = baseline.setdefault("queries", {})
+        latency = baseline.setdefault("latency_ms", {}).setdefault(str(SEED), {})
+        for name, (query_count, elapsed_ms) in sorted(cls.recorded.items()):
+            queries[name] = query_count
+            latency[name] = round(elapsed_ms, 1)
+        baseline["queries"] = dict(sorted(queries.items()))
+        baseline["latency_ms"] = dict(sorted(baseline["latency_ms"].items(), key=lambda item: int(item[0])))
+        BASELINE_PATH.write_text(json.dumps(baseline, indent=2) + "\n")
+
+    def measure(self, name, method, path, data=None, expected_status=200):
+        """Hace la request (consumiendo el cuerpo streaming) y controla queries y tiempo"""
+        request = getattr(self.client, method.lower())
+        kwargs = {"content_type": "application/json"} if data is not None else {}
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            response = request(path, json.dumps(data), **kwargs) if data is not None else request(path)
+            if response.streaming:
+                b"".join(response.streaming_content)
+            elapsed_ms = (time.perf_counter() - start) * 1000
+
+        self.assertEqual(response.status_code, expected_status, f"{name}: {getattr(response, 'content', b'')[:300]}")
+        self.check(name, queries, elapsed_ms)
+        return response
+
+    def measure_call(self, name, function):
+        """Como measure(), para trabajo que no corre en una request (p. ej. el worker de reportes)"""
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            result = function()
+            elapsed_ms = (time.perf_counter() - start) * 1000
+        self.check(name, queries, elapsed_ms)
+        return result
+
+    def check(self, name, queries, elapsed_ms):
+        query_count = len(queries.captured_queries)
+        self.recorded[name] = (query_count, elapsed_ms)
+        if RECORD:
+            return
+
+        max_queries = self.baseline.get("queries", {}).get(name)
+        self.assertIsNotNone(max_queries, f"{name} no está en {BASELINE_PATH.name} (grabar con TODOS_PERF_RECORD=1)")
+        self.assertLessEqual(
+            query_count, max_queries,
+            f"{name}: {query_count} queries (baseline {max_queries}):\n"
+            + "\n".join(query["sql"] for query in queries.captured_queries),
+        )
+
+        baseline_ms = self.baseline.get("latency_ms", {}).get(str(SEED), {}).get(name)
+        if baseline_ms is not None:
+            limit_ms = max(baseline_ms * TOLERANCE, LATENCY_FLOOR_MS)
+            self.assertLessEqual(
+                elapsed_ms, limit_ms,
+                f"{name}: {elapsed_ms:.1f} ms con {SEED} tareas (baseline {baseline_ms} ms, límite {limit_ms:.1f} ms)",
+            )
+
+    def some_ids(self, count=BULK_SIZE):
+        return list(Todo.objects.order_by("id").values_list("id", flat=True)[:count])
+
+    # --- Sistema ---
+
+    def test_health(self):
+        self.measure("health GET", "GET", "/api/health/")
+
+    def test_metrics(self):
+        self.client.get("/api/health/")
+        self.measure("metrics GET", "GET", "/api/metrics/")
+
+    # --- Listado y detalle ---
+
+    def test_list_first_page(self):
+        response = self.measure("todo-list GET", "GET", "/api/todos/?limit=100")
+        # Las filas de values() se serializan igual que Todo.to_dict()
+        first = response.json()["results"][0]
+        self.assertEqual(first, Todo.objects.get(id=first["id"]).to_dict())
+
+    def test_list_next_page(self):
+        next_cursor = self.client.get("/api/todos/?limit=100").json()["next"]
+        self.measure("todo-list GET cursor", "GET", f"/api/todos/?limit=100&cursor={next_cursor}")
+
+    def test_list_max_page(self):
+        self.measure("todo-list GET limit=1000", "GET", "/api/todos/?limit=1000")
+
+    def test_list_by_tag(self):
+        self.measure("todo-list GET tag", "GET", "/api/todos/?tag=urgent&limit=100")
+
+    def test_list_stream(self):
+        self.measure("todo-list GET stream=ndjson", "GET", "/api/todos/?stream=ndjson")
+
+    def test_create(self):
+        self.measure("todo-list POST", "POST", "/api/todos/", {"title": "urgent nueva tarea"}, 201)
+
+    def test_detail(self):
+        self.measure("todo-detail GET", "GET", f"/api/todos/{self.first_id}/")
+
+    def test_detail_update(self):
+        self.measure(
+            "todo-detail PATCH", "PATCH", f"/api/todos/{self.first_id}/", {"title": "critical editada", "done": True}
+        )
+
+    def test_detail_update_done(self):
+        # Solo `done`: no se reescriben las etiquetas ni los derivados del título
+        self.measure("todo-detail PATCH done", "PATCH", f"/api/todos/{self.first_id}/", {"done": True})
+        todo = Todo.objects.get(id=self.first_id)
+        self.assertEqual(sorted(todo.tags.values_list("tag", flat=True)), sorted(extract_tags(todo.title)))
+
+    def test_detail_delete(self):
+        self.measure("todo-detail DELETE", "DELETE", f"/api/todos/{self.first_id}/", expected_status=204)
+
+    # --- Operaciones masivas ---
+
+    def test_bulk_create(self):
+        items = [{"title": f"important masiva {i}", "done": i % 2 == 0} for i in range(BULK_SIZE)]
+        self.measure("todo-bulk POST", "POST", "/api/todos/bulk/", {"items": items}, 201)
+
+    def test_bulk_update(self):
+        self.measure("todo-bulk PATCH", "PATCH", "/api/todos/bulk/", {"ids": self.some_ids(), "done": True})
+
+    def test_bulk_delete_ids(self):
+        self.measure("todo-bulk DELETE ids", "DELETE", "/api/todos/bulk/", {"ids": self.some_ids()})
+
+    def test_bulk_delete_filter(self):
+        self.measure("todo-bulk DELETE done=true", "DELETE", "/api/todos/bulk/?done=true")
+
+    def test_delete_through_base_manager(self):
+        # TodoTag no borra en cascada (DO_NOTHING): el _base_manager también tiene
+        # que borrar las etiquetas, o la FK de la base quedaría violada
+        ids = self.some_ids(10)
+        self.assertTrue(TodoTag.objects.filter(todo_id__in=ids).exists())
+        Todo._base_manager.filter(id__in=ids).delete()
+        self.assertFalse(TodoTag.objects.filter(todo_id__in=ids).exists())
+        connection.check_constraints(table_names=[TodoTag._meta.db_table])
+
+    # --- Reporte ---
+
+    def test_publish_report(self):
+        version = self.measure_call("build_reports publish", lambda: publish_report(self.redis))
+        self.assertIsNotNone(version)
+        # Variantes comprimidas guardadas junto al JSON
+        self.assertLess(data_cache.storage_stats(self.redis)["ratio"]["gzip"], 0.5)
+
+    def test_title_analytics_averages(self):
+        # Borrado por fuera de la API: los contadores de Redis ya no coinciden con
+        # la base, pero los promedios se calculan sobre las filas agregadas
+        Todo.objects.filter(id__in=self.some_ids(10)).delete()
+        rows = list(Todo.objects.values_list("title_words", "title_length"))
+        analytics = title_analytics()
+        self.assertEqual(analytics["avg_words"], round(sum(words for words, _ in rows) / len(rows), 2))
+        self.assertEqual(analytics["avg_length"], round(sum(length for _, length in rows) / len(rows), 2))
+
+    def test_data_snapshot(self):
+        publish_report(self.redis)
+        response = self.measure("data GET snapshot", "GET", "/api/data/")
+        self.assertEqual(response["X-Cache"], "HIT")
+        data = response.json()
+        self.assertEqual(data["stats"]["total"], SEED)
+        self.assertEqual((data["from_cache"], data["load_time"]), (True, 0))
+
+    def test_data_snapshot_local(self):
+        if data_cache.local is None:
+            self.skipTest("nivel local desactivado (TODOS_DATA_CACHE_LOCAL_MAX_BYTES=0)")
+        publish_report(self.redis)
+        self.client.get("/api/data/")
+        hits = data_cache.local.stats()["hits"]
+        response = self.measure("data GET snapshot local", "GET", "/api/data/")
+        self.assertEqual(response["X-Cache"], "HIT")
+        # El cuerpo sale de la memoria del proceso, sin transferirlo desde Redis
+        self.assertGreater(data_cache.local.stats()["hits"], hits)
+
+    def test_data_snapshot_gzip(self):
+        publish_report(self.redis)
+        self.client.defaults["HTTP_ACCEPT_ENCODING"] = "gzip"
+        try:
+            response = self.measure("data GET snapshot gzip", "GET", "/api/data/")
+        finally:
+            del self.client.defaults["HTTP_ACCEPT_ENCODING"]
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(json.loads(gzip.decompress(response.content))["stats"]["total"], SEED)
+
+    def test_data_stale_snapshot(self):
+        publish_report(self.redis)
+        self.client.post("/api/todos/", json.dumps({"title": "nueva"}), content_type="application/json")
+        # Sin la ventana de min_freshness, la escritura deja viejo al snapshot
+        with mock.patch.object(data_cache, "min_freshness", 0):
+            response = self.measure("data GET snapshot stale", "GET", "/api/data/")
+        self.assertEqual(response["X-Cache"], "STALE")
+
+    def test_data_without_snapshot(self):
+        response = self.measure("data GET sin snapshot", "GET", "/api/data/", expected_status=503)
+        self.assertIn("Retry-After", response)
+
+    @override_settings(TODOS_DATA_SNAPSHOTS=False)
+    def test_data_miss(self):
+        response = self.measure("data GET miss", "GET", "/api/data/")
+        self.assertEqual(response["X-Cache"], "MISS")
+
+    @override_settings(TODOS_DATA_SNAPSHOTS=False)
+    def test_data_hit(self):
+        self.client.get("/api/data/")
+        response = self.measure("data GET hit", "GET", "/api/data/")
+        self.assertEqual(response["X-Cache"], "HIT")
+
+    def test_data_not_modified(self):
+        publish_report(self.redis)
+        etag = self.client.get("/api/data/")["ETag"]
+        self.client.defaults["HTTP_IF_NONE_MATCH"] = etag
+        try:
+            self.measure("data GET 304", "GET", "/api/data/", expected_status=304)
+        finally:
+            del self.client.defaults["HTTP_IF_NONE_MATCH"]
+
+    def test_etag_after_failed_bump(self):
+        etag = self.client.get("/api/todos/?limit=10")["ETag"]
+        # La escritura no llega a Redis: la generación queda pendiente en este proceso
+        with mock.patch("todos.views.bump_generation", side_effect=ConnectionError("redis caído")):
+            self.client.post("/api/todos/", json.dumps({"title": "sin bump"}), content_type="application/json")
+        response = self.client.get("/api/todos/?limit=10", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_data_stream(self):
+        self.measure("data GET stream=json", "GET", "/api/data/?stream=json")
+
+    def test_data_clear(self):
+        self.measure("data DELETE", "DELETE", "/api/data/")
+
+    # --- Series desde el rollup diario ---
+
+    def assertRollupConsistent(self):
+        actual = {
+            row[0]: row[1:]
+            for row in TodoDailyStat.objects.values_list("day", "created", "completed", "done_updated")
+            if any(row[1:])
+        }
+        self.assertEqual(actual, expected_daily_stats())
+
+    def test_stats_rolling_windows(self):
+        # Ventanas móviles: una tarea de hace 7 días y un minuto ya no es "de la semana"
+        now = timezone.now()
+        inside, outside = self.some_ids(2)
+        Todo.objects.filter(id=inside).update(created_at=now - timedelta(days=7) + timedelta(minutes=1))
+        Todo.objects.filter(id=outside).update(created_at=now - timedelta(days=7, minutes=1))
+        stats, _ = compute_stats(now)
+        self.assertEqual(stats["week_created"], SEED - 1)
+
+        # Con buckets diarios, del día más viejo entra solo la parte dentro de la ventana
+        noon = start_of_day(timezone.localdate(now)) + timedelta(hours=12)
+        self.assertEqual(rolling_sum([1] * 7 + [10], 7, noon), 7 + 5)
+        rebuild_counters(self.redis, now)
+        self.assertIn(read_counters(self.redis, now)[0]["week_created"], (SEED - 2, SEED - 1, SEED))
+
+    def test_stats_timeseries(self):
+        response = self.measure("stats-timeseries GET", "GET", "/api/stats/timeseries/")
+        results = response.json()["results"]
+        self.assertEqual(len(results), 30)
+        self.assertEqual(results[-1]["created"], SEED)
+
+    def test_stats_timeseries_month(self):
+        response = self.measure(
+            "stats-timeseries GET month", "GET", "/api/stats/timeseries/?from=2000-01-01&to=2030-12-31&granularity=month"
+        )
+        results = response.json()["results"]
+        self.assertEqual(len(results), 31 * 12)
+        self.assertEqual(sum(row["created"] for row in results), SEED)
+
+    def test_stats_timeseries_invalid(self):
+        for query in ("granularity=year", "from=ayer", "from=2026-02-01&to=2026-01-01", "from=2000-01-01",
+                      "from=0001-01-01&to=9999-12-31", "from=0001-01-01&to=9999-12-31&granularity=month"):
+            response = self.client.get(f"/api/stats/timeseries/?{query}")
+            self.assertEqual(response.status_code, 400, query)
+
+    def test_rollup_follows_writes(self):
+        headers = {"content_type": "application/json"}
+        todo_id = self.client.post("/api/todos/", json.dumps({"title": "nueva"}), **headers).json()["id"]
+        self.client.patch(f"/api/todos/{todo_id}/", json.dumps({"done": True}), **headers)
+        self.client.post("/api/todos/bulk/", json.dumps({"items": [{"title": "a", "done": True}, {"title": "b"}]}), **headers)
+        self.client.patch("/api/todos/bulk/", json.dumps({"ids": self.some_ids(10), "done": True}), **headers)
+        self.client.delete("/api/todos/bulk/", json.dumps({"ids": self.some_ids(5)}), **headers)
+        self.client.delete(f"/api/todos/{todo_id}/")
+        self.client.delete("/api/todos/bulk/?done=true")
+        self.assertRollupConsistent()
+
+    def test_rollup_lost_delete_race(self):
+        # El DELETE que pierde la carrera (la fila ya no estaba) no descuenta nada
+        with mock.patch.object(Todo, "delete", return_value=(0, {})):
+            response = self.client.delete(f"/api/todos/{self.first_id}/")
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(self.client.delete(f"/api/todos/{self.first_id}/").status_code, 204)
+        self.assertEqual(self.client.delete(f"/api/todos/{self.first_id}/").status_code, 404)
+        self.assertRollupConsistent()
+        # Los contadores de Redis tampoco descuentan la tarea dos veces
+        self.assertEqual(read_counters(self.redis)[0]["total"], SEED - 1)
+
+    # --- Administración de Redis ---
+
+    def test_redis_admin(self):
+        try:
+            self.redis.info()
+        except RedisError as e:
+            # Algunos reemplazos de Redis para tests (p. ej. fakeredis) no implementan INFO
+            # y cortan la conexión: se descartan las del pool para los tests siguientes
+            self.redis.connection_pool.disconnect()
+            self.skipTest(f"el servidor Redis no soporta INFO: {e}")
+        self.measure("redis-admin GET", "GET", "/api/redis-admin/?count=100")
+
+    def test_redis_admin_delete(self):
+        self.measure("redis-admin DELETE", "DELETE", "/api/redis-admin/?pattern=todos_data_cache*")
+
+    def test_redis_admin_job(self):
+        self.measure("redis-admin-job GET", "GET", "/api/redis-admin/jobs/no-existe/", expected_status=404)
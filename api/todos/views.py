@@ -1,11 +1,8 @@
-import os
-import time
-import random
-import json
-import redis
-from typing import Dict, Any, List
-from datetime import timedelta
+from typing import Any, Dict, Tuple
 
+from django.conf import settings
+from django.db import transaction
+from django.http import HttpResponse, StreamingHttpResponse
 from django.utils.decorators import method_decorator
 from django.views.decorators.csrf import csrf_exempt
 from django.utils import timezone
@@ -14,34 +11,29 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 
-from redis import Redis
-from urllib.parse import urlparse
-from .models import Todo
+from redis.exceptions import RedisError
 
+from api_project.metrics import record_cache
+from .cache import HIT, MISS, bump_generation, data_cache, mark_bump_pending
+from .compression import negotiate
+from .etags import conditional_headers, etag_matches, make_etag, not_modified, request_etag
+from .models import TODO_FIELDS, Todo, TodoTag, title_attributes, tracked_keywords
+from .pagination import KEYSET_ORDERING, paginate, parse_limit
+from .redis_admin import (
+    DEFAULT_SCAN_COUNT, DEFAULT_VALUE_BYTES, MAX_SCAN_COUNT, MAX_VALUE_BYTES,
+    get_job, parse_bounded_int, parse_cursor, scan_page, server_info, start_delete_job, unlink_matching,
+)
+from .redis_client import breaker, get_redis, get_redis_or_none
+from .reports import (
+    SNAPSHOT_RETRY_AFTER, SNAPSHOT_UNAVAILABLE, cached_report, cached_response, snapshot_response, stream_report,
+)
+from .stats import StatsDelta, parse_timeseries_params, timeseries, todo_change, todo_snapshot
+from .streaming import STREAM_CHUNK_SIZE, STREAM_FORMATS, iter_json_array, iter_ndjson
 
-def get_redis() -> Redis:
-    redis_url = os.environ.get("REDIS_URL")
-    try:
-        if redis_url:
-            # Para Render/producción - usa REDIS_URL
-            r = Redis.from_url(redis_url, decode_responses=True)
-            # Test conexión
-            r.ping()
-            return r
-        else:
-            # Para desarrollo local
-            r = Redis(
-                host=os.environ.get("REDIS_HOST", "localhost"),
-                port=int(os.environ.get("REDIS_PORT", "6379")),
-                db=int(os.environ.get("REDIS_DB", "0")),
-                decode_responses=True,
-            )
-            r.ping()
-            return r
-    except Exception as e:
-        print(f"Redis connection error: {e}")
-        print(f"REDIS_URL: {redis_url}")
-        raise
+
+# Límites de las operaciones masivas (/api/todos/bulk/)
+BULK_MAX_ITEMS = 10000
+BULK_BATCH_SIZE = 500
 
 # ARQUITECTURA ACTUALIZADA:
 # - TODOs ahora se almacenan en PostgreSQL (modelo Django)
@@ -51,23 +43,69 @@ def get_redis() -> Redis:
 @method_decorator(csrf_exempt, name="dispatch")
 class HealthView(APIView):
     def get(self, request):
-        r = get_redis()
         try:
-            pong = r.ping()
-            return Response({"ok": True, "redis": pong}, status=status.HTTP_200_OK)
+            pong = get_redis().ping()
+            return Response({"ok": True, "redis": pong, "breaker": breaker.state}, status=status.HTTP_200_OK)
         except Exception as e:
-            return Response({"ok": False, "error": str(e)}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+            return Response(
+                {"ok": False, "error": str(e), "breaker": breaker.state},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE
+            )
 
 @method_decorator(csrf_exempt, name="dispatch")
 class TodoList(APIView):
     """Lista y crea TODOs usando PostgreSQL como almacén principal"""
     
     def get(self, request):
-        """Obtener todas las tareas desde PostgreSQL"""
+        """Obtener una página de tareas desde PostgreSQL
+
+        Paginación por cursor: `?limit=<1..1000>&cursor=<next de la página anterior>`.
+        Con `?stream=json|ndjson` se envía el listado completo de forma incremental.
+        Con `?tag=<palabra clave>` solo se listan las tareas con esa etiqueta.
+        """
+        stream = request.GET.get("stream")
+        if stream and stream not in STREAM_FORMATS:
+            return Response(
+                {"detail": "stream debe ser 'json' o 'ndjson'."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        tag = request.GET.get("tag")
+        if tag is not None and tag not in tracked_keywords():
+            return Response(
+                {"detail": f"tag debe ser una de: {', '.join(tracked_keywords())}."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        queryset = Todo.objects.all() if tag is None else Todo.objects.filter(tags__tag=tag)
+
+        # GET condicional: si el cliente ya tiene esta versión no se toca el ORM
+        etag = request_etag(get_redis_or_none(), request)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+
+        # Solo las columnas de la respuesta, como dicts: sin instanciar un Todo por fila
+        queryset = queryset.values(*TODO_FIELDS)
+
+        if stream:
+            # Cursor del servidor: nunca se materializa la tabla completa en memoria
+            rows = queryset.order_by(*KEYSET_ORDERING).iterator(chunk_size=STREAM_CHUNK_SIZE)
+            writer = iter_ndjson if stream == "ndjson" else iter_json_array
+            response = StreamingHttpResponse(writer(rows), content_type=STREAM_FORMATS[stream])
+            for header, value in conditional_headers(etag).items():
+                response[header] = value
+            return response
+
         try:
-            todos = Todo.objects.all()
-            todos_data = [todo.to_dict() for todo in todos]
-            return Response(todos_data, status=status.HTTP_200_OK)
+            limit = parse_limit(request.GET.get("limit"))
+            # paginate() ejecuta la consulta: sus errores de base caen en el except general
+            todos, next_cursor = paginate(queryset, request.GET.get("cursor"), limit)
+            return Response(
+                {"results": todos, "next": next_cursor, "limit": limit},
+                status=status.HTTP_200_OK,
+                headers=conditional_headers(etag),
+            )
+        except ValueError as e:
+            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
         except Exception as e:
             return Response(
                 {"detail": f"Error obteniendo tareas: {str(e)}"}, 
@@ -84,15 +122,13 @@ class TodoList(APIView):
                     status=status.HTTP_400_BAD_REQUEST
                 )
 
-            # Crear tarea en PostgreSQL
-            todo = Todo.objects.create(title=title.strip())
+            # Crear tarea en PostgreSQL (y sumarla al rollup diario en la misma transacción)
+            with transaction.atomic():
+                todo = Todo.objects.create(title=title.strip())
+                delta = todo_change(after=todo_snapshot(todo)).save_rollup()
             
-            # Invalidar caché de datos (si existe)
-            try:
-                r = get_redis()
-                r.delete("todos_data_cache")
-            except:
-                pass  # Si Redis falla, no importa para el funcionamiento principal
+            # Invalidar caché y actualizar contadores
+            invalidate_after_write(delta)
                 
             return Response(todo.to_dict(), status=status.HTTP_201_CREATED)
             
@@ -104,18 +140,25 @@ class TodoList(APIView):
 
 @method_decorator(csrf_exempt, name="dispatch")
 class TodoDetail(APIView):
-    """Actualiza y elimina TODOs específicos usando PostgreSQL"""
+    """Obtiene, actualiza y elimina TODOs específicos usando PostgreSQL"""
     
-    def patch(self, request, todo_id: int):
-        """Actualizar tarea específica en PostgreSQL"""
+    def get(self, request, todo_id: int):
+        """Obtener tarea específica (con GET condicional por ETag)"""
+        etag = request_etag(get_redis_or_none(), request)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+
         try:
-            todo = Todo.objects.get(id=todo_id)
+            todo = Todo.objects.values(*TODO_FIELDS).get(id=todo_id)
         except Todo.DoesNotExist:
             return Response({"detail": "No existe."}, status=status.HTTP_404_NOT_FOUND)
+        return Response(todo, status=status.HTTP_200_OK, headers=conditional_headers(etag))
 
+    def patch(self, request, todo_id: int):
+        """Actualizar tarea específica en PostgreSQL"""
         try:
             payload = request.data or {}
-            updated = False
+            changes = {}
 
             if "title" in payload:
                 title = payload.get("title")
@@ -124,8 +167,7 @@ class TodoDetail(APIView):
                         {"detail": "title debe ser string."}, 
                         status=status.HTTP_400_BAD_REQUEST
                     )
-                todo.title = title.strip()
-                updated = True
+                changes["title"] = title.strip()
 
             if "done" in payload:
                 done = payload.get("done")
@@ -134,26 +176,23 @@ class TodoDetail(APIView):
                         {"detail": "done debe ser booleano."}, 
                         status=status.HTTP_400_BAD_REQUEST
                     )
-                todo.done = done
-                updated = True
+                changes["done"] = done
 
-            if not updated:
+            if not changes:
                 return Response(
                     {"detail": "Nada para actualizar."}, 
                     status=status.HTTP_400_BAD_REQUEST
                 )
 
-            todo.save()
+            todo, delta = update_todo(todo_id, changes)
             
-            # Invalidar caché
-            try:
-                r = get_redis()
-                r.delete("todos_data_cache")
-            except:
-                pass
+            # Invalidar caché y actualizar contadores
+            invalidate_after_write(delta)
                 
             return Response(todo.to_dict(), status=status.HTTP_200_OK)
             
+        except Todo.DoesNotExist:
+            return Response({"detail": "No existe."}, status=status.HTTP_404_NOT_FOUND)
         except Exception as e:
             return Response(
                 {"detail": f"Error actualizando tarea: {str(e)}"}, 
@@ -163,15 +202,10 @@ class TodoDetail(APIView):
     def delete(self, request, todo_id: int):
         """Eliminar tarea específica de PostgreSQL"""
         try:
-            todo = Todo.objects.get(id=todo_id)
-            todo.delete()
+            delta = delete_todo(todo_id)
             
-            # Invalidar caché
-            try:
-                r = get_redis()
-                r.delete("todos_data_cache")
-            except:
-                pass
+            # Invalidar caché y actualizar contadores
+            invalidate_after_write(delta)
                 
             return Response(status=status.HTTP_204_NO_CONTENT)
             
@@ -184,155 +218,289 @@ class TodoDetail(APIView):
             )
 
 
+@method_decorator(csrf_exempt, name="dispatch")
+class TodoBulk(APIView):
+    """Alta, modificación y baja masiva de TODOs
+
+    Cada operación corre en una sola transacción y hace una sola invalidación
+    de caché, en lugar de una request + INSERT/DELETE + round-trip a Redis por tarea.
+    """
+
+    def post(self, request):
+        """Crear tareas en lote: {"items": [{"title": "...", "done": false}, ...]}"""
+        payload = request.data or {}
+        items = payload.get("items") if isinstance(payload, dict) else payload
+        if not isinstance(items, list) or not items:
+            return Response(
+                {"detail": "items (lista no vacía) es requerido."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if len(items) > BULK_MAX_ITEMS:
+            return Response(
+                {"detail": f"Máximo {BULK_MAX_ITEMS} tareas por request."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        results = [None] * len(items)
+        to_create = []
+        positions = []
+        for index, item in enumerate(items):
+            title = item.get("title") if isinstance(item, dict) else None
+            done = item.get("done", False) if isinstance(item, dict) else None
+            if not title or not isinstance(title, str):
+                results[index] = {"index": index, "status": "error", "detail": "title (string) es requerido."}
+            elif not isinstance(done, bool):
+                results[index] = {"index": index, "status": "error", "detail": "done debe ser booleano."}
+            else:
+                # bulk_create no llama a save(): los derivados del título se fijan acá
+                to_create.append(Todo(title=title.strip(), done=done, **title_attributes(title.strip())))
+                positions.append(index)
+
+        try:
+            with transaction.atomic():
+                created = Todo.objects.bulk_create(to_create, batch_size=BULK_BATCH_SIZE)
+                TodoTag.sync(created)
+                delta = StatsDelta().add_rows(todo_snapshot(todo) for todo in created).save_rollup()
+        except Exception as e:
+            return Response(
+                {"detail": f"Error creando tareas: {str(e)}"},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+        for index, todo in zip(positions, created):
+            results[index] = {"index": index, "status": "created", "id": todo.id}
+
+        if created:
+            invalidate_after_write(delta)
+
+        return Response(
+            {"created": len(created), "errors": len(items) - len(created), "results": results},
+            status=status.HTTP_201_CREATED if created else status.HTTP_400_BAD_REQUEST
+        )
+
+    def patch(self, request):
+        """Actualizar tareas en lote: {"ids": [1, 2], "done": true, "title": "..."}"""
+        payload = request.data or {}
+        ids, error = parse_bulk_ids(payload)
+        if error:
+            return Response({"detail": error}, status=status.HTTP_400_BAD_REQUEST)
+
+        changes = {}
+        if "title" in payload:
+            if not isinstance(payload["title"], str):
+                return Response({"detail": "title debe ser string."}, status=status.HTTP_400_BAD_REQUEST)
+            changes["title"] = payload["title"].strip()
+            changes.update(title_attributes(changes["title"]))
+        if "done" in payload:
+            if not isinstance(payload["done"], bool):
+                return Response({"detail": "done debe ser booleano."}, status=status.HTTP_400_BAD_REQUEST)
+            changes["done"] = payload["done"]
+        if not changes:
+            return Response({"detail": "Nada para actualizar."}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            with transaction.atomic():
+                queryset = Todo.objects.filter(id__in=ids)
+                before = {
+                    row[0]: row[1:]
+                    for row in queryset.select_for_update().values_list("id", "title", "done", "created_at", "updated_at")
+                }
+                # update() no aplica auto_now: se fija updated_at explícitamente
+                changes["updated_at"] = timezone.now()
+                queryset.update(**changes)
+                if "title" in changes:
+                    TodoTag.sync(Todo(id=todo_id, title=changes["title"]) for todo_id in before)
+
+                delta = StatsDelta()
+                for title, done, created_at, updated_at in before.values():
+                    delta.add_row((title, done, created_at, updated_at), -1)
+                    delta.add_row(
+                        (changes.get("title", title), changes.get("done", done), created_at, changes["updated_at"])
+                    )
+                delta.save_rollup()
+        except Exception as e:
+            return Response(
+                {"detail": f"Error actualizando tareas: {str(e)}"},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+        if before:
+            invalidate_after_write(delta)
+
+        results = [{"id": todo_id, "status": "updated" if todo_id in before else "not_found"} for todo_id in ids]
+        return Response({"updated": len(before), "not_found": len(ids) - len(before), "results": results})
+
+    def delete(self, request):
+        """Eliminar tareas en lote: {"ids": [...]} o por filtro `?done=true|false` / `?all=true`"""
+        done_filter = request.GET.get("done")
+        delete_all = request.GET.get("all") == "true"
+
+        if done_filter is not None or delete_all:
+            if done_filter not in (None, "true", "false"):
+                return Response({"detail": "done debe ser true o false."}, status=status.HTTP_400_BAD_REQUEST)
+            queryset = Todo.objects.all()
+            if done_filter is not None:
+                queryset = queryset.filter(done=done_filter == "true")
+            try:
+                with transaction.atomic():
+                    # Primero se bloquean las filas (solo sus ids: PostgreSQL no admite
+                    # FOR UPDATE junto con agregaciones), así un PATCH o DELETE
+                    # concurrente espera al COMMIT y no cambia el aporte a descontar
+                    list(queryset.select_for_update().values_list("id", flat=True))
+                    # Aporte a los contadores calculado con agregaciones, sin traer las
+                    # filas; de todos los días, porque el rollup diario no tiene ventana
+                    delta = StatsDelta().add_queryset(queryset, -1, days=None).save_rollup()
+                    deleted = delete_todos(queryset)
+            except Exception as e:
+                return Response(
+                    {"detail": f"Error eliminando tareas: {str(e)}"},
+                    status=status.HTTP_500_INTERNAL_SERVER_ERROR
+                )
+            if deleted:
+                invalidate_after_write(delta)
+            return Response({"deleted": deleted})
+
+        ids, error = parse_bulk_ids(request.data or {})
+        if error:
+            return Response({"detail": error}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            with transaction.atomic():
+                queryset = Todo.objects.filter(id__in=ids)
+                rows = {
+                    row[0]: row[1:]
+                    for row in queryset.select_for_update().values_list("id", "title", "done", "created_at", "updated_at")
+                }
+                delete_todos(queryset)
+                delta = StatsDelta().add_rows(rows.values(), -1).save_rollup()
+        except Exception as e:
+            return Response(
+                {"detail": f"Error eliminando tareas: {str(e)}"},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+        if rows:
+            invalidate_after_write(delta)
+
+        results = [{"id": todo_id, "status": "deleted" if todo_id in rows else "not_found"} for todo_id in ids]
+        return Response({"deleted": len(rows), "not_found": len(ids) - len(rows), "results": results})
+
+
+def delete_todos(queryset) -> int:
+    """Borra las tareas del queryset (y sus etiquetas) con dos DELETE (ver TodoQuerySet.delete)
+
+    Devuelve la cantidad de tareas borradas.
+    """
+    return queryset.delete()[1].get(Todo._meta.label, 0)
+
+
+def update_todo(todo_id: int, changes: Dict[str, Any]) -> Tuple[Todo, StatsDelta]:
+    """Modifica una tarea y ajusta el rollup diario en una transacción
+
+    La fila se relee con SELECT ... FOR UPDATE (como en TodoBulk): dos PATCH
+    concurrentes de la misma tarea se serializan y cada uno calcula su variación
+    contra el estado que dejó el otro. Lanza Todo.DoesNotExist si ya no existe.
+    """
+    with transaction.atomic():
+        todo = Todo.objects.select_for_update().get(id=todo_id)
+        before = todo_snapshot(todo)
+        for field, value in changes.items():
+            setattr(todo, field, value)
+        todo.save()
+        return todo, todo_change(before=before, after=todo_snapshot(todo)).save_rollup()
+
+
+def delete_todo(todo_id: int) -> StatsDelta:
+    """Borra una tarea y la descuenta del rollup diario en una transacción
+
+    Con la fila bloqueada, de dos DELETE concurrentes solo uno la borra; el otro
+    (o uno que no borró nada) lanza Todo.DoesNotExist y no aplica ninguna variación.
+    """
+    with transaction.atomic():
+        todo = Todo.objects.select_for_update().get(id=todo_id)
+        before = todo_snapshot(todo)
+        deleted, _ = todo.delete()
+        if not deleted:
+            raise Todo.DoesNotExist(f"Todo {todo_id} ya fue borrada")
+        return todo_change(before=before).save_rollup()
+
+
+def parse_bulk_ids(payload):
+    """Valida la lista `ids` de una operación masiva; devuelve (ids, error)"""
+    ids = payload.get("ids") if isinstance(payload, dict) else None
+    if not isinstance(ids, list) or not ids:
+        return None, "ids (lista no vacía) es requerido."
+    if len(ids) > BULK_MAX_ITEMS:
+        return None, f"Máximo {BULK_MAX_ITEMS} ids por request."
+    if not all(isinstance(todo_id, int) and not isinstance(todo_id, bool) for todo_id in ids):
+        return None, "ids debe contener enteros."
+    return list(dict.fromkeys(ids)), None
+
+
+def invalidate_after_write(delta: StatsDelta) -> None:
+    """Una sola invalidación de caché y actualización de contadores por escritura u operación masiva
+
+    Si Redis falla la escritura sigue siendo válida; la generación queda
+    pendiente de incrementar para que ninguna ETag vieja siga respondiendo 304.
+    """
+    try:
+        r = get_redis()
+        bump_generation(r)
+        delta.apply(r)
+    except:
+        mark_bump_pending()
+
+
 @method_decorator(csrf_exempt, name='dispatch')
 class DataView(APIView):
     """Endpoint simple para cargar y mostrar datos con caché"""
     
     def get(self, request):
-        """Obtiene datos de tareas reales, usando caché si está disponible"""
+        """Obtiene datos de tareas reales, usando caché si está disponible
+
+        Con TODOS_DATA_SNAPSHOTS solo se lee el último reporte publicado por
+        `manage.py build_reports` (503 si todavía no hay ninguno). Con
+        `?stream=json` el reporte se genera y envía de forma incremental,
+        sin pasar por la caché (para exportaciones de tablas grandes).
+        """
+        stream = request.GET.get("stream")
+        if stream and stream != "json":
+            return Response(
+                {"detail": "stream debe ser 'json'."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        r = get_redis_or_none()  # Sin Redis se calcula todo desde la base
+        
         try:
-            r = get_redis()
-            cache_key = "todos_data_cache"
-            
-            # Intentar obtener datos del caché
-            cached_data = r.get(cache_key)
-            
-            if cached_data:
-                # Datos encontrados en caché
-                data = json.loads(cached_data)
-                data['from_cache'] = True
-                data['load_time'] = 0  # Instantáneo desde caché
-                return Response(data)
-            
-            # Cargar datos desde PostgreSQL con operaciones SÚPER COSTOSAS
-            start_time = time.time()
-            
-            # 1. Múltiples consultas de agregación PESADAS
-            total_todos = Todo.objects.count()
-            completed_todos = Todo.objects.filter(done=True).count()
-            pending_todos = Todo.objects.filter(done=False).count()
-            
-            # 2. Consultas con filtros complejos y rangos de fechas
-            today = timezone.now().date()
-            week_ago = timezone.now() - timedelta(days=7)
-            month_ago = timezone.now() - timedelta(days=30)
-            year_ago = timezone.now() - timedelta(days=365)
+            if stream:
+                return StreamingHttpResponse(stream_report(r), content_type=STREAM_FORMATS["json"])
             
-            # 3. CONSULTAS SÚPER PESADAS (simula reportes complejos reales)
-            today_todos = Todo.objects.filter(created_at__date=today).count()
-            week_todos = Todo.objects.filter(created_at__gte=week_ago).count()
-            month_todos = Todo.objects.filter(created_at__gte=month_ago).count()
-            year_todos = Todo.objects.filter(created_at__gte=year_ago).count()
-            recent_completed = Todo.objects.filter(done=True, updated_at__gte=week_ago).count()
+            if settings.TODOS_DATA_SNAPSHOTS:
+                return self.get_snapshot(request, r)
             
-            # 4. Agregaciones por día (MUY COSTOSO)
-            daily_stats = {}
-            for days_back in range(7):  # Últimos 7 días
-                date = today - timedelta(days=days_back)
-                daily_count = Todo.objects.filter(created_at__date=date).count()
-                daily_completed = Todo.objects.filter(created_at__date=date, done=True).count()
-                daily_stats[str(date)] = {
-                    'created': daily_count,
-                    'completed': daily_completed
-                }
-            
-            # 5. Consultas con LIKE patterns (SÚPER LENTO)
-            urgent_todos = Todo.objects.filter(title__icontains='urgent').count()
-            important_todos = Todo.objects.filter(title__icontains='important').count()
-            critical_todos = Todo.objects.filter(title__icontains='critical').count()
-            
-            # 6. Consulta principal con ordenamiento COSTOSO
-            todos_queryset = Todo.objects.all().order_by('-created_at', 'title')
-            
-            # 7. Procesamiento individual PESADO (simula lógica de negocio compleja)
-            todos = []
-            word_count_total = 0
-            avg_title_length = 0
-            
-            for todo in todos_queryset:
-                # Verificaciones individuales costosas
-                is_recent = (timezone.now() - todo.created_at).days < 7
-                is_very_recent = (timezone.now() - todo.created_at).total_seconds() < 24 * 3600
-                title_words = len(todo.title.split())
-                title_length = len(todo.title)
-                word_count_total += title_words
-                
-                # Más cálculos innecesarios para simular carga
-                has_numbers = any(char.isdigit() for char in todo.title)
-                has_special = any(char in "!@#$%^&*()" for char in todo.title)
-                
-                todos.append({
-                    'id': todo.id,
-                    'title': todo.title,
-                    'done': todo.done,
-                    'created_at': todo.created_at.timestamp(),
-                    'timestamp': todo.created_at.timestamp(),
-                    'is_recent': is_recent,
-                    'is_very_recent': is_very_recent,
-                    'title_words': title_words,
-                    'title_length': title_length,
-                    'has_numbers': has_numbers,
-                    'has_special_chars': has_special
-                })
-            
-            # 8. Más cálculos estadísticos COSTOSOS
-            if total_todos > 0:
-                avg_title_length = word_count_total / total_todos
-                completion_rate = (completed_todos / total_todos) * 100
-                recent_completion_rate = (recent_completed / week_todos * 100) if week_todos > 0 else 0
-            else:
-                completion_rate = 0
-                recent_completion_rate = 0
-            
-            # 9. Estadísticas adicionales PESADAS
-            title_stats = {
-                'avg_words': round(avg_title_length, 2),
-                'total_characters': sum(len(t['title']) for t in todos),
-                'avg_length': round(sum(len(t['title']) for t in todos) / len(todos), 2) if todos else 0,
-                'with_numbers': sum(1 for t in todos if t['has_numbers']),
-                'with_special': sum(1 for t in todos if t['has_special_chars'])
-            }
+            # GET condicional: la ETag es la versión de la entrada cacheada vigente
+            if r is not None and request.headers.get("If-None-Match"):
+                try:
+                    version = data_cache.fresh_version(r)
+                except RedisError:
+                    version = None
+                if version is not None and etag_matches(request, make_etag(version)):
+                    record_cache(data_cache.key, HIT)
+                    return not_modified(make_etag(version))
             
-            # Preparar respuesta con estadísticas SÚPER EXTENDIDAS
-            todos_data = {
-                'todos': todos,
-                'stats': {
-                    'total': total_todos,
-                    'completed': completed_todos,
-                    'pending': pending_todos,
-                    'completion_rate': round(completion_rate, 1),
-                    'recent_completion_rate': round(recent_completion_rate, 1),
-                    'today_created': today_todos,
-                    'week_created': week_todos,
-                    'month_created': month_todos,
-                    'year_created': year_todos,
-                    'recent_completed': recent_completed,
-                    'urgent_count': urgent_todos,
-                    'important_count': important_todos,
-                    'critical_count': critical_todos
-                },
-                'daily_stats': daily_stats,
-                'title_analytics': title_stats,
-                'generated_at': time.strftime('%Y-%m-%d %H:%M:%S'),
-                'from_cache': False
-            }
+            # Caché con stale-while-revalidate: un solo worker recalcula el reporte
+            # (operaciones SÚPER COSTOSAS en PostgreSQL) y el resto sirve el anterior
+            encoding = negotiate(request.headers.get("Accept-Encoding"), data_cache.encodings)
+            todos_data, cache_status, version = cached_report(r, raw=True, encoding=encoding)
+            record_cache(data_cache.key, cache_status)
             
-            end_time = time.time()
-            load_time = round((end_time - start_time) * 1000)  # En milisegundos
-            todos_data['load_time'] = load_time
+            if cache_status != MISS:
+                # Cuerpo guardado (ya con from_cache y load_time), sin decodificar
+                body, headers = cached_response(todos_data, cache_status, version)
+                return HttpResponse(body, content_type="application/json", headers=headers)
             
-            # Guardar en caché por 30 segundos (Redis solo como caché)
-            try:
-                # Convertir timestamps a strings para JSON
-                todos_data_for_cache = todos_data.copy()
-                for todo in todos_data_for_cache['todos']:
-                    todo['created_at'] = str(todo['created_at'])
-                    todo['timestamp'] = str(todo['timestamp'])
-                r.setex(cache_key, 30, json.dumps(todos_data_for_cache))
-            except:
-                pass  # Si Redis falla, no importa para el funcionamiento principal
-            
-            return Response(todos_data)
+            headers = conditional_headers(make_etag(version) if version else None)
+            headers["X-Cache"] = cache_status
+            return Response(todos_data, headers=headers)
             
         except Exception as e:
             return Response(
@@ -340,11 +508,41 @@ class DataView(APIView):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
     
+    def get_snapshot(self, request, r):
+        """Último reporte publicado, sin consultar la base (latencia fija)"""
+        if r is not None and request.headers.get("If-None-Match"):
+            try:
+                version = data_cache.snapshot_version(r)
+            except RedisError:
+                version = None
+            if version is not None and etag_matches(request, make_etag(version)):
+                record_cache(data_cache.key, HIT)
+                return not_modified(make_etag(version))
+        
+        try:
+            # Cliente sin decode_responses: el cuerpo guardado (JSON, gzip o br) se envía tal cual
+            rb = get_redis_or_none(decode_responses=False)
+            encoding = negotiate(request.headers.get("Accept-Encoding"), data_cache.encodings)
+            snapshot = data_cache.get_snapshot(rb, raw=True, encoding=encoding) if rb is not None else None
+        except RedisError:
+            snapshot = None
+        if snapshot is None:
+            record_cache(data_cache.key, MISS)
+            return Response(
+                {"detail": SNAPSHOT_UNAVAILABLE},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE,
+                headers={"Retry-After": SNAPSHOT_RETRY_AFTER}
+            )
+        
+        body, headers = snapshot_response(snapshot)
+        record_cache(data_cache.key, headers["X-Cache"])
+        return HttpResponse(body, content_type="application/json", headers=headers)
+    
     def delete(self, request):
         """Limpiar caché de datos de tareas"""
         try:
             r = get_redis()
-            r.delete("todos_data_cache")
+            data_cache.clear(r)
             return Response({"detail": "Caché de tareas limpiado"})
         except Exception as e:
             return Response(
@@ -353,83 +551,76 @@ class DataView(APIView):
             )
 
 
+@method_decorator(csrf_exempt, name="dispatch")
+class StatsTimeseriesView(APIView):
+    """Serie de tareas creadas/completadas por día, semana o mes desde el rollup diario"""
+
+    def get(self, request):
+        """`?from=YYYY-MM-DD&to=YYYY-MM-DD&granularity=day|week|month` (fechas inclusive)
+
+        Una sola consulta sobre TodoDailyStat, sin importar el tamaño de la tabla
+        de tareas ni la longitud del rango.
+        """
+        try:
+            first_day, last_day, granularity = parse_timeseries_params(request.GET)
+        except ValueError as e:
+            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        # El rango por defecto termina hoy: la fecha entra en la ETag
+        etag = request_etag(get_redis_or_none(), request, str(first_day), str(last_day))
+        if etag_matches(request, etag):
+            return not_modified(etag)
+
+        return Response(
+            {
+                "from": str(first_day),
+                "to": str(last_day),
+                "granularity": granularity,
+                "results": timeseries(first_day, last_day, granularity),
+            },
+            status=status.HTTP_200_OK,
+            headers=conditional_headers(etag),
+        )
+
+
 @method_decorator(csrf_exempt, name='dispatch')
 class RedisAdminView(APIView):
     """Endpoint de administración para ver y gestionar Redis"""
     
     def get(self, request):
-        """Ver información completa de Redis"""
+        """Ver información de Redis y una página de keys
+
+        `?cursor=<cursor de la página anterior>&count=<1..1000>&match=<patrón>`
+        recorre las keys con SCAN; `?values=true&max_value_bytes=<n>` agrega el
+        valor de cada key, truncado.
+        """
         try:
-            r = get_redis()
-            
-            # Obtener todas las keys
-            all_keys = r.keys("*")
-            
-            # Información general
-            info = {
-                "redis_info": {
-                    "total_keys": len(all_keys),
-                    "memory_usage": r.info().get('used_memory_human', 'N/A'),
-                    "connected_clients": r.info().get('connected_clients', 'N/A'),
-                    "uptime": r.info().get('uptime_in_seconds', 'N/A'),
-                },
-                "keys_details": []
-            }
-            
-            # Detalles de cada key
-            for key in all_keys:
-                try:
-                    key_type = r.type(key)
-                    ttl = r.ttl(key)
-                    
-                    key_info = {
-                        "key": key,
-                        "type": key_type,
-                        "ttl": ttl if ttl > 0 else "No expira"
-                    }
-                    
-                    # Obtener valor según el tipo
-                    if key_type == "string":
-                        try:
-                            # Intentar decodificar como JSON
-                            value = r.get(key)
-                            try:
-                                key_info["value"] = json.loads(value)
-                                key_info["display"] = "JSON"
-                            except:
-                                key_info["value"] = value
-                                key_info["display"] = "String"
-                        except:
-                            key_info["value"] = "Error leyendo valor"
-                            
-                    elif key_type == "hash":
-                        key_info["value"] = r.hgetall(key)
-                        key_info["display"] = "Hash"
-                        
-                    elif key_type == "zset":
-                        # Para sorted sets, mostrar elementos con scores
-                        zset_data = r.zrange(key, 0, -1, withscores=True)
-                        key_info["value"] = [{"member": member, "score": score} for member, score in zset_data]
-                        key_info["display"] = "Sorted Set"
-                        
-                    elif key_type == "list":
-                        key_info["value"] = r.lrange(key, 0, -1)
-                        key_info["display"] = "List"
-                        
-                    elif key_type == "set":
-                        key_info["value"] = list(r.smembers(key))
-                        key_info["display"] = "Set"
-                    
-                    info["keys_details"].append(key_info)
-                    
-                except Exception as e:
-                    info["keys_details"].append({
-                        "key": key,
-                        "error": f"Error leyendo key: {str(e)}"
-                    })
-            
-            return Response(info)
-            
+            cursor = parse_cursor(request.GET.get("cursor"))
+            count = parse_bounded_int(request.GET.get("count"), DEFAULT_SCAN_COUNT, MAX_SCAN_COUNT, "count")
+            max_bytes = parse_bounded_int(
+                request.GET.get("max_value_bytes"), DEFAULT_VALUE_BYTES, MAX_VALUE_BYTES, "max_value_bytes"
+            )
+        except ValueError as e:
+            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        match = request.GET.get("match") or "*"
+        with_values = request.GET.get("values") == "true"
+
+        try:
+            # Cliente sin decodificar: puede haber valores binarios (p. ej. comprimidos)
+            r = get_redis(decode_responses=False)
+            next_cursor, keys_details = scan_page(r, cursor, count, match, with_values, max_bytes)
+            return Response({
+                "redis_info": server_info(r),
+                # Tamaño guardado del reporte de /api/data/ por codificación y compresión lograda
+                "data_cache": data_cache.storage_stats(r),
+                # Nivel en memoria del worker que atendió esta request
+                "data_cache_local": data_cache.local.stats() if data_cache.local is not None else None,
+                "keys_details": keys_details,
+                "cursor": next_cursor,
+                "count": count,
+                "match": match,
+            })
+
         except Exception as e:
             return Response(
                 {"detail": f"Error conectando a Redis: {str(e)}"}, 
@@ -437,30 +628,62 @@ class RedisAdminView(APIView):
             )
     
     def delete(self, request):
-        """Limpiar keys específicas o todas"""
+        """Limpiar keys específicas o todas
+
+        `?pattern=<patrón>` borra con SCAN + UNLINK en lotes; con `&background=true`
+        el borrado corre en segundo plano y se consulta en /api/redis-admin/jobs/<id>/.
+        `?pattern=FLUSH_ALL` vacía la base con FLUSHDB ASYNC.
+        """
         try:
             r = get_redis()
             key_pattern = request.GET.get('pattern', '*')
             
             if key_pattern == "FLUSH_ALL":
-                # Limpiar toda la base de datos
-                r.flushdb()
+                # Limpiar toda la base de datos (Redis libera la memoria en segundo plano)
+                r.flushdb(asynchronous=True)
                 return Response({"detail": "Toda la base de datos Redis ha sido limpiada"})
+
+            if request.GET.get("background") == "true":
+                job_id = start_delete_job(get_redis, key_pattern)
+                return Response(
+                    {
+                        "detail": f"Eliminando keys con patrón '{key_pattern}' en segundo plano",
+                        "job_id": job_id,
+                        "status_url": f"/api/redis-admin/jobs/{job_id}/",
+                    },
+                    status=status.HTTP_202_ACCEPTED
+                )
+
+            # Limpiar keys específicas
+            _, deleted_count = unlink_matching(r, key_pattern)
+            if deleted_count:
+                return Response({
+                    "detail": f"Eliminadas {deleted_count} keys con patrón '{key_pattern}'"
+                })
             else:
-                # Limpiar keys específicas
-                keys_to_delete = r.keys(key_pattern)
-                if keys_to_delete:
-                    deleted_count = r.delete(*keys_to_delete)
-                    return Response({
-                        "detail": f"Eliminadas {deleted_count} keys con patrón '{key_pattern}'"
-                    })
-                else:
-                    return Response({
-                        "detail": f"No se encontraron keys con patrón '{key_pattern}'"
-                    })
+                return Response({
+                    "detail": f"No se encontraron keys con patrón '{key_pattern}'"
+                })
                     
         except Exception as e:
             return Response(
                 {"detail": f"Error: {str(e)}"}, 
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+class RedisAdminJobView(APIView):
+    """Progreso de un borrado de keys en segundo plano"""
+
+    def get(self, request, job_id):
+        try:
+            job = get_job(get_redis(), job_id)
+        except Exception as e:
+            return Response(
+                {"detail": f"Error conectando a Redis: {str(e)}"},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+        if job is None:
+            return Response({"detail": "Job no encontrado o expirado."}, status=status.HTTP_404_NOT_FOUND)
+        return Response(job)
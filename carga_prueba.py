@@ -1,24 +1,42 @@
 #!/usr/bin/env python3
 """
-Script para cargar datos de prueba masivos en la base de datos
-Ejecutar con: python carga_prueba.py
+Script para cargar datos de prueba masivos en la base de datos y medir la API
+Ejecutar con: python carga_prueba.py              (menú interactivo)
+          o:  python carga_prueba.py --help       (subcomandos: seed, purge, cache, bench, sweep)
 """
 
 import requests
 import json
+import math
+import sys
 import random
 import time
 import concurrent.futures
 import threading
-from datetime import datetime, timedelta
+from datetime import datetime
 
 API_BASE = "http://localhost:8000/api"
 
+_local = threading.local()
+
+
+def http_session():
+    """Sesión HTTP del hilo actual: reutiliza conexiones keep-alive entre requests
+    
+    requests.post/delete sueltos abren una conexión TCP nueva por request y el
+    propio script pasa a ser el cuello de botella.
+    """
+    session = getattr(_local, "session", None)
+    if session is None:
+        session = _local.session = requests.Session()
+    return session
+
+
 def create_single_todo(data):
     """Crear una sola tarea - función para threading"""
     index, title, done = data
     try:
-        response = requests.post(
+        response = http_session().post(
             f"{API_BASE}/todos/",
             json={"title": title, "done": done},
             headers={"Content-Type": "application/json"},
@@ -28,8 +46,8 @@ def create_single_todo(data):
     except:
         return False
 
-def create_massive_todos(count=1000):
-    """Crear muchas tareas SUPER RAPIDO usando threading paralelo"""
+def generate_tasks_data(count):
+    """Generar (indice, titulo, done) para `count` tareas con títulos variados"""
     
     # Listas de palabras para generar títulos variados
     adjectives = [
@@ -51,10 +69,6 @@ def create_massive_todos(count=1000):
         "implementar", "disenar", "configurar", "instalar", "migrar"
     ]
     
-    print(f"Creando {count:,} tareas SUPER RAPIDO con threading paralelo...")
-    
-    # Preparar todos los datos de antemano
-    print("Preparando datos...")
     tasks_data = []
     for i in range(count):
         adj = random.choice(adjectives)
@@ -63,6 +77,16 @@ def create_massive_todos(count=1000):
         title = f"{adj} {action} {noun} #{i+1}"
         done = random.random() < 0.3  # 30% completadas
         tasks_data.append((i, title, done))
+    return tasks_data
+
+def create_massive_todos(count=1000):
+    """Crear muchas tareas SUPER RAPIDO usando threading paralelo"""
+    
+    print(f"Creando {count:,} tareas SUPER RAPIDO con threading paralelo...")
+    
+    # Preparar todos los datos de antemano
+    print("Preparando datos...")
+    tasks_data = generate_tasks_data(count)
     
     print(f"Iniciando {count:,} requests en paralelo...")
     start_time = time.time()
@@ -96,7 +120,45 @@ def create_massive_todos(count=1000):
     elapsed_time = time.time() - start_time
     rate = created / elapsed_time if elapsed_time > 0 else 0
     
-    print(f"\nRESULTADO SUPER RAPIDO:")
+    print("\nRESULTADO SUPER RAPIDO:")
+    print(f"  Tareas creadas: {created:,}")
+    print(f"  Errores: {errors:,}")
+    print(f"  Tiempo total: {elapsed_time:.2f}s")
+    print(f"  Rate promedio: {rate:.1f} tareas/segundo")
+
+def create_massive_todos_bulk(count=1000, batch_size=1000):
+    """Crear muchas tareas con el endpoint masivo: una request (y una transacción) por lote"""
+    
+    print(f"Creando {count:,} tareas en lotes de {batch_size:,}...")
+    tasks_data = generate_tasks_data(count)
+    
+    start_time = time.time()
+    created = 0
+    errors = 0
+    
+    for offset in range(0, count, batch_size):
+        batch = tasks_data[offset:offset + batch_size]
+        try:
+            response = requests.post(
+                f"{API_BASE}/todos/bulk/",
+                json={"items": [{"title": title, "done": done} for _, title, done in batch]},
+                timeout=60
+            )
+            result = response.json()
+            created += result.get("created", 0)
+            errors += len(batch) - result.get("created", 0)
+        except Exception as e:
+            print(f"  Error en lote {offset // batch_size + 1}: {e}")
+            errors += len(batch)
+        
+        elapsed = time.time() - start_time
+        rate = (created + errors) / elapsed if elapsed > 0 else 0
+        print(f"  Procesadas {created + errors:,}/{count:,} tareas... Rate: {rate:.1f}/s")
+    
+    elapsed_time = time.time() - start_time
+    rate = created / elapsed_time if elapsed_time > 0 else 0
+    
+    print("\nRESULTADO BULK:")
     print(f"  Tareas creadas: {created:,}")
     print(f"  Errores: {errors:,}")
     print(f"  Tiempo total: {elapsed_time:.2f}s")
@@ -105,7 +167,7 @@ def create_massive_todos(count=1000):
 def delete_single_todo(todo_id):
     """Eliminar una sola tarea - función para threading"""
     try:
-        response = requests.delete(f"{API_BASE}/todos/{todo_id}/")
+        response = http_session().delete(f"{API_BASE}/todos/{todo_id}/", timeout=10)
         return response.status_code == 204
     except:
         return False
@@ -116,66 +178,22 @@ def delete_all_todos_fast():
     print("ELIMINANDO TODAS LAS TAREAS...")
     
     try:
-        # Primero obtener todas las tareas existentes
-        response = requests.get(f"{API_BASE}/todos/")
+        # Un solo DELETE masivo: una transacción y una invalidación de caché
+        start_time = time.time()
+        response = requests.delete(f"{API_BASE}/todos/bulk/", params={"all": "true"}, timeout=300)
         if response.status_code != 200:
-            print(f"Error obteniendo tareas: {response.status_code}")
+            print(f"Error eliminando tareas: {response.status_code}")
             return
+        deleted = response.json().get("deleted", 0)
+        elapsed_time = time.time() - start_time
         
-        todos = response.json()
-        total_todos = len(todos)
-        
-        if total_todos == 0:
+        if deleted == 0:
             print("No hay tareas para eliminar")
             return
         
-        print(f"Encontradas {total_todos:,} tareas para eliminar...")
-    
-        
-        # Preparar IDs de tareas
-        todo_ids = [todo['id'] for todo in todos]
-        
-        start_time = time.time()
-        deleted = 0
-        errors = 0
-        
-        # Usar ThreadPoolExecutor para máxima velocidad de eliminación
-        max_workers = min(40, total_todos)  # Hasta 40 threads paralelos
-        
-        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-            # Enviar todas las eliminaciones
-            future_to_id = {executor.submit(delete_single_todo, todo_id): todo_id for todo_id in todo_ids}
-            
-            # Procesar resultados conforme van llegando
-            for future in concurrent.futures.as_completed(future_to_id):
-                if future.result():
-                    deleted += 1
-                else:
-                    errors += 1
-                
-                # Mostrar progreso cada 1000 eliminaciones
-                if (deleted + errors) % 1000 == 0:
-                    elapsed = time.time() - start_time
-                    rate = (deleted + errors) / elapsed if elapsed > 0 else 0
-                    remaining = total_todos - (deleted + errors)
-                    eta = remaining / rate if rate > 0 else 0
-                    print(f"  Eliminadas {deleted + errors:,}/{total_todos:,} tareas... "
-                          f"Rate: {rate:.1f}/s, ETA: {eta:.1f}s")
-        
-        elapsed_time = time.time() - start_time
-        rate = deleted / elapsed_time if elapsed_time > 0 else 0
-        
-        print(f"\nRESULTADO ELIMINACION:")
+        print("\nRESULTADO ELIMINACION:")
         print(f"  Tareas eliminadas: {deleted:,}")
-        print(f"  Errores: {errors:,}")
-
-        
-        # Limpiar caché después de eliminar
-        try:
-            requests.delete(f"{API_BASE}/data/")
-            print("  Cache limpiado")
-        except:
-            print("  No se pudo limpiar el cache")
+        print(f"  Tiempo total: {elapsed_time:.2f}s")
             
     except Exception as e:
         print(f"Error eliminando tareas: {e}")
@@ -201,7 +219,7 @@ def create_massive_todos_sequential(count=1000):
         done = random.random() < 0.3
         
         try:
-            response = requests.post(
+            response = http_session().post(
                 f"{API_BASE}/todos/",
                 json={"title": title, "done": done},
                 headers={"Content-Type": "application/json"},
@@ -217,7 +235,7 @@ def create_massive_todos_sequential(count=1000):
             else:
                 errors += 1
                 
-        except Exception as e:
+        except Exception:
             errors += 1
         
  
@@ -225,7 +243,7 @@ def create_massive_todos_sequential(count=1000):
     elapsed_time = time.time() - start_time
     rate = created / elapsed_time if elapsed_time > 0 else 0
     
-    print(f"\nResumen:")
+    print("\nResumen:")
     print(f"  Tareas creadas: {created:,}")
     print(f"  Errores: {errors:,}")
     print(f"  Tiempo total: {elapsed_time:.2f}s")
@@ -249,6 +267,12 @@ def test_cache_performance():
     start_time = time.time()
     try:
         response = requests.get(f"{API_BASE}/data/")
+        # Con TODOS_DATA_SNAPSHOTS la API responde 503 hasta que el worker
+        # build_reports publica el reporte nuevo: se mide hasta que está listo
+        deadline = start_time + 30
+        while response.status_code == 503 and time.time() < deadline:
+            time.sleep(0.1)
+            response = requests.get(f"{API_BASE}/data/")
         data = response.json()
         db_time = time.time() - start_time
         
@@ -279,7 +303,7 @@ def test_cache_performance():
         return
     
     # 4. Comparación
-    print(f"\nRESULTADOS:")
+    print("\nRESULTADOS:")
     print(f"    PostgreSQL: {db_time:.3f}s")
     print(f"    Redis Cache: {cache_time:.3f}s")
     if db_time > 0 and cache_time > 0:
@@ -288,7 +312,344 @@ def test_cache_performance():
         print(f"    Mejora: {improvement:.1f}% mas rapido")
         print(f"    Speedup: {speedup:.1f}x veces mas rapido")
 
-if __name__ == "__main__":
+# ---------------------------------------------------------------------------
+# Benchmark: operaciones, métricas y barridos de concurrencia
+# ---------------------------------------------------------------------------
+
+# Operaciones predefinidas para --endpoint (también se acepta cualquier ruta GET, p. ej. /todos/?tag=urgent)
+READ_OPERATIONS = {
+    "health": "/health/",
+    "list": "/todos/?limit=100",
+    "detail": "/todos/{id}/",
+    "data": "/data/",
+}
+WRITE_OPERATIONS = ("create", "update", "delete")
+
+PERCENTILES = (50, 90, 99)
+
+
+def percentile(sorted_values, p):
+    """Percentil por rango más cercano de una lista ordenada"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(p / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+class EndpointStats:
+    """Latencias y errores acumulados de un endpoint"""
+    
+    def __init__(self):
+        self.latencies = []
+        self.errors = 0
+        self.status_codes = {}
+        self.lock = threading.Lock()
+    
+    def record(self, latency, status_code):
+        with self.lock:
+            self.status_codes[status_code] = self.status_codes.get(status_code, 0) + 1
+            if status_code is None or status_code >= 500:
+                self.errors += 1
+            else:
+                self.latencies.append(latency)
+    
+    def summary(self, elapsed):
+        latencies = sorted(self.latencies)
+        total = len(latencies) + self.errors
+        result = {
+            "requests": total,
+            "errors": self.errors,
+            "error_rate": round(self.errors / total, 4) if total else 0.0,
+            "throughput": round(len(latencies) / elapsed, 2) if elapsed > 0 else 0.0,
+            "mean_ms": round(sum(latencies) / len(latencies) * 1000, 2) if latencies else 0.0,
+            "max_ms": round(latencies[-1] * 1000, 2) if latencies else 0.0,
+            "status_codes": {str(code): count for code, count in sorted(self.status_codes.items(), key=str)},
+        }
+        for p in PERCENTILES:
+            result[f"p{p}_ms"] = round(percentile(latencies, p) * 1000, 2)
+        return result
+
+
+def parse_endpoints(values):
+    """--endpoint list --endpoint data=3 --endpoint /todos/?tag=urgent -> [(nombre, ruta, peso)]"""
+    endpoints = []
+    for value in values or ["list", "data"]:
+        name, _, weight = value.partition("=")
+        path = READ_OPERATIONS.get(name, name)
+        if not path.startswith("/"):
+            raise ValueError(f"endpoint desconocido: {name} (usar {', '.join(READ_OPERATIONS)} o una ruta /...)")
+        endpoints.append((name, path, float(weight or 1)))
+    return endpoints
+
+
+def parse_write_ops(value):
+    ops = [op.strip() for op in (value or "").split(",") if op.strip()]
+    for op in ops:
+        if op not in WRITE_OPERATIONS:
+            raise ValueError(f"operación de escritura desconocida: {op} (usar {', '.join(WRITE_OPERATIONS)})")
+    return ops
+
+
+class Workload:
+    """Elige la próxima operación según la mezcla lectura/escritura y la ejecuta"""
+    
+    def __init__(self, base_url, endpoints, write_ratio=0.0, write_ops=("create", "update")):
+        self.base_url = base_url.rstrip("/")
+        self.endpoints = endpoints
+        self.write_ratio = write_ratio
+        self.write_ops = list(write_ops) or ["create"]
+        self.ids = []
+        self.created_ids = []
+        self.ids_lock = threading.Lock()
+        self.names = [name for name, _, _ in endpoints] + (self.write_ops if write_ratio > 0 else [])
+    
+    def load_ids(self, session):
+        """Ids existentes para detail/update (primera página del listado)"""
+        try:
+            response = session.get(f"{self.base_url}/todos/", params={"limit": 1000}, timeout=30)
+            self.ids = [todo["id"] for todo in response.json()["results"]]
+        except Exception:
+            self.ids = []
+    
+    def random_id(self):
+        with self.ids_lock:
+            pool = self.ids or self.created_ids
+            return random.choice(pool) if pool else 0
+    
+    def next_request(self):
+        """(nombre, método, url, json) de la próxima operación"""
+        if self.write_ratio > 0 and random.random() < self.write_ratio:
+            op = random.choice(self.write_ops)
+            if op == "create":
+                title = f"Benchmark {random.choice(['urgent', 'important', 'rutina'])} #{random.randint(1, 10**9)}"
+                return op, "POST", f"{self.base_url}/todos/", {"title": title}
+            if op == "update":
+                return op, "PATCH", f"{self.base_url}/todos/{self.random_id()}/", {"done": random.random() < 0.5}
+            with self.ids_lock:
+                todo_id = self.created_ids.pop() if self.created_ids else 0
+            return op, "DELETE", f"{self.base_url}/todos/{todo_id}/", None
+        
+        name, path, _ = random.choices(self.endpoints, weights=[weight for _, _, weight in self.endpoints])[0]
+        return name, "GET", self.base_url + path.replace("{id}", str(self.random_id())), None
+    
+    def record_created(self, todo_id):
+        """Las tareas creadas por el benchmark son las que `delete` puede borrar"""
+        with self.ids_lock:
+            self.created_ids.append(todo_id)
+
+
+def prepare_workload(base_url, endpoints, write_ratio, write_ops, warmup=True):
+    workload = Workload(base_url, endpoints, write_ratio, write_ops)
+    with requests.Session() as session:
+        workload.load_ids(session)
+        if warmup:
+            # Una request por endpoint de lectura: /data/ arranca con la caché ya generada
+            for _, path, _ in endpoints:
+                try:
+                    session.get(workload.base_url + path.replace("{id}", str(workload.random_id())), timeout=60)
+                except Exception:
+                    pass
+    return workload
+
+
+def benchmark_result(stats, concurrency, elapsed, **extra):
+    overall = EndpointStats()
+    for endpoint_stats in stats.values():
+        overall.latencies.extend(endpoint_stats.latencies)
+        overall.errors += endpoint_stats.errors
+        for code, count in endpoint_stats.status_codes.items():
+            overall.status_codes[code] = overall.status_codes.get(code, 0) + count
+    
+    return {
+        "concurrency": concurrency,
+        "elapsed_s": round(elapsed, 3),
+        **extra,
+        "overall": overall.summary(elapsed),
+        "endpoints": {name: endpoint_stats.summary(elapsed) for name, endpoint_stats in stats.items()},
+    }
+
+
+def run_benchmark(base_url, endpoints, concurrency=10, duration=10.0, total_requests=None,
+                  write_ratio=0.0, write_ops=("create", "update"), warmup=True):
+    """Carga de lazo cerrado: `concurrency` hilos con sesión keep-alive propia
+    
+    Cada cliente envía la próxima request apenas recibe la respuesta anterior,
+    hasta completar `duration` segundos (o `total_requests` en total).
+    """
+    workload = prepare_workload(base_url, endpoints, write_ratio, write_ops, warmup)
+    stats = {name: EndpointStats() for name in workload.names}
+    remaining = [total_requests] if total_requests else None
+    remaining_lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+    
+    def client():
+        with requests.Session() as session:
+            while True:
+                if remaining is not None:
+                    with remaining_lock:
+                        if remaining[0] <= 0:
+                            return
+                        remaining[0] -= 1
+                elif time.perf_counter() >= deadline:
+                    return
+                name, method, url, body = workload.next_request()
+                start = time.perf_counter()
+                try:
+                    response = session.request(method, url, json=body, timeout=30)
+                    status_code = response.status_code
+                    if name == "create" and status_code == 201:
+                        workload.record_created(response.json()["id"])
+                except Exception:
+                    status_code = None
+                stats[name].record(time.perf_counter() - start, status_code)
+    
+    start_time = time.perf_counter()
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return benchmark_result(stats, concurrency, time.perf_counter() - start_time, engine="threads")
+
+
+# ---------------------------------------------------------------------------
+# Motor asyncio (aiohttp): miles de req/s desde una sola máquina
+# ---------------------------------------------------------------------------
+
+def run_benchmark_async(base_url, endpoints, concurrency=100, duration=10.0, total_requests=None,
+                        write_ratio=0.0, write_ops=("create", "update"), rate=None, warmup=True):
+    """Igual que run_benchmark pero con asyncio y un pool keep-alive compartido
+    
+    `concurrency` es el tamaño del pool de conexiones. Sin `rate` es lazo cerrado
+    (`concurrency` clientes que esperan cada respuesta). Con `rate` es lazo
+    abierto: las requests salen a ritmo constante (`rate` por segundo) sin
+    esperar a las anteriores, y la latencia se mide desde el instante en que
+    la request *debía* salir. Así, si el servidor se atrasa, la espera en cola
+    cuenta en los percentiles (sin coordinated omission).
+    """
+    try:
+        import aiohttp
+    except ImportError:
+        raise ValueError("el motor async necesita aiohttp (pip install aiohttp)")
+    import asyncio
+    
+    workload = prepare_workload(base_url, endpoints, write_ratio, write_ops, warmup)
+    stats = {name: EndpointStats() for name in workload.names}
+    timeout = aiohttp.ClientTimeout(total=30)
+    
+    async def send(session, intended_start):
+        name, method, url, body = workload.next_request()
+        try:
+            async with session.request(method, url, json=body) as response:
+                payload = await response.read()
+                status_code = response.status
+            if name == "create" and status_code == 201:
+                workload.record_created(json.loads(payload)["id"])
+        except Exception:
+            status_code = None
+        stats[name].record(time.perf_counter() - intended_start, status_code)
+    
+    async def closed_loop(session):
+        remaining = [total_requests] if total_requests else None
+        deadline = time.perf_counter() + duration
+        
+        async def client():
+            while True:
+                if remaining is not None:
+                    if remaining[0] <= 0:
+                        return
+                    remaining[0] -= 1
+                elif time.perf_counter() >= deadline:
+                    return
+                await send(session, time.perf_counter())
+        
+        await asyncio.gather(*(client() for _ in range(concurrency)))
+    
+    async def open_loop(session):
+        count = total_requests or int(rate * duration)
+        start = time.perf_counter()
+        tasks = []
+        for i in range(count):
+            intended_start = start + i / rate
+            delay = intended_start - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            tasks.append(asyncio.ensure_future(send(session, intended_start)))
+        await asyncio.gather(*tasks)
+    
+    async def main():
+        connector = aiohttp.TCPConnector(limit=concurrency, keepalive_timeout=60)
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+            start_time = time.perf_counter()
+            await (open_loop(session) if rate else closed_loop(session))
+            return time.perf_counter() - start_time
+    
+    elapsed = asyncio.run(main())
+    extra = {"engine": "async"}
+    if rate:
+        extra["target_rate"] = rate
+    return benchmark_result(stats, concurrency, elapsed, **extra)
+
+
+def run_load(args, concurrency):
+    """Corre bench/sweep con el motor elegido en la línea de comandos"""
+    endpoints = parse_endpoints(args.endpoint)
+    write_ops = parse_write_ops(args.write_ops)
+    if args.engine == "async" or args.rate:
+        if args.rate is not None and args.rate <= 0:
+            raise ValueError("--rate debe ser mayor a 0")
+        return run_benchmark_async(args.base_url, endpoints, concurrency, args.duration, args.requests,
+                                   args.write_ratio, write_ops, rate=args.rate)
+    return run_benchmark(args.base_url, endpoints, concurrency, args.duration, args.requests,
+                         args.write_ratio, write_ops)
+
+
+def print_benchmark(result, title=None):
+    if title:
+        print(f"\n{title}")
+    mode = f", lazo abierto a {result['target_rate']:g} req/s" if "target_rate" in result else ""
+    print(f"Concurrencia {result['concurrency']} ({result['engine']}{mode}), {result['elapsed_s']:.1f}s")
+    print(f"{'endpoint':<20}{'requests':>10}{'req/s':>10}{'err %':>8}"
+          f"{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    rows = list(result["endpoints"].items()) + [("TOTAL", result["overall"])]
+    for name, summary in rows:
+        print(f"{name:<20}{summary['requests']:>10}{summary['throughput']:>10.1f}"
+              f"{summary['error_rate'] * 100:>8.2f}{summary['p50_ms']:>10.1f}{summary['p90_ms']:>10.1f}"
+              f"{summary['p99_ms']:>10.1f}{summary['max_ms']:>10.1f}")
+
+
+def print_sweep(results):
+    print(f"\n{'concurrencia':>12}{'req/s':>10}{'err %':>8}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for result in results:
+        overall = result["overall"]
+        print(f"{result['concurrency']:>12}{overall['throughput']:>10.1f}{overall['error_rate'] * 100:>8.2f}"
+              f"{overall['p50_ms']:>10.1f}{overall['p90_ms']:>10.1f}{overall['p99_ms']:>10.1f}{overall['max_ms']:>10.1f}")
+
+
+def write_results(path, command, args, results):
+    """Guarda los resultados en JSON para comparar corridas entre versiones"""
+    payload = {
+        "command": command,
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "base_url": args.base_url,
+        "options": {key: value for key, value in vars(args).items() if key not in ("func", "output", "command", "base_url")},
+        "results": results,
+    }
+    with open(path, "w") as output:
+        json.dump(payload, output, indent=2)
+    print(f"\nResultados guardados en {path}")
+
+
+def compare_servers(wsgi_base, asgi_base, duration=10.0, concurrency=20):
+    """Comparar lado a lado la misma API servida con WSGI (gunicorn sync) y ASGI (uvicorn)"""
+    
+    endpoints = parse_endpoints(["health", "list", "data"])
+    print(f"\nCOMPARACION WSGI vs ASGI ({duration:.0f}s por servidor, {concurrency} en paralelo)")
+    for name, base in (("WSGI", wsgi_base), ("ASGI", asgi_base)):
+        print_benchmark(run_benchmark(base, endpoints, concurrency, duration), title=f"{name}: {base}")
+
+
+def interactive_menu():
     print("CARGADOR DE DATOS DE PRUEBA Y BENCHMARK DE CACHE")
     print("=" * 60)
     
@@ -301,6 +662,7 @@ if __name__ == "__main__":
         print("4. Crear 5000 tareas de prueba")
         print("5. Test de rendimiento basico")
         print("6. ELIMINAR TODAS LAS TAREAS")
+        print("7. Comparar throughput WSGI vs ASGI")
         print("0. Salir")
         
         choice = input("\nSelecciona una opcion: ").strip()
@@ -310,9 +672,9 @@ if __name__ == "__main__":
         elif choice == "2":
             create_massive_todos_sequential(500)  # Secuencial para pocas
         elif choice == "3":
-            create_massive_todos(1000)  # Paralelo para muchas
+            create_massive_todos_bulk(1000)  # Endpoint masivo para muchas
         elif choice == "4":
-            create_massive_todos(5000)  # Paralelo para muchas
+            create_massive_todos_bulk(5000)  # Endpoint masivo para muchas
         elif choice == "5":
             test_cache_performance()
         elif choice == "6":
@@ -322,8 +684,119 @@ if __name__ == "__main__":
                 delete_all_todos_fast()  # Usar la función súper rápida
             else:
                 print("Cancelado")
+        elif choice == "7":
+            wsgi_base = input(f"URL de la API WSGI [{API_BASE}]: ").strip() or API_BASE
+            asgi_base = input("URL de la API ASGI [http://localhost:8001/api]: ").strip() or "http://localhost:8001/api"
+            compare_servers(wsgi_base, asgi_base)
         elif choice == "0":
             print("Hasta luego!")
             break
         else:
-            print("Opcion invalida")
\ No newline at end of file
+            print("Opcion invalida")
+
+
+# ---------------------------------------------------------------------------
+# CLI no interactiva
+# ---------------------------------------------------------------------------
+
+def add_load_arguments(parser):
+    parser.add_argument("--endpoint", action="append",
+                        help=f"Endpoint de lectura ({', '.join(READ_OPERATIONS)} o ruta /...), "
+                             "con peso opcional: data=3. Repetible (default: list y data)")
+    parser.add_argument("--write-ratio", type=float, default=0.0,
+                        help="Fracción de requests que son escrituras (0..1, default 0)")
+    parser.add_argument("--write-ops", default="create,update",
+                        help=f"Escrituras a mezclar, separadas por coma ({', '.join(WRITE_OPERATIONS)})")
+    parser.add_argument("--duration", type=float, default=10.0, help="Segundos por corrida (default 10)")
+    parser.add_argument("--requests", type=int, help="Total de requests por corrida (en lugar de --duration)")
+    parser.add_argument("--engine", choices=("threads", "async"), default="threads",
+                        help="threads (requests) o async (aiohttp, pool keep-alive compartido)")
+    parser.add_argument("--rate", type=float,
+                        help="Lazo abierto: requests por segundo a ritmo constante (implica --engine async; "
+                             "la concurrencia pasa a ser el tamaño del pool de conexiones)")
+    parser.add_argument("--output", help="Guardar los resultados en este archivo JSON")
+
+
+def cmd_seed(args):
+    create_massive_todos_bulk(args.count, args.batch_size)
+
+
+def cmd_purge(args):
+    delete_all_todos_fast()
+
+
+def cmd_cache(args):
+    test_cache_performance()
+
+
+def cmd_bench(args):
+    result = run_load(args, args.concurrency)
+    print_benchmark(result, title=f"BENCHMARK {args.base_url}")
+    if args.output:
+        write_results(args.output, "bench", args, [result])
+
+
+def cmd_sweep(args):
+    levels = [int(level) for level in args.levels.split(",") if level.strip()]
+    results = []
+    for level in levels:
+        result = run_load(args, level)
+        print_benchmark(result)
+        results.append(result)
+    print_sweep(results)
+    if args.output:
+        write_results(args.output, "sweep", args, results)
+
+
+def build_parser():
+    import argparse
+    
+    parser = argparse.ArgumentParser(
+        description="Carga de datos de prueba y benchmarks de la API (sin argumentos: menú interactivo)"
+    )
+    parser.add_argument("--base-url", default=API_BASE, help=f"URL base de la API (default {API_BASE})")
+    subparsers = parser.add_subparsers(dest="command")
+    
+    seed = subparsers.add_parser("seed", help="Crear tareas de prueba con el endpoint masivo")
+    seed.add_argument("--count", type=int, default=1000)
+    seed.add_argument("--batch-size", type=int, default=1000)
+    seed.set_defaults(func=cmd_seed)
+    
+    purge = subparsers.add_parser("purge", help="Eliminar todas las tareas")
+    purge.set_defaults(func=cmd_purge)
+    
+    cache = subparsers.add_parser("cache", help="Comparar /api/data/ sin y con caché")
+    cache.set_defaults(func=cmd_cache)
+    
+    bench = subparsers.add_parser("bench", help="Carga sostenida con percentiles por endpoint")
+    bench.add_argument("--concurrency", type=int, default=10, help="Clientes en paralelo (default 10)")
+    add_load_arguments(bench)
+    bench.set_defaults(func=cmd_bench)
+    
+    sweep = subparsers.add_parser("sweep", help="Repetir el benchmark con varios niveles de concurrencia")
+    sweep.add_argument("--levels", default="1,5,10,20,50", help="Niveles de concurrencia (default 1,5,10,20,50)")
+    add_load_arguments(sweep)
+    sweep.set_defaults(func=cmd_sweep)
+    
+    return parser
+
+
+def main(argv=None):
+    global API_BASE
+    
+    args = build_parser().parse_args(argv)
+    if not args.command:
+        interactive_menu()
+        return 0
+    
+    API_BASE = args.base_url.rstrip("/")
+    try:
+        args.func(args)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return 2
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,6 +7,12 @@ type Todo = {
   created_at: number;
 };
 
+type TodoPage = {
+  results: Todo[];
+  next: string | null;
+  limit: number;
+};
+
 type DataItem = {
   todos: Array<{id: number, title: string, done: boolean, created_at: number, timestamp: number}>;
   stats: {
@@ -36,9 +42,18 @@ console.log('🔧 Frontend Config:', {
 
 const api = {
   async list(): Promise<Todo[]> {
-    const res = await fetch(`${API_BASE_URL}/todos/`);
-    if (!res.ok) throw new Error("Error listando tareas");
-    return res.json();
+    // La API pagina por cursor: se piden páginas hasta que `next` sea null
+    const todos: Todo[] = [];
+    let cursor: string | null = null;
+    do {
+      const query: string = cursor ? `?limit=1000&cursor=${encodeURIComponent(cursor)}` : "?limit=1000";
+      const res = await fetch(`${API_BASE_URL}/todos/${query}`);
+      if (!res.ok) throw new Error("Error listando tareas");
+      const page: TodoPage = await res.json();
+      todos.push(...page.results);
+      cursor = page.next;
+    } while (cursor);
+    return todos;
   },
   async add(title: string): Promise<Todo> {
     const res = await fetch(`${API_BASE_URL}/todos/`, {
@@ -66,7 +81,13 @@ const api = {
   // Nuevas funciones para datos
   async getData(): Promise<DataItem> {
     const start = performance.now();
-    const res = await fetch(`${API_BASE_URL}/data/`);
+    let res = await fetch(`${API_BASE_URL}/data/`);
+    // 503 + Retry-After: el worker todavía no publicó el reporte (p. ej. tras limpiar la caché)
+    for (let retry = 0; res.status === 503 && retry < 10; retry++) {
+      const wait = Number(res.headers.get("Retry-After") ?? "1") * 1000;
+      await new Promise((resolve) => setTimeout(resolve, wait));
+      res = await fetch(`${API_BASE_URL}/data/`);
+    }
     if (!res.ok) throw new Error("Error obteniendo datos");
     const data = await res.json();
     const clientTime = Math.round(performance.now() - start);